@@ -0,0 +1,99 @@
+"""
+Codec karşılaştırması: her format / ön ayar için PIL ve OpenCV arka uçlarının
+encode-decode sürelerini ve çıktı boyutlarını ölçer.
+
+Kullanım:
+    python benchmark_codecs.py [fotoğraf_yolu] [--repeat 5]
+
+ImageCodec.DECODE_BACKENDS / ENCODE_BACKENDS tercih tabloları bu ölçümlere
+göre ayarlanır.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+from PIL import Image
+
+from main import ImageCodec, SAVE_PRESETS
+
+
+def synthetic_image(width=4000, height=3000):
+    """Fotoğrafa benzer (yumuşak geçişli + gürültülü) test görüntüsü"""
+    y, x = np.mgrid[0:height, 0:width].astype(np.float32)
+    r = 128 + 100 * np.sin(x / 300.0)
+    g = 128 + 100 * np.cos(y / 250.0)
+    b = 128 + 60 * np.sin((x + y) / 400.0)
+    base = np.stack([r, g, b], axis=-1)
+    noise = np.random.default_rng(0).normal(0, 12, base.shape)
+    return Image.fromarray(np.clip(base + noise, 0, 255).astype(np.uint8))
+
+
+def best_time(fn, repeat):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def benchmark(image, repeat=5):
+    codec = ImageCodec()
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for fmt in ("jpeg", "png", "webp", "avif"):
+            for preset in SAVE_PRESETS:
+                for backend in ("pil", "cv2"):
+                    try:
+                        encode_s, data = best_time(
+                            lambda: codec.encode(image, fmt, preset, backend=backend), repeat
+                        )
+                    except Exception:
+                        continue  # Bu arka uç bu formatı desteklemiyor
+                    if data is None:
+                        continue
+
+                    path = os.path.join(tmp, f"bench.{fmt}")
+                    with open(path, "wb") as f:
+                        f.write(data)
+
+                    decode = {}
+                    for decoder in ("pil", "cv2"):
+                        try:
+                            decode[decoder], _ = best_time(
+                                lambda: codec.decode(path, backend=decoder), repeat
+                            )
+                        except Exception:
+                            decode[decoder] = None
+                    rows.append((fmt, preset, backend, encode_s, len(data), decode))
+    return rows
+
+
+def print_table(rows):
+    def ms(value):
+        return "-" if value is None else f"{value * 1000:8.1f}"
+
+    print(f"{'format':6} {'ön ayar':9} {'arka uç':7} {'encode ms':>9} {'boyut KB':>9} "
+          f"{'decode pil':>10} {'decode cv2':>10}")
+    for fmt, preset, backend, encode_s, size, decode in rows:
+        print(f"{fmt:6} {preset:9} {backend:7} {ms(encode_s):>9} {size / 1024:9.0f} "
+              f"{ms(decode['pil']):>10} {ms(decode['cv2']):>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Codec arka uçlarını karşılaştır")
+    parser.add_argument("image", nargs="?", help="Test fotoğrafı (verilmezse sentetik 12MP)")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    image = ImageCodec().decode(args.image) if args.image else synthetic_image()
+    print(f"Görüntü: {image.width}x{image.height}, en iyi {args.repeat} ölçüm\n")
+    print_table(benchmark(image, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
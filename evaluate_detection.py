@@ -0,0 +1,222 @@
+"""
+Algılama değerlendirmesi: her algılama yapılandırmasını (yöntem, algılama
+çözünürlüğü, döşeme) etiketli bir görüntü seti üzerinde çalıştırır; IoU
+eşiklerinde kesinlik/duyarlılık, görüntü başına gecikme ve en yüksek bellek
+kullanımını raporlar ve Pareto cephesini (daha hızlı ve daha yüksek
+duyarlılıklı başka yapılandırmanın olmadığı ayarlar) işaretler.
+
+Kullanım:
+    python evaluate_detection.py etiketler.json [--methods hybrid mediapipe]
+        [--max-dims 640 1024 1600] [--tiles 0 1024] [--csv sonuc.csv] [--plot pareto.png]
+
+Etiket dosyası (yollar dosyaya göre göreli olabilir):
+    {"images": [{"file": "foto1.jpg", "faces": [[x1, y1, x2, y2], ...]}, ...]}
+
+Bellek tracemalloc ile gecikmeden ayrı bir geçişte ölçülür: Python/NumPy
+ayırmalarını kapsar, OpenCV ve MediaPipe'ın kendi yerel ayırmaları bu sayıya
+girmez.
+"""
+
+import argparse
+import csv
+import itertools
+import json
+import os
+import statistics
+import time
+import tracemalloc
+
+import cv2
+import numpy as np
+
+from main import FaceDetectionEngine, ImageCodec
+
+IOU_THRESHOLDS = (0.3, 0.5, 0.7)
+PARETO_IOU = 0.5
+
+
+def load_labels(path):
+    """[(görüntü yolu, [kutular]), ...]"""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    entries = data["images"] if isinstance(data, dict) else data
+    base = os.path.dirname(os.path.abspath(path))
+    return [
+        (os.path.join(base, entry["file"]), [tuple(map(float, box)) for box in entry.get("faces", [])])
+        for entry in entries
+    ]
+
+
+def create_engine():
+    here = os.path.dirname(os.path.abspath(__file__))
+    return FaceDetectionEngine(
+        os.path.join(here, "blaze_face_short_range.tflite"),
+        os.path.join(here, "haarcascade_frontalface_default.xml"),
+        os.path.join(cv2.data.haarcascades, "haarcascade_profileface.xml"),
+        max_instances=1,
+    )
+
+
+def iou(a, b):
+    ix1, iy1 = max(a[0], b[0]), max(a[1], b[1])
+    ix2, iy2 = min(a[2], b[2]), min(a[3], b[3])
+    if ix2 <= ix1 or iy2 <= iy1:
+        return 0.0
+    inter = (ix2 - ix1) * (iy2 - iy1)
+    return inter / ((a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - inter)
+
+
+def match(predicted, truth, threshold):
+    """Açgözlü bire bir eşleme: (doğru pozitif, yanlış pozitif, kaçırılan)"""
+    pairs = sorted(
+        ((iou(p, t), i, j) for i, p in enumerate(predicted) for j, t in enumerate(truth)),
+        reverse=True,
+    )
+    used_p, used_t = set(), set()
+    for value, i, j in pairs:
+        if value < threshold:
+            break
+        if i not in used_p and j not in used_t:
+            used_p.add(i)
+            used_t.add(j)
+    tp = len(used_p)
+    return tp, len(predicted) - tp, len(truth) - tp
+
+
+def tiled_detect(engine, image, method, tile, overlap):
+    """Küçültülmüş tam görüntü + örtüşen tam çözünürlük döşemeleri (OutOfCoreImage ile aynı)"""
+    faces = engine.detect(image, method)
+    height, width = image.shape[:2]
+    for y0 in range(0, height, tile - overlap):
+        for x0 in range(0, width, tile - overlap):
+            x1, y1 = min(width, x0 + tile), min(height, y0 + tile)
+            found = engine.detect(np.ascontiguousarray(image[y0:y1, x0:x1]), method)
+            faces = engine.merge_faces(faces, [(a + x0, b + y0, c + x0, d + y0) for a, b, c, d in found])
+    return faces
+
+
+def evaluate(engine, dataset, method, max_dim, tile):
+    """Tek yapılandırmanın sonuç satırı"""
+    engine.MAX_DIM = max_dim
+    detect = (lambda img: tiled_detect(engine, img, method, tile, tile // 8)) if tile \
+        else (lambda img: engine.detect(img, method))
+
+    # Isınma: model yükleme/ilk çağrı maliyeti ölçüme girmesin
+    detect(dataset[0][1])
+
+    # Gecikme ölçümü: tracemalloc her ayırmayı izleyip yavaşlattığı için kapalıyken
+    counts = {t: [0, 0, 0] for t in IOU_THRESHOLDS}
+    latencies = []
+    for _, image, truth in dataset:
+        start = time.perf_counter()
+        predicted = detect(image)
+        latencies.append(time.perf_counter() - start)
+        for threshold in IOU_THRESHOLDS:
+            for k, value in enumerate(match(predicted, truth, threshold)):
+                counts[threshold][k] += value
+
+    # Bellek ölçümü: ayrı bir geçişte, süre tutulmadan
+    tracemalloc.start()
+    for _, image, _ in dataset:
+        detect(image)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    row = {
+        "method": method, "max_dim": max_dim, "tile": tile or "-",
+        "latency_ms": statistics.mean(latencies) * 1000,
+        "p95_ms": sorted(latencies)[int(0.95 * (len(latencies) - 1))] * 1000,
+        "peak_mb": peak / (1024 * 1024),
+    }
+    for threshold, (tp, fp, fn) in counts.items():
+        row[f"P@{threshold}"] = tp / (tp + fp) if tp + fp else 1.0
+        row[f"R@{threshold}"] = tp / (tp + fn) if tp + fn else 1.0
+    return row
+
+
+def mark_pareto(rows):
+    """Daha hızlı ve en az aynı duyarlılıkta başka satır yoksa Pareto cephesindedir"""
+    key = f"R@{PARETO_IOU}"
+    for row in rows:
+        row["pareto"] = not any(
+            other is not row
+            and other["latency_ms"] <= row["latency_ms"] and other[key] >= row[key]
+            and (other["latency_ms"] < row["latency_ms"] or other[key] > row[key])
+            for other in rows
+        )
+    return rows
+
+
+def print_table(rows):
+    metrics = [f"{kind}@{t}" for t in IOU_THRESHOLDS for kind in ("P", "R")]
+    print(f"{'yöntem':12} {'çözün.':>6} {'döşeme':>6} " + " ".join(f"{m:>7}" for m in metrics)
+          + f" {'ort. ms':>8} {'p95 ms':>8} {'bellek MB':>9}  pareto")
+    for row in sorted(rows, key=lambda r: r["latency_ms"]):
+        print(f"{row['method']:12} {row['max_dim']:>6} {str(row['tile']):>6} "
+              + " ".join(f"{row[m]:7.3f}" for m in metrics)
+              + f" {row['latency_ms']:8.1f} {row['p95_ms']:8.1f} {row['peak_mb']:9.1f}  "
+              + ("*" if row["pareto"] else ""))
+
+
+def write_csv(rows, path):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def plot(rows, path):
+    try:
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+    except ImportError:
+        print("matplotlib yüklü değil, grafik atlandı.")
+        return
+    key = f"R@{PARETO_IOU}"
+    fig, ax = plt.subplots(figsize=(8, 5))
+    for row in rows:
+        ax.scatter(row["latency_ms"], row[key], color="tab:red" if row["pareto"] else "tab:gray")
+        ax.annotate(f"{row['method']}/{row['max_dim']}/{row['tile']}", (row["latency_ms"], row[key]), fontsize=7)
+    front = sorted((r for r in rows if r["pareto"]), key=lambda r: r["latency_ms"])
+    ax.plot([r["latency_ms"] for r in front], [r[key] for r in front], color="tab:red")
+    ax.set_xlabel("Görüntü başına gecikme (ms)")
+    ax.set_ylabel(f"Duyarlılık (IoU {PARETO_IOU})")
+    fig.tight_layout()
+    fig.savefig(path)
+    print(f"Grafik: {path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Algılama yapılandırmalarını etiketli set üzerinde karşılaştır")
+    parser.add_argument("labels", help="Etiket JSON dosyası")
+    parser.add_argument("--methods", nargs="+", default=["mediapipe", "opencv_haar", "hybrid"])
+    parser.add_argument("--max-dims", nargs="+", type=int, default=[640, 1024, 1600],
+                        help="Algılama çözünürlüğü (uzun kenar)")
+    parser.add_argument("--tiles", nargs="+", type=int, default=[0, 1024],
+                        help="Döşeme boyutu (0: döşemesiz)")
+    parser.add_argument("--csv", help="Sonuçları CSV olarak da yaz")
+    parser.add_argument("--plot", help="Pareto grafiğini PNG olarak kaydet (matplotlib gerekir)")
+    args = parser.parse_args()
+
+    codec = ImageCodec()
+    dataset = [(path, np.asarray(codec.decode(path)), truth) for path, truth in load_labels(args.labels)]
+    if not dataset:
+        parser.error("Etiket dosyasında görüntü yok")
+    faces = sum(len(truth) for _, _, truth in dataset)
+    print(f"{len(dataset)} görüntü, {faces} etiketli yüz\n")
+
+    engine = create_engine()
+    rows = [
+        evaluate(engine, dataset, method, max_dim, tile)
+        for method, max_dim, tile in itertools.product(args.methods, args.max_dims, args.tiles)
+    ]
+    print_table(mark_pareto(rows))
+    if args.csv:
+        write_csv(rows, args.csv)
+    if args.plot:
+        plot(rows, args.plot)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,8 +6,8 @@ Kullanıcı manuel olarak da yüz bölgesi çizebilir.
 """
 
 import customtkinter as ctk
-from tkinter import filedialog, messagebox, Canvas
-from PIL import Image, ImageFilter, ImageDraw, ImageTk
+from tkinter import filedialog, messagebox, Canvas, Label
+from PIL import Image, ImageFilter, ImageDraw, ImageTk, ImageChops, ImageSequence
 import cv2
 import numpy as np
 import os
@@ -17,6 +17,24 @@ import json
 import platform
 import io
 import sys
+import math
+import zlib
+import struct
+import tempfile
+import hashlib
+import heapq
+import itertools
+import bisect
+import time
+import queue
+import shutil
+import subprocess
+import multiprocessing
+from collections import OrderedDict
+from contextlib import contextmanager
+from concurrent.futures import (
+    Future, ThreadPoolExecutor, ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+)
 
 # MediaPipe Tasks API import
 
@@ -57,6 +75,3259 @@ user_settings = load_settings()
 ctk.set_appearance_mode(user_settings["appearance_mode"])
 ctk.set_default_color_theme(user_settings["color_theme"])
 
+
+# Kaydetme ön ayarları (hız / boyut dengesi); "balanced" eski varsayılan davranıştır
+SAVE_PRESETS = {
+    "fast": {
+        "label": "⚡ Hızlı",
+        "png_level": 1,
+        "jpeg_quality": 92, "jpeg_subsampling": "4:2:0", "jpeg_progressive": False,
+        "webp_quality": 80, "webp_method": 0,
+        "avif_quality": 60, "avif_speed": 10,
+    },
+    "balanced": {
+        "label": "⚖️ Dengeli",
+        "png_level": 6,
+        "jpeg_quality": 95, "jpeg_subsampling": "4:2:0", "jpeg_progressive": False,
+        "webp_quality": 85, "webp_method": 4,
+        "avif_quality": 70, "avif_speed": 8,
+    },
+    "small": {
+        "label": "📦 Küçük Dosya",
+        "png_level": 9,
+        "jpeg_quality": 90, "jpeg_subsampling": "4:2:0", "jpeg_progressive": True,
+        "webp_quality": 80, "webp_method": 6,
+        "avif_quality": 60, "avif_speed": 6,
+    },
+}
+
+
+class ImageCodec:
+    """Görüntü decode/encode katmanı.
+
+    Her format için en hızlı mevcut arka ucu (PIL veya OpenCV/libjpeg-turbo)
+    kullanır; tercih tablosu benchmark_codecs.py ölçümlerine dayanır ve
+    `backends` ile değiştirilebilir.
+    """
+
+    # Format -> tercih sırasına göre arka uçlar (12MP ölçümü: PIL'in libjpeg-turbo'su
+    # JPEG'de cv2'den hızlı çünkü BGR dönüşümü gerekmiyor; PNG encode'da cv2 önde).
+    # cv2 decode saydamlığı atar, bu yüzden sadece saydamlığı olmayan JPEG için seçilebilir.
+    DECODE_BACKENDS = {
+        "jpeg": ("pil", "cv2"),
+    }
+    ENCODE_BACKENDS = {
+        "jpeg": ("pil", "cv2"),
+        "png": ("cv2", "pil"),
+        "webp": ("pil", "cv2"),
+        "avif": ("pil",),
+    }
+    EXTENSIONS = {
+        ".jpg": "jpeg", ".jpeg": "jpeg", ".png": "png", ".webp": "webp", ".avif": "avif",
+    }
+
+    def __init__(self, decode_backends=None, encode_backends=None):
+        self.decode_backends = dict(self.DECODE_BACKENDS, **(decode_backends or {}))
+        self.encode_backends = dict(self.ENCODE_BACKENDS, **(encode_backends or {}))
+
+    @classmethod
+    def format_of(cls, path):
+        return cls.EXTENSIONS.get(os.path.splitext(path)[1].lower())
+
+    @staticmethod
+    def pil_supports(fmt):
+        if fmt == "avif":
+            try:
+                from PIL import features
+                return bool(features.check("avif"))
+            except Exception:
+                return False
+        return True
+
+    # --- DECODE ---
+    def decode(self, path, backend=None):
+        """Dosyayı RGB PIL görüntüsü olarak aç (saydamlık beyaz zemine)"""
+        fmt = self.format_of(path)
+        backends = (backend,) if backend else self.decode_backends.get(fmt, ("pil",))
+        for name in backends:
+            if name == "cv2":
+                image = self._decode_cv2(path)
+                if image is not None:
+                    return image
+            elif name == "pil":
+                return self._decode_pil(path)
+        return self._decode_pil(path)
+
+    @staticmethod
+    def _decode_cv2(path):
+        data = np.fromfile(path, dtype=np.uint8)
+        # PIL ile aynı sonuç için EXIF yönlendirmesi uygulanmaz
+        bgr = cv2.imdecode(data, cv2.IMREAD_COLOR | cv2.IMREAD_IGNORE_ORIENTATION)
+        if bgr is None:
+            return None
+        return Image.fromarray(cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB))
+
+    @staticmethod
+    def _decode_pil(path):
+        image = Image.open(path)
+        
+        # RGBA ise RGB'ye çevir
+        if image.mode == 'RGBA':
+            background = Image.new('RGB', image.size, (255, 255, 255))
+            background.paste(image, mask=image.split()[3])
+            image = background
+        elif image.mode != 'RGB':
+            image = image.convert('RGB')
+        else:
+            image.load()
+        return image
+
+    # --- ENCODE ---
+    def encode(self, image, fmt, preset="balanced", backend=None):
+        """Görüntüyü verilen formatta bayt dizisine çevir"""
+        options = SAVE_PRESETS.get(preset, SAVE_PRESETS["balanced"])
+        backends = (backend,) if backend else self.encode_backends.get(fmt, ("pil",))
+        for name in backends:
+            if name == "cv2":
+                data = self._encode_cv2(image, fmt, options)
+                if data is not None:
+                    return data
+            elif name == "pil" and self.pil_supports(fmt):
+                return self._encode_pil(image, fmt, options)
+        raise ValueError(f"Desteklenmeyen kayıt formatı: {fmt}")
+
+    def save(self, image, path, preset="balanced"):
+        """Görüntüyü uzantısına göre ön ayarla kaydet"""
+        fmt = self.format_of(path)
+        if fmt is None:
+            image.save(path)  # BMP vb. için PIL varsayılanı
+            return
+        data = self.encode(image, fmt, preset)
+        with open(path, "wb") as f:
+            f.write(data)
+
+    @staticmethod
+    def _encode_cv2(image, fmt, options):
+        if fmt == "jpeg":
+            subsampling = {
+                "4:4:4": cv2.IMWRITE_JPEG_SAMPLING_FACTOR_444,
+                "4:2:2": cv2.IMWRITE_JPEG_SAMPLING_FACTOR_422,
+                "4:2:0": cv2.IMWRITE_JPEG_SAMPLING_FACTOR_420,
+            }[options["jpeg_subsampling"]]
+            params = [
+                cv2.IMWRITE_JPEG_QUALITY, options["jpeg_quality"],
+                cv2.IMWRITE_JPEG_SAMPLING_FACTOR, subsampling,
+                cv2.IMWRITE_JPEG_PROGRESSIVE, int(options["jpeg_progressive"]),
+            ]
+            ext = ".jpg"
+        elif fmt == "png":
+            params = [cv2.IMWRITE_PNG_COMPRESSION, options["png_level"]]
+            ext = ".png"
+        elif fmt == "webp":
+            params = [cv2.IMWRITE_WEBP_QUALITY, options["webp_quality"]]
+            ext = ".webp"
+        else:
+            return None
+
+        if image.mode == 'RGBA':
+            array = cv2.cvtColor(np.asarray(image), cv2.COLOR_RGBA2BGRA)
+        else:
+            array = cv2.cvtColor(np.asarray(image.convert('RGB')), cv2.COLOR_RGB2BGR)
+        ok, buffer = cv2.imencode(ext, array, params)
+        return buffer.tobytes() if ok else None
+
+    @staticmethod
+    def _encode_pil(image, fmt, options):
+        buffer = io.BytesIO()
+        if fmt == "jpeg":
+            if image.mode == 'RGBA':
+                image = image.convert('RGB')
+            image.save(
+                buffer, format="JPEG", quality=options["jpeg_quality"],
+                subsampling=options["jpeg_subsampling"], progressive=options["jpeg_progressive"]
+            )
+        elif fmt == "png":
+            image.save(buffer, format="PNG", compress_level=options["png_level"])
+        elif fmt == "webp":
+            image.save(buffer, format="WEBP", quality=options["webp_quality"], method=options["webp_method"])
+        elif fmt == "avif":
+            image.save(buffer, format="AVIF", quality=options["avif_quality"], speed=options["avif_speed"])
+        return buffer.getvalue()
+
+
+# Uygulama genelinde paylaşılan codec (durumsuz, thread-safe)
+codec = ImageCodec()
+
+# Panoramalar / taranmış posterler için PIL'in varsayılan (~89MP) sınırını yükselt;
+# bu boyutların üstü zaten bellek dışı (OutOfCoreImage) yoldan açılır
+Image.MAX_IMAGE_PIXELS = 1_000_000_000
+OUT_OF_CORE_PIXELS = 100_000_000
+
+
+def write_png_streaming(path, strips, width, height, compress_level=6):
+    """Satır şeritlerinden (h, w, 3) PNG'yi parça parça yaz (tüm görüntü bellekte tutulmaz)"""
+    def write_chunk(f, kind, data):
+        f.write(struct.pack(">I", len(data)))
+        f.write(kind)
+        f.write(data)
+        f.write(struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF))
+
+    with open(path, "wb") as f:
+        f.write(b"\x89PNG\r\n\x1a\n")
+        write_chunk(f, b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+        compressor = zlib.compressobj(compress_level)
+        for strip in strips:
+            rows = strip.reshape(strip.shape[0], -1)
+            # "Sub" filtresi: her bayttan soldaki pikselin aynı kanalını çıkar
+            filtered = np.empty((rows.shape[0], rows.shape[1] + 1), dtype=np.uint8)
+            filtered[:, 0] = 1
+            filtered[:, 1:4] = rows[:, :3]
+            filtered[:, 4:] = rows[:, 3:] - rows[:, :-3]
+            data = compressor.compress(filtered.tobytes())
+            if data:
+                write_chunk(f, b"IDAT", data)
+        write_chunk(f, b"IDAT", compressor.flush())
+        write_chunk(f, b"IEND", b"")
+
+
+class OutOfCoreImage:
+    """Diskte bellek eşlemeli (memmap) raster ile çok büyük görüntü.
+
+    Görüntü decode edilirken doğrudan geçici bir RGBX dosyasına (memmap)
+    yazılır; arayüz ve ilk algılama küçültülmüş bir genel bakış (overview)
+    üzerinde çalışır. Kaydederken sadece yüzlerin bulunduğu bölgeler işlenir
+    (yazma-anında-kopya eşlemesi) ve çıktı şerit şerit kodlanır.
+    """
+
+    STRIP_ROWS = 256
+    # Decode sırasında doğrudan memmap'e yazılabilen modlar: piksel başına bayt
+    # (PIL çekirdek düzeni; RGB de 4 bayttır)
+    MAPPED_MODES = {"RGB": 4, "RGBX": 4, "RGBA": 4, "L": 1, "P": 1}
+    # Diğer modlar bellekte tam decode edilir; bundan büyükleri reddedilir
+    FULL_DECODE_PIXELS = 250_000_000
+    # Bu kadar eski raster'lar yarıda kalmış oturumlardan kalmıştır (saniye);
+    # daha yenilerine dokunulmaz, açık başka bir pencerenin dosyası olabilir
+    ORPHAN_AGE = 24 * 3600
+
+    def __init__(self, path, overview_max=4096, workdir=None):
+        self.path = path
+        with Image.open(path) as probe:
+            self.width, self.height = probe.size
+
+        workdir = workdir or get_cache_dir("large")
+        fd, self.raster_path = tempfile.mkstemp(suffix=".rgbx", dir=workdir)
+        os.close(fd)
+        try:
+            self._decode_to_raster()
+            self.raster = np.memmap(self.raster_path, dtype=np.uint8, mode="r",
+                                    shape=(self.height, self.width, 4))
+            self.overview, self.overview_scale = self._build_overview(overview_max)
+        except Exception:
+            self.close()
+            raise
+
+    def _decode_to_raster(self):
+        """Görüntüyü bellekte tam kopyasını oluşturmadan raster dosyasına yaz.
+
+        Eşlenebilen modlarda decoder pikselleri doğrudan diskteki bir memmap'e
+        yazar: RGB aynı düzende olduğu için raster'ın kendisine, diğerleri
+        geçici bir dosyaya decode edilip şerit şerit RGB'ye çevrilir. Diğer
+        modlar (CMYK, 16 bit vb.) bir kez bellekte decode edilir; bu
+        FULL_DECODE_PIXELS'i aşıyorsa görüntü reddedilir.
+        """
+        raster = np.memmap(self.raster_path, dtype=np.uint8, mode="w+",
+                           shape=(self.height, self.width, 4))
+        scratch_path = None
+        try:
+            with Image.open(self.path) as image:
+                pixel_bytes = self.MAPPED_MODES.get(image.mode)
+                if pixel_bytes is not None:
+                    if image.mode in ("RGB", "RGBX"):
+                        buffer = raster
+                    else:
+                        # .rgbx uzantısı: yarıda kalırsa sweep_orphans temizler
+                        fd, scratch_path = tempfile.mkstemp(suffix=".rgbx", dir=os.path.dirname(self.raster_path))
+                        os.close(fd)
+                        buffer = np.memmap(scratch_path, dtype=np.uint8, mode="w+",
+                                           shape=(self.height, self.width * pixel_bytes))
+                    core = Image.core.map_buffer(
+                        buffer, image.size, "raw", 0, (image.mode, self.width * pixel_bytes, 1)
+                    )
+                    image.im = core  # load() hazır çekirdeği kullanır, decoder memmap'e yazar
+                    image.load()
+                    # Sıkıştırılmamış dosyalarda PIL dosyanın kendisini eşleyebilir
+                    direct = buffer is raster and image.im is core
+                    del core, buffer
+                else:
+                    if self.pixels > self.FULL_DECODE_PIXELS:
+                        raise ValueError(
+                            f"{image.mode} kipindeki görüntü parça parça açılamıyor ve tamamı "
+                            f"bellekte açılamayacak kadar büyük ({self.pixels / 1e6:.0f} MP)"
+                        )
+                    print(f"Uyarı: {image.mode} kipindeki görüntü parça parça açılamıyor, "
+                          f"tamamı bellekte decode ediliyor ({self.pixels / 1e6:.0f} MP)")
+                    image.load()
+                    direct = False
+                if not direct:
+                    self._copy_strips(image, raster)
+            raster[:, :, 3] = 255
+            raster.flush()
+        finally:
+            del raster
+            if scratch_path is not None:
+                try:
+                    os.remove(scratch_path)
+                except OSError:
+                    pass
+
+    def _copy_strips(self, image, raster):
+        """Decode edilmiş görüntüyü şerit şerit RGB'ye çevirip raster'a yaz"""
+        for y0 in range(0, self.height, self.STRIP_ROWS):
+            y1 = min(self.height, y0 + self.STRIP_ROWS)
+            strip = image.crop((0, y0, self.width, y1))
+            if strip.mode == "RGBA":
+                # Saydamlığı beyaz zemine birleştir (tek görüntü yüklemesiyle aynı)
+                background = Image.new("RGB", strip.size, (255, 255, 255))
+                background.paste(strip, mask=strip.split()[3])
+                strip = background
+            elif strip.mode != "RGB":
+                strip = strip.convert("RGB")
+            raster[y0:y1, :, :3] = np.asarray(strip)
+
+    def _build_overview(self, overview_max):
+        """Şerit şerit küçülterek genel bakış görüntüsünü oluştur"""
+        factor = max(1, math.ceil(max(self.width, self.height) / overview_max))
+        step = self.STRIP_ROWS * factor
+        overview = Image.new("RGB", (math.ceil(self.width / factor), math.ceil(self.height / factor)))
+        for y0 in range(0, self.height, step):
+            y1 = min(self.height, y0 + step)
+            strip = Image.fromarray(np.ascontiguousarray(self.raster[y0:y1, :, :3]))
+            overview.paste(strip.reduce(factor), (0, y0 // factor))
+        return overview, 1.0 / factor
+
+    @classmethod
+    def sweep_orphans(cls, workdir=None):
+        """Kapanmadan sonlanan oturumlardan kalan geçici raster'ları sil"""
+        workdir = workdir or get_cache_dir("large")
+        cutoff = time.time() - cls.ORPHAN_AGE
+        removed = 0
+        for entry in os.scandir(workdir):
+            if not entry.name.endswith(".rgbx"):
+                continue
+            try:
+                if entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+                    removed += 1
+            except OSError:
+                pass  # Kullanımda (Windows) veya başka süreç sildi
+        return removed
+
+    @property
+    def pixels(self):
+        return self.width * self.height
+
+    def read_region(self, x1, y1, x2, y2):
+        """Tam çözünürlükteki bölgeyi PIL görüntüsü olarak oku"""
+        return Image.fromarray(np.ascontiguousarray(self.raster[y1:y2, x1:x2, :3]))
+
+    def to_full(self, box):
+        """Genel bakış koordinatlarındaki kutuyu tam çözünürlüğe çevir"""
+        s = self.overview_scale
+        x1, y1, x2, y2 = box
+        return (int(x1 / s), int(y1 / s), min(self.width, int(math.ceil(x2 / s))),
+                min(self.height, int(math.ceil(y2 / s))))
+
+    def detect(self, engine, method, token=None, tile=2048, overlap=256, workers=None, detect_fn=None):
+        """Genel bakış + örtüşen tam çözünürlük döşemeleri üzerinde algıla
+
+        Sonuç genel bakış koordinatlarındadır (arayüzdeki görüntü).
+        detect_fn: (görüntü, yöntem, token) -> yüzler; verilmezse engine.detect
+        (uygulama döşemeleri DetectionScheduler üzerinden gönderir)
+        """
+        detect_fn = detect_fn or engine.detect
+        s = self.overview_scale
+        faces = [
+            tuple(int(round(v / s)) for v in box)
+            for box in detect_fn(np.asarray(self.overview), method, token)
+        ]
+
+        tiles = [
+            (x0, y0, min(self.width, x0 + tile), min(self.height, y0 + tile))
+            for y0 in range(0, self.height, tile - overlap)
+            for x0 in range(0, self.width, tile - overlap)
+        ]
+
+        def detect_tile(rect):
+            if token is not None:
+                token.check()
+            x0, y0, x1, y1 = rect
+            tile_image = np.ascontiguousarray(self.raster[y0:y1, x0:x1, :3])
+            return [(a + x0, b + y0, c + x0, d + y0) for a, b, c, d in detect_fn(tile_image, method, token)]
+
+        with ThreadPoolExecutor(max_workers=workers or engine.max_instances) as pool:
+            for tile_faces in pool.map(detect_tile, tiles):
+                faces = engine.merge_faces(faces, tile_faces)
+
+        # Arayüz genel bakış üzerinde çalışır
+        return [
+            (int(x1 * s), int(y1 * s), max(int(x1 * s) + 1, int(round(x2 * s))),
+             max(int(y1 * s) + 1, int(round(y2 * s))))
+            for x1, y1, x2, y2 in faces
+        ]
+
+    def save(self, path, regions, render_patch, preset="balanced", token=None):
+        """Sadece yüz bölgelerini işleyip çıktıyı şerit şerit yaz
+
+        regions: tam çözünürlükte (x1, y1, x2, y2) bölgeler
+        render_patch: (bölge görüntüsü) -> (yama, maske)
+        """
+        # Yazma-anında-kopya: değişiklikler sadece dokunulan sayfalar kadar bellek kullanır
+        output = np.memmap(self.raster_path, dtype=np.uint8, mode="c",
+                           shape=(self.height, self.width, 4))
+        for x1, y1, x2, y2 in regions:
+            if token is not None:
+                token.check()
+            if x2 <= x1 or y2 <= y1:
+                continue
+            region = self.read_region(x1, y1, x2, y2)
+            patch, mask = render_patch(region)
+            region.paste(patch, (0, 0), mask)
+            output[y1:y2, x1:x2, :3] = np.asarray(region)
+
+        fmt = ImageCodec.format_of(path)
+        options = SAVE_PRESETS.get(preset, SAVE_PRESETS["balanced"])
+        if fmt == "png":
+            strips = (
+                np.ascontiguousarray(output[y0:y0 + self.STRIP_ROWS, :, :3])
+                for y0 in range(0, self.height, self.STRIP_ROWS)
+            )
+            write_png_streaming(path, strips, self.width, self.height, options["png_level"])
+        elif fmt == "jpeg":
+            # RGBX, memmap'i kopyalamadan paylaşır; JPEG kodlayıcı satır satır okur
+            view = Image.frombuffer("RGBX", (self.width, self.height), output, "raw", "RGBX", 0, 1)
+            view.save(
+                path, format="JPEG", quality=options["jpeg_quality"],
+                subsampling=options["jpeg_subsampling"], progressive=options["jpeg_progressive"]
+            )
+        else:
+            raise ValueError("Çok büyük görüntüler sadece PNG veya JPEG olarak kaydedilebilir.")
+        del output
+
+    def close(self):
+        """Geçici raster dosyasını sil"""
+        self.raster = None
+        try:
+            os.remove(self.raster_path)
+        except OSError:
+            pass
+
+
+class TiledImageRenderer:
+    """Görünür alan odaklı döşemeli (tile) görüntü çizici.
+
+    Her görüntü için bir mipmap piramidi tutar, sadece ekranda görünen
+    bölgeyi (+ kenar payı) yeniden örnekler ve üretilen döşemeleri
+    (görüntü sürümü, zoom, döşeme) anahtarıyla önbellekler.
+    """
+
+    TILE_SIZE = 256
+
+    def __init__(self, max_tiles=192, max_sources=3, photo_factory=None):
+        self.max_tiles = max_tiles
+        self.max_sources = max_sources
+        self.photo_factory = photo_factory or ImageTk.PhotoImage
+        self.version_counter = 0
+        # id(görüntü) -> {"image", "version", "pyramid"} (son kullanılanlar)
+        self.sources = OrderedDict()
+        self.current = None
+        # (sürüm, ölçek, tx, ty) -> PhotoImage
+        self.tile_cache = OrderedDict()
+
+    def set_image(self, pil_image):
+        """Çizilecek görüntüyü seç, yeni bir görüntüyse yeni sürüm numarası ver"""
+        self.current = self._register(pil_image)
+        return self.current["version"]
+
+    def _register(self, pil_image):
+        """Görüntünün piramit kaydını getir (yoksa oluştur)"""
+        key = id(pil_image)
+        entry = self.sources.get(key)
+        if entry is None or entry["image"] is not pil_image:
+            self.version_counter += 1
+            entry = {"image": pil_image, "version": self.version_counter, "pyramid": [pil_image]}
+            self.sources[key] = entry
+            # En eski kaynakları (ve döşemelerini) bırak
+            while len(self.sources) > self.max_sources:
+                _, old = self.sources.popitem(last=False)
+                self._drop_version(old["version"])
+        self.sources.move_to_end(key)
+        return entry
+
+    def invalidate(self):
+        """Tüm piramitleri ve döşemeleri temizle"""
+        self.sources.clear()
+        self.tile_cache.clear()
+        self.current = None
+
+    def _drop_version(self, version):
+        for key in [k for k in self.tile_cache if k[0] == version]:
+            del self.tile_cache[key]
+
+    @staticmethod
+    def scale_key(scale):
+        """Zoom seviyesini önbellek anahtarı için sabitle"""
+        return round(scale, 6)
+
+    def get_level(self, scale, entry=None):
+        """Ölçeğe en uygun (ondan büyük en küçük) piramit seviyesini döndür"""
+        pyramid = (entry or self.current)["pyramid"]
+        level = 0
+        if scale < 1.0:
+            level = int(math.floor(math.log2(1.0 / scale)))
+        # Gerekli seviyeleri tembel olarak üret (her seviye yarı boyut)
+        while len(pyramid) <= level:
+            prev = pyramid[-1]
+            if prev.width < 2 or prev.height < 2:
+                level = len(pyramid) - 1
+                break
+            pyramid.append(prev.reduce(2))
+        return pyramid[level]
+
+    def display_size(self, scale):
+        src = self.current["image"]
+        return max(1, int(src.width * scale)), max(1, int(src.height * scale))
+
+    def visible_tiles(self, scale, offset_x, offset_y, view_w, view_h, margin=None):
+        """Canvas üzerinde görünen döşemeleri (tx, ty, canvas_x, canvas_y) olarak listele"""
+        if self.current is None:
+            return []
+        if margin is None:
+            margin = self.TILE_SIZE
+        t = self.TILE_SIZE
+        disp_w, disp_h = self.display_size(scale)
+
+        # Görüntü koordinatlarında görünür alan (kenar payı dahil)
+        x0 = max(0, -offset_x - margin)
+        y0 = max(0, -offset_y - margin)
+        x1 = min(disp_w, view_w - offset_x + margin)
+        y1 = min(disp_h, view_h - offset_y + margin)
+        if x1 <= x0 or y1 <= y0:
+            return []
+
+        tiles = []
+        for ty in range(y0 // t, (y1 - 1) // t + 1):
+            for tx in range(x0 // t, (x1 - 1) // t + 1):
+                tiles.append((tx, ty, offset_x + tx * t, offset_y + ty * t))
+        return tiles
+
+    def render_region(self, scale, x0, y0, x1, y1, source=None):
+        """Ekran ölçeğindeki bir bölgeyi piramitten yeniden örnekleyerek üret
+
+        source verilirse o görüntünün piramidi kullanılır (ekrandaki görüntü değişmez).
+        """
+        entry = self._register(source) if source is not None else self.current
+        src = entry["image"]
+        level_img = self.get_level(scale, entry)
+        # Ekran -> seviye koordinat dönüşümü
+        fx = level_img.width / (src.width * scale)
+        fy = level_img.height / (src.height * scale)
+        box = (x0 * fx, y0 * fy, min(level_img.width, x1 * fx), min(level_img.height, y1 * fy))
+
+        ratio = 1.0 / fx
+        if ratio < 1.0:
+            resample = Image.LANCZOS
+        elif ratio <= 4.0:
+            resample = Image.BILINEAR
+        else:
+            # Yüksek zoom'da pikselleri net göster
+            resample = Image.NEAREST
+        return level_img.resize((x1 - x0, y1 - y0), resample, box=box)
+
+    def render_tile(self, scale, tx, ty):
+        """Tek bir döşemeyi PIL görüntüsü olarak üret"""
+        t = self.TILE_SIZE
+        disp_w, disp_h = self.display_size(scale)
+        x0, y0 = tx * t, ty * t
+        x1, y1 = min(disp_w, x0 + t), min(disp_h, y0 + t)
+        return self.render_region(scale, x0, y0, x1, y1)
+
+    def get_tile_photo(self, scale, tx, ty):
+        """Döşemeyi önbellekten getir, yoksa üretip önbelleğe ekle"""
+        key = (self.current["version"], self.scale_key(scale), tx, ty)
+        photo = self.tile_cache.get(key)
+        if photo is not None:
+            self.tile_cache.move_to_end(key)
+            return photo
+
+        photo = self.photo_factory(self.render_tile(scale, tx, ty))
+        self.tile_cache[key] = photo
+        while len(self.tile_cache) > self.max_tiles:
+            self.tile_cache.popitem(last=False)
+        return photo
+
+
+class HistoryEntry:
+    """Geçmişteki tek bir durum: yüz listesi + görüntü (referans veya yamalar)"""
+
+    def __init__(self, face_locations, selected_faces, image):
+        self.face_locations = list(face_locations)
+        self.selected_faces = list(selected_faces)
+        self.image = image      # Henüz sıkıştırılmadıysa tam görüntü referansı
+        self.patches = None     # [(x, y, w, h, zlib_verisi)] - komşu duruma göre kayıpsız fark
+        self.mode = image.mode if image is not None else None
+        self.size = image.size if image is not None else None
+        self.nbytes = self._image_bytes(image)
+
+    @staticmethod
+    def _image_bytes(image):
+        if image is None:
+            return 0
+        return image.width * image.height * len(image.getbands())
+
+
+class ImageHistory:
+    """Bellek bütçeli, fark (delta) tabanlı geri al / yinele geçmişi.
+
+    Her kayıt önce tam görüntü referansı olarak eklenir (anında, kopyasız).
+    Yığında üstüne yeni bir kayıt geldiğinde, alttaki kayıt arka planda yeni
+    kaydın görüntüsüyle karşılaştırılır ve sadece değişen döşemeler kayıpsız
+    (zlib) yamalar olarak saklanır. Bir kayıt geri yüklendiğinde ekrandaki
+    görüntü, tam olarak karşılaştırıldığı bu görüntüdür.
+    """
+
+    TILE_SIZE = 128
+    # Tüm geçmişler tek bir arka plan thread'ini paylaşır (belge başına thread açılmaz)
+    _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="history")
+
+    def __init__(self, budget_bytes=256 * 1024 * 1024):
+        self.budget_bytes = budget_bytes
+        self.undo_stack = []
+        self.redo_stack = []
+        self._lock = threading.Lock()
+
+    def clear(self):
+        with self._lock:
+            self.undo_stack.clear()
+            self.redo_stack.clear()
+
+    def can_undo(self):
+        return bool(self.undo_stack)
+
+    def can_redo(self):
+        return bool(self.redo_stack)
+
+    def total_bytes(self):
+        with self._lock:
+            return sum(e.nbytes for e in self.undo_stack + self.redo_stack)
+
+    def flush(self):
+        """Kuyruktaki arka plan sıkıştırmalarının bitmesini bekle"""
+        self._executor.submit(lambda: None).result()
+
+    def trim(self, nbytes):
+        """En az nbytes boşalana kadar en eski kayıtları at (önce geri al, sonra yinele)
+
+        Yığının dibindeki kayıtlar üstlerindekine göre saklandığından dipten
+        atmak kalan kayıtları bozmaz. Boşalan bayt sayısını döndürür.
+        """
+        freed = 0
+        with self._lock:
+            for stack in (self.undo_stack, self.redo_stack):
+                while stack and freed < nbytes:
+                    freed += stack.pop(0).nbytes
+        return freed
+
+    def compact(self):
+        """Hâlâ tam görüntü tutan kayıtları (yığınların tepeleri) sıkıştır.
+
+        Belgenin pikselleri bellekten atılırken çağrılır; aksi halde tepedeki
+        kayıt atılan görüntünün referansını tutmaya devam ederdi.
+        """
+        self.flush()
+        with self._lock:
+            pending = [e for e in self.undo_stack + self.redo_stack if e.image is not None]
+        for entry in pending:
+            image = entry.image
+            if image is None:
+                continue
+            patches = [(0, 0, image.width, image.height, zlib.compress(image.tobytes(), 1))]
+            with self._lock:
+                if entry.image is image:
+                    entry.patches = patches
+                    entry.image = None
+                    entry.nbytes = len(patches[0][4])
+
+    def push(self, face_locations, selected_faces, image):
+        """Yeni bir işlemden önceki durumu kaydet (yinele geçmişi silinir)"""
+        with self._lock:
+            self.redo_stack.clear()
+        self._push(self.undo_stack, HistoryEntry(face_locations, selected_faces, image))
+
+    def undo(self, face_locations, selected_faces, image):
+        """Son kaydı geri yükle, mevcut durumu yinele yığınına ekle"""
+        return self._swap(self.undo_stack, self.redo_stack, face_locations, selected_faces, image)
+
+    def redo(self, face_locations, selected_faces, image):
+        """Geri alınan kaydı geri yükle, mevcut durumu geri al yığınına ekle"""
+        return self._swap(self.redo_stack, self.undo_stack, face_locations, selected_faces, image)
+
+    def _swap(self, source, target, face_locations, selected_faces, image):
+        with self._lock:
+            entry = source.pop()
+            ref, patches, mode, size = entry.image, entry.patches, entry.mode, entry.size
+        self._push(target, HistoryEntry(face_locations, selected_faces, image))
+        return entry.face_locations, entry.selected_faces, self._restore(ref, patches, mode, size, image)
+
+    def _push(self, stack, entry):
+        with self._lock:
+            previous = stack[-1] if stack else None
+            stack.append(entry)
+        # Alttaki kayıt geri yüklendiğinde ekranda bu kaydın görüntüsü olacak
+        if previous is not None and previous.image is not None:
+            self._executor.submit(self._compress, previous, entry.image)
+        self._enforce_budget()
+
+    def _restore(self, ref, patches, mode, size, current):
+        """Kaydın görüntüsünü referanstan veya mevcut görüntü + yamalardan üret"""
+        if patches is None:
+            return ref
+        if not patches:
+            return current
+        if current is None or current.size != size or current.mode != mode:
+            restored = Image.new(mode, size)  # Tam görüntü yaması (compact) her yeri kaplar
+        else:
+            restored = current.copy()
+        for x, y, w, h, data in patches:
+            restored.paste(Image.frombytes(mode, (w, h), zlib.decompress(data)), (x, y))
+        return restored
+
+    def _compress(self, entry, neighbor):
+        """Kaydı komşu görüntüye göre değişen döşemelere indir (arka plan thread'i)"""
+        image = entry.image
+        if image is None or neighbor is None:
+            return
+        if image is neighbor:
+            patches = []
+        elif image.size != neighbor.size or image.mode != neighbor.mode:
+            return  # Farklı boyut/kip: tam referans olarak kalsın
+        else:
+            patches = self._diff_patches(image, neighbor)
+
+        with self._lock:
+            if entry.image is image:
+                entry.patches = patches
+                entry.image = None
+                entry.nbytes = sum(len(p[4]) for p in patches)
+        self._enforce_budget()
+
+    def _diff_patches(self, image, neighbor):
+        """İki görüntü arasında değişen döşemeleri kayıpsız yamalar olarak çıkar"""
+        bbox = ImageChops.difference(image, neighbor).getbbox()
+        if bbox is None:
+            return []
+
+        bx1, by1 = bbox[0], bbox[1]
+        before = np.asarray(image.crop(bbox))
+        after = np.asarray(neighbor.crop(bbox))
+        changed = before != after
+        if changed.ndim == 3:
+            changed = changed.any(axis=2)
+
+        # Değişen piksel içeren döşemeleri bul
+        t = self.TILE_SIZE
+        h, w = changed.shape
+        rows, cols = -(-h // t), -(-w // t)
+        padded = np.zeros((rows * t, cols * t), dtype=bool)
+        padded[:h, :w] = changed
+        tile_changed = padded.reshape(rows, t, cols, t).any(axis=(1, 3))
+
+        patches = []
+        for ty, tx in zip(*np.nonzero(tile_changed)):
+            x0, y0 = int(tx) * t, int(ty) * t
+            region = before[y0:min(h, y0 + t), x0:min(w, x0 + t)]
+            patches.append((
+                bx1 + x0, by1 + y0, region.shape[1], region.shape[0],
+                zlib.compress(np.ascontiguousarray(region).tobytes(), 1)
+            ))
+        return patches
+
+    def _enforce_budget(self):
+        """Toplam boyut bütçeyi aşarsa en eski geri al kayıtlarını at"""
+        with self._lock:
+            total = sum(e.nbytes for e in self.undo_stack + self.redo_stack)
+            while total > self.budget_bytes and len(self.undo_stack) > 1:
+                total -= self.undo_stack.pop(0).nbytes
+
+
+class RedactionCache:
+    """Yüz başına işlenmiş yama önbelleği.
+
+    Anahtar (kutu, stil, seviye, margin, renk, ölçek) olduğundan yeniden
+    render sırasında sadece anahtarı değişen yüzler yeniden hesaplanır,
+    diğerlerinin yamaları olduğu gibi yapıştırılır. Kaynak görüntü
+    değişince önbellek temizlenir.
+    """
+
+    def __init__(self, budget_bytes=128 * 1024 * 1024):
+        self.budget_bytes = budget_bytes
+        self.source = None
+        self.entries = OrderedDict()  # anahtar -> (x, y, yama, maske)
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def clear(self):
+        with self._lock:
+            self.source = None
+            self.entries.clear()
+            self.nbytes = 0
+
+    def get_or_render(self, source, key, render):
+        """Yamayı önbellekten getir; yoksa render() ile üretip ekle"""
+        with self._lock:
+            if source is not self.source:
+                self.source = source
+                self.entries.clear()
+                self.nbytes = 0
+            value = self.entries.get(key)
+            if value is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return value
+            self.misses += 1
+
+        # Ağır filtreleme kilit dışında yapılır
+        value = render()
+
+        with self._lock:
+            if source is self.source and key not in self.entries:
+                self.entries[key] = value
+                self.nbytes += self._entry_bytes(value)
+                while self.nbytes > self.budget_bytes and len(self.entries) > 1:
+                    _, old = self.entries.popitem(last=False)
+                    self.nbytes -= self._entry_bytes(old)
+        return value
+
+    @staticmethod
+    def _entry_bytes(value):
+        _, _, patch, mask = value
+        return patch.width * patch.height * (len(patch.getbands()) + 1)
+
+
+class FaceRedactor:
+    """Yüz kutularına anonimleştirme stillerini uygular.
+
+    Pencereden bağımsızdır: uygulama, toplu/video işleri ve video segment
+    süreçleri aynı sınıfı kullanır. pool verilirse kalabalık fotoğraflarda
+    yüz başına yamalar bu iş parçacığı havuzunda paralel üretilir.
+    """
+
+    # Bu kadar ve daha fazla yüzde yamalar iş parçacığı havuzunda üretilir
+    PARALLEL_MIN_FACES = 4
+
+    def __init__(self, blur_color="#000000", pool=None):
+        self.blur_color = blur_color  # Renk dolgusu rengi
+        self.pool = pool
+
+    def redact(self, image, face_boxes, blur_style, blur_strength, margin_percent,
+               scale=1.0, source=None, cache=None, token=None, progress=None):
+        """Verilen yüz kutularına seçili stili uygula (görüntüyü yerinde değiştirir)
+
+        scale: görüntünün tam çözünürlüğe oranı (önizleme proxy'leri için < 1)
+        source/cache: verilirse yamalar kaynaktan üretilip yüz başına önbelleklenir
+        token: verilirse her yüzden önce iptal kontrol edilir
+        progress: verilirse (biten, toplam) ile çağrılır (herhangi bir thread'den)
+        """
+        img_w, img_h = image.size
+        color = self.blur_color
+        boxes = []
+        for box in face_boxes:
+            margin_box = self.margin_box(box, margin_percent, img_w, img_h)
+            if margin_box[2] > margin_box[0] and margin_box[3] > margin_box[1]:
+                boxes.append((box, margin_box))
+        
+        # Yamalar her zaman değişmemiş kaynaktan üretilir: çakışan yüzlerde stiller
+        # üst üste binmez ve sıralı/paralel yol aynı sonucu verir. Kaynak yoksa
+        # ve kutular çakışıyorsa (ya da yamalar paralel üretilecekse) görüntünün
+        # kopyası alınır; yapıştırmalar üretimle aynı anda okunan pikselleri bozmasın.
+        parallel = self.pool is not None and len(boxes) >= self.PARALLEL_MIN_FACES
+        patch_source = source
+        if patch_source is None:
+            patch_source = image.copy() if parallel or self.boxes_overlap([b for _, b in boxes]) else image
+        lock = threading.Lock()
+        finished = [0]
+        
+        def render(item):
+            box, (nx1, ny1, nx2, ny2) = item
+            if token is not None:
+                token.check()
+            make = lambda: (nx1, ny1) + self.face_patch(
+                patch_source, nx1, ny1, nx2, ny2, blur_style, blur_strength, scale
+            )
+            if cache is None:
+                result = make()
+            else:
+                key = (tuple(box), blur_style, blur_strength, round(margin_percent, 4), color, scale)
+                result = cache.get_or_render(source, key, make)
+            if progress is not None:
+                with lock:
+                    finished[0] += 1
+                    done = finished[0]
+                progress(done, len(boxes))
+            return result
+        
+        if not parallel:
+            # Az yüz: sırayla uygula (iş parçacığı maliyetine değmez)
+            for item in boxes:
+                x, y, patch, mask = render(item)
+                image.paste(patch, (x, y), mask)
+            return len(boxes)
+        
+        # Kalabalık: yamalar paralel üretilir (PIL/OpenCV filtreleri GIL'i bırakır),
+        # çakışan yüzlerde sıra korunsun diye yapıştırma sırayla yapılır
+        futures = [self.pool.submit(render, item) for item in boxes]
+        try:
+            for future in futures:
+                x, y, patch, mask = future.result()
+                image.paste(patch, (x, y), mask)
+        finally:
+            for future in futures:
+                future.cancel()
+        return len(boxes)
+
+    @staticmethod
+    def boxes_overlap(boxes):
+        """(x1, y1, x2, y2) kutularından herhangi ikisi kesişiyor mu"""
+        ordered = sorted(boxes)
+        for i, (x1, y1, x2, y2) in enumerate(ordered):
+            for ox1, oy1, ox2, oy2 in ordered[i + 1:]:
+                if ox1 >= x2:
+                    break  # x'e göre sıralı: sonrakiler de sağda kalır
+                if oy1 < y2 and oy2 > y1:
+                    return True
+        return False
+
+    @staticmethod
+    def margin_box(box, margin_percent, img_w, img_h, as_int=True):
+        """Yüz kutusunu margin oranında genişlet ve görüntü sınırlarına kırp"""
+        x1, y1, x2, y2 = box
+        mx = (x2 - x1) * margin_percent
+        my = (y2 - y1) * margin_percent
+        nx1, ny1 = max(0, x1 - mx), max(0, y1 - my)
+        nx2, ny2 = min(img_w, x2 + mx), min(img_h, y2 + my)
+        if as_int:
+            return int(nx1), int(ny1), int(nx2), int(ny2)
+        return nx1, ny1, nx2, ny2
+
+    def apply_style(self, image, x1, y1, x2, y2, blur_style, strength, scale=1.0):
+        """Seçili stile göre tek bir yüz bölgesini işle"""
+        if blur_style == "gaussian":
+            return self.apply_gaussian_blur(image, x1, y1, x2, y2, strength, scale)
+        elif blur_style == "pixelate":
+            return self.apply_pixelate(image, x1, y1, x2, y2, strength, scale)
+        elif blur_style == "black":
+            return self.apply_black_box(image, x1, y1, x2, y2)
+        elif blur_style == "color":
+            return self.apply_color_fill(image, x1, y1, x2, y2)
+        elif blur_style == "emoji":
+            return self.apply_emoji(image, x1, y1, x2, y2)
+        return image
+
+    def face_patch(self, source, x1, y1, x2, y2, blur_style, strength, scale=1.0):
+        """Tek bir yüz için işlenmiş yamayı ve maskesini (yapıştırmadan) üret"""
+        if blur_style == "gaussian":
+            return self.gaussian_patch(source, x1, y1, x2, y2, strength, scale)
+        elif blur_style == "pixelate":
+            return self.pixelate_patch(source, x1, y1, x2, y2, strength, scale)
+        elif blur_style == "black":
+            return self.fill_patch(x1, y1, x2, y2, "black")
+        elif blur_style == "color":
+            return self.fill_patch(x1, y1, x2, y2, self.blur_color)
+        elif blur_style == "emoji":
+            return self.emoji_patch(x1, y1, x2, y2)
+        # Bilinmeyen stil: kaynağı değiştirmeden geri ver
+        return source.crop((x1, y1, x2, y2)), None
+
+    @staticmethod
+    def ellipse_mask(width, height, feather=0):
+        """Yüz bölgesi için (isteğe bağlı yumuşatılmış) elips maskesi"""
+        mask = Image.new('L', (width, height), 0)
+        mask_draw = ImageDraw.Draw(mask)
+        mask_draw.ellipse([0, 0, width, height], fill=255)
+        if feather:
+            mask = mask.filter(ImageFilter.GaussianBlur(radius=feather))
+        return mask
+
+    def apply_gaussian_blur(self, image, x1, y1, x2, y2, strength, scale=1.0):
+        """Gaussian blur uygula (scale: önizleme proxy'si için yarıçap ölçeği)"""
+        blurred_face, mask = self.gaussian_patch(image, x1, y1, x2, y2, strength, scale)
+        
+        # Blurlanmış yüzü yapıştır
+        image.paste(blurred_face, (x1, y1), mask)
+        return image
+
+    def gaussian_patch(self, source, x1, y1, x2, y2, strength, scale=1.0):
+        """Gaussian blur yaması ve yumuşak elips maskesi üret"""
+        face_width = x2 - x1
+        face_height = y2 - y1
+        
+        # Yüz bölgesini kırp
+        face_region = source.crop((x1, y1, x2, y2))
+        
+        # Gaussian blur uygula
+        blurred_face = face_region.filter(
+            ImageFilter.GaussianBlur(radius=strength * scale)
+        )
+        
+        # Elips maskesi oluştur ve yumuşat
+        mask = self.ellipse_mask(face_width, face_height, feather=10 * scale)
+        return blurred_face, mask
+    
+    def apply_pixelate(self, image, x1, y1, x2, y2, strength, scale=1.0):
+        """Pikselleştirme efekti uygula (scale: önizleme proxy'si için blok ölçeği)"""
+        pixelated_face, mask = self.pixelate_patch(image, x1, y1, x2, y2, strength, scale)
+        image.paste(pixelated_face, (x1, y1), mask)
+        return image
+
+    def pixelate_patch(self, source, x1, y1, x2, y2, strength, scale=1.0):
+        """Pikselleştirilmiş yama ve yumuşak elips maskesi üret"""
+        face_width = x2 - x1
+        face_height = y2 - y1
+        
+        # Yüz bölgesini kırp
+        face_region = source.crop((x1, y1, x2, y2))
+        
+        # Piksel boyutu (1-100 arası strength değerine göre, tam çözünürlükteki genişliğe göre)
+        full_width = face_width / scale
+        pixel_size = max(4, min(50, int(full_width / (100 - strength + 10))))
+        pixel_size = max(1, int(round(pixel_size * scale)))
+        
+        # Küçült ve tekrar büyüt (pikselleştirme efekti)
+        small_size = (max(1, face_width // pixel_size), max(1, face_height // pixel_size))
+        face_small = face_region.resize(small_size, Image.NEAREST)
+        pixelated_face = face_small.resize((face_width, face_height), Image.NEAREST)
+        
+        # Elips maskesi
+        mask = self.ellipse_mask(face_width, face_height, feather=5 * scale)
+        return pixelated_face, mask
+    
+    def apply_black_box(self, image, x1, y1, x2, y2):
+        """Siyah kutu uygula"""
+        patch, mask = self.fill_patch(x1, y1, x2, y2, "black")
+        image.paste(patch, (x1, y1), mask)
+        return image
+    
+    def apply_color_fill(self, image, x1, y1, x2, y2):
+        """Renk dolgusu uygula"""
+        # Varsayılan renk: koyu gri
+        patch, mask = self.fill_patch(x1, y1, x2, y2, self.blur_color)
+        image.paste(patch, (x1, y1), mask)
+        return image
+
+    def fill_patch(self, x1, y1, x2, y2, color):
+        """Düz renkli elips yaması üret"""
+        face_width = x2 - x1
+        face_height = y2 - y1
+        patch = Image.new('RGB', (face_width, face_height), color)
+        return patch, self.ellipse_mask(face_width, face_height)
+    
+    def apply_emoji(self, image, x1, y1, x2, y2):
+        """Emoji uygula"""
+        patch, mask = self.emoji_patch(x1, y1, x2, y2)
+        image.paste(patch, (x1, y1), mask)
+        return image
+
+    def emoji_patch(self, x1, y1, x2, y2):
+        """Emoji yaması üret (altın sarısı elips + ortalanmış emoji)"""
+        face_width = x2 - x1
+        face_height = y2 - y1
+        
+        # Önce altın sarısı elips arka plan
+        patch = Image.new('RGB', (face_width, face_height), "#FFD700")  # Altın sarısı arka plan
+        draw = ImageDraw.Draw(patch)
+        
+        # Emoji metni
+        emoji = "😊"
+        font_size = int(min(face_width, face_height) * 0.65)  # Biraz daha küçük
+        
+        try:
+            from PIL import ImageFont
+            # Segoe UI Emoji fontunu kullanmayı dene
+            font = ImageFont.truetype("seguiemj.ttf", font_size)
+        except:
+            # Font bulunamazsa varsayılan
+            try:
+                font = ImageFont.truetype("arial.ttf", font_size)
+            except:
+                font = None
+        
+        # Emoji'yi merkeze yerleştir (yama koordinatlarında)
+        if font:
+            # Text boyutunu al (bbox kullanarak)
+            bbox = draw.textbbox((0, 0), emoji, font=font)
+            text_width = bbox[2] - bbox[0]
+            text_height = bbox[3] - bbox[1]
+            
+            # Merkeze yerleştir
+            text_x = (face_width - text_width) // 2
+            text_y = (face_height - text_height) // 2
+            
+            draw.text((text_x, text_y), emoji, fill="black", font=font)
+        else:
+            # Font yoksa basit smiley daire
+            center_x = face_width // 2
+            center_y = face_height // 2
+            radius = min(face_width, face_height) // 3
+            
+            # Gülümseyen yüz çiz
+            draw.ellipse([center_x - radius, center_y - radius, 
+                         center_x + radius, center_y + radius], fill="yellow", outline="black", width=2)
+            
+            # Gözler
+            eye_radius = radius // 6
+            left_eye_x = center_x - radius // 2
+            right_eye_x = center_x + radius // 2
+            eye_y = center_y - radius // 3
+            
+            draw.ellipse([left_eye_x - eye_radius, eye_y - eye_radius,
+                         left_eye_x + eye_radius, eye_y + eye_radius], fill="black")
+            draw.ellipse([right_eye_x - eye_radius, eye_y - eye_radius,
+                         right_eye_x + eye_radius, eye_y + eye_radius], fill="black")
+            
+            # Gülümseme (yay)
+            smile_y = center_y + radius // 4
+            draw.arc([center_x - radius//2, smile_y - radius//3,
+                     center_x + radius//2, smile_y + radius//3], 
+                    start=0, end=180, fill="black", width=2)
+        
+        return patch, self.ellipse_mask(face_width, face_height)
+
+
+class SequenceProcessor:
+    """Animasyon (GIF/WebP) veya fotoğraf serisi için kare kare yüz gizleme.
+
+    Her kare küçük gri bir imzayla son algılamanın yapıldığı kareye göre
+    karşılaştırılır: değişim yoksa yüzler aynen kullanılır, yerel hareket
+    varsa sadece hareketli bölgelerde, sahne değiştiyse tüm karede yeniden
+    algılama yapılır. İmza küçük yüzlerin hafif hareketini kaçırabileceğinden
+    her yüz kutusu ayrıca tam çözünürlükten karşılaştırılır; değişen yüzün
+    çevresi her zaman yeniden algılanır.
+    """
+
+    SIGNATURE_WIDTH = 160
+    PIXEL_THRESHOLD = 25     # Gri seviye farkı (0-255) bu değerin üstündeyse "değişti"
+    STILL_FRACTION = 0.002   # Bu oranın altında değişen piksel: kare aynı sayılır
+    SCENE_FRACTION = 0.3     # Bu oranın üstü: sahne değişti, tam algılama
+    FACE_PATCH = 32          # Yüz kutusu karşılaştırması bu boyuta küçültülerek yapılır
+
+    def __init__(self, detect, redact, token=None, progress=None):
+        self.detect = detect      # cv_image (RGB ndarray) -> yüz listesi
+        self.redact = redact      # (PIL görüntü, yüzler) -> None (yerinde)
+        self.token = token
+        self.progress = progress  # (biten, toplam)
+        self.stats = {"frames": 0, "full": 0, "regions": 0, "reused": 0}
+        self.written = []         # Yazılmaya başlanan çıktı dosyaları (iptalde silinir)
+
+    @staticmethod
+    def is_animated(path):
+        try:
+            with Image.open(path) as image:
+                return getattr(image, "n_frames", 1) > 1
+        except Exception:
+            return False
+
+    def _signature(self, cv_image):
+        h, w = cv_image.shape[:2]
+        scale = self.SIGNATURE_WIDTH / w
+        small = cv2.resize(cv_image, (self.SIGNATURE_WIDTH, max(1, int(h * scale))), interpolation=cv2.INTER_AREA)
+        return cv2.GaussianBlur(cv2.cvtColor(small, cv2.COLOR_RGB2GRAY), (5, 5), 0), scale
+
+    def _motion_regions(self, signature, reference, scale, width, height):
+        """Değişen bölgeleri tam çözünürlükte (x1, y1, x2, y2) olarak döndür (None: sahne değişti)"""
+        diff = cv2.absdiff(signature, reference)
+        mask = (diff > self.PIXEL_THRESHOLD).astype(np.uint8)
+        fraction = float(mask.mean())
+        if fraction < self.STILL_FRACTION:
+            return []
+        if fraction > self.SCENE_FRACTION:
+            return None
+        mask = cv2.dilate(mask, np.ones((5, 5), np.uint8), iterations=2)
+        contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        regions = []
+        for contour in contours:
+            x, y, w, h = cv2.boundingRect(contour)
+            # Bölgeyi tam çözünürlüğe çevir ve yüzün tamamı girsin diye genişlet
+            pad = max(w, h) * 0.5 / scale + 32
+            regions.append((
+                max(0, int(x / scale - pad)), max(0, int(y / scale - pad)),
+                min(width, int((x + w) / scale + pad)), min(height, int((y + h) / scale + pad))
+            ))
+        return regions
+
+    def _changed_faces(self, faces, cv_image, reference_frame):
+        """İçeriği referans kareye göre değişen yüzlerin çevresini bölge olarak döndür"""
+        height, width = cv_image.shape[:2]
+        size = (self.FACE_PATCH, self.FACE_PATCH)
+        regions = []
+        for x1, y1, x2, y2 in faces:
+            x1, y1 = max(0, int(x1)), max(0, int(y1))
+            x2, y2 = min(width, int(math.ceil(x2))), min(height, int(math.ceil(y2)))
+            if x2 <= x1 or y2 <= y1:
+                continue
+            current = cv2.resize(cv_image[y1:y2, x1:x2], size, interpolation=cv2.INTER_AREA)
+            previous = cv2.resize(reference_frame[y1:y2, x1:x2], size, interpolation=cv2.INTER_AREA)
+            if int(cv2.absdiff(current, previous).max()) > self.PIXEL_THRESHOLD:
+                pad = max(x2 - x1, y2 - y1) * 0.5 + 32
+                regions.append((max(0, int(x1 - pad)), max(0, int(y1 - pad)),
+                                min(width, int(x2 + pad)), min(height, int(y2 + pad))))
+        return regions
+
+    @staticmethod
+    def _overlaps(box, region):
+        return box[0] < region[2] and box[2] > region[0] and box[1] < region[3] and box[3] > region[1]
+
+    def process_frames(self, frames, total=None):
+        """(PIL RGB) kareleri işle, işlenmiş kareleri sırayla üret"""
+        reference = None
+        reference_frame = None  # Son algılamanın yapıldığı kare (yüz kutusu karşılaştırması için)
+        faces = []
+        for index, frame in enumerate(frames):
+            if self.token is not None:
+                self.token.check()
+            cv_image = np.asarray(frame)
+            height, width = cv_image.shape[:2]
+            signature, scale = self._signature(cv_image)
+
+            regions = None
+            if reference is not None and reference.shape == signature.shape:
+                regions = self._motion_regions(signature, reference, scale, width, height)
+            if regions is not None and faces:
+                regions = regions + self._changed_faces(faces, cv_image, reference_frame)
+
+            if regions is None:
+                faces = list(self.detect(cv_image))
+                reference, reference_frame = signature, cv_image
+                self.stats["full"] += 1
+            elif regions:
+                # Hareketli bölgelerdeki eski yüzleri at, o bölgeleri yeniden algıla
+                faces = [f for f in faces if not any(self._overlaps(f, r) for r in regions)]
+                for x1, y1, x2, y2 in regions:
+                    crop = np.ascontiguousarray(cv_image[y1:y2, x1:x2])
+                    faces.extend((a + x1, b + y1, c + x1, d + y1) for a, b, c, d in self.detect(crop))
+                reference, reference_frame = signature, cv_image
+                self.stats["regions"] += 1
+            else:
+                self.stats["reused"] += 1
+
+            output = frame.copy()
+            if faces:
+                self.redact(output, faces)
+            self.stats["frames"] += 1
+            if self.progress is not None:
+                self.progress(index + 1, total or index + 1)
+            yield output
+
+    def process_animation(self, path, output_path, preset="balanced"):
+        """Animasyonun tüm karelerini işle ve aynı zamanlamayla yeniden kodla"""
+        with Image.open(path) as image:
+            total = getattr(image, "n_frames", 1)
+            durations = []
+            loop = image.info.get("loop", 0)
+
+            def frames():
+                for frame in ImageSequence.Iterator(image):
+                    durations.append(frame.info.get("duration", image.info.get("duration", 100)))
+                    yield frame.convert("RGB")
+
+            processed = list(self.process_frames(frames(), total))
+
+        fmt = ImageCodec.format_of(output_path) or "gif"
+        self.written.append(output_path)
+        save_args = {"save_all": True, "append_images": processed[1:], "duration": durations, "loop": loop}
+        if fmt == "webp":
+            options = SAVE_PRESETS.get(preset, SAVE_PRESETS["balanced"])
+            save_args.update(quality=options["webp_quality"], method=options["webp_method"])
+            processed[0].save(output_path, format="WEBP", **save_args)
+        else:
+            processed[0].save(output_path, format="GIF", optimize=False, **save_args)
+        return self.stats
+
+    def process_sequence(self, paths, output_dir, preset="balanced"):
+        """Fotoğraf serisini (zaman atlamalı, CCTV vb.) sırayla işle ve kaydet"""
+        frames = (codec.decode(path) for path in paths)
+        for path, processed in zip(paths, self.process_frames(frames, len(paths))):
+            target = os.path.join(output_dir, f"processed_{Path(path).name}")
+            self.written.append(target)
+            codec.save(processed, target, preset)
+        return self.stats
+
+
+def scan_keyframes(path):
+    """Paketleri çözmeden tarayıp anahtar kareleri bul: ([(kare no, zaman ms)], kare sayısı)
+
+    Arka uç ham paket okumayı (CAP_PROP_FORMAT=-1) desteklemiyorsa ([], 0) döner.
+    """
+    keyframes, count = [], 0
+    raw = cv2.VideoCapture(path)
+    try:
+        if raw.set(cv2.CAP_PROP_FORMAT, -1):
+            while raw.grab():
+                if raw.get(cv2.CAP_PROP_LRF_HAS_KEY_FRAME):
+                    keyframes.append((count, raw.get(cv2.CAP_PROP_POS_MSEC)))
+                count += 1
+    except cv2.error:
+        return [], 0
+    finally:
+        raw.release()
+    return keyframes, count
+
+
+class VideoPipeline:
+    """Akışlı video işleme: decode thread -> işleme -> encode thread.
+
+    Aşamalar sınırlı kuyruklarla bağlıdır, bu yüzden bellek kullanımı video
+    uzunluğundan bağımsızdır. İşleme aşaması çağıran thread'de çalışır.
+    """
+
+    _END = object()
+
+    def __init__(self, input_path, output_path, process_frame, queue_size=8,
+                 token=None, progress=None, fourcc="mp4v", start_frame=0, end_frame=None, warmup=0,
+                 seek_timestamp=None):
+        self.input_path = input_path
+        self.output_path = output_path
+        self.process_frame = process_frame  # (RGB ndarray, indeks) -> RGB ndarray
+        self.queue_size = queue_size
+        self.token = token
+        self.progress = progress            # (biten, toplam, fps)
+        self.fourcc = fourcc
+        # Kare aralığı [start_frame, end_frame); başlangıçtan önceki `warmup` kare
+        # işlenir (takip ısınması) ama yazılmaz
+        self.start_frame = start_frame
+        self.end_frame = end_frame
+        self.warmup = min(warmup, start_frame)
+        # İlk okunacak karenin (start_frame - warmup) beklenen zamanı (ms); anahtar
+        # kare taramasından gelir, yoksa fps'ten hesaplanır
+        self.seek_timestamp = seek_timestamp
+        self.stats = {"frames": 0, "fps": 0.0, "seconds": 0.0}
+        self._errors = []
+        self._stop = threading.Event()
+
+    def _put(self, q, item):
+        """Kuyruğa koy; durdurulursa bekleyerek kilitlenme"""
+        while not self._stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _get(self, q):
+        while True:
+            try:
+                return q.get(timeout=0.1)
+            except queue.Empty:
+                if self._stop.is_set():
+                    return self._END
+
+    def _decode(self, capture, q_in, count, first_frame=None):
+        try:
+            if first_frame is not None:
+                # Atlama doğrulanırken çözülen ilk kare
+                if count is not None:
+                    count -= 1
+                if not self._put(q_in, first_frame):
+                    return
+            while not self._stop.is_set() and (count is None or count > 0):
+                if count is not None:
+                    count -= 1
+                ok, frame = capture.read()
+                if not ok:
+                    break
+                if not self._put(q_in, frame):
+                    break
+        except Exception as e:
+            self._errors.append(e)
+            self._stop.set()
+        finally:
+            capture.release()
+            self._put(q_in, self._END)
+
+    def _encode(self, writer, q_out):
+        try:
+            while True:
+                frame = self._get(q_out)
+                if frame is self._END:
+                    break
+                writer.write(frame)
+        except Exception as e:
+            self._errors.append(e)
+            self._stop.set()
+        finally:
+            writer.release()
+
+    @staticmethod
+    def _seek(capture, target, fps, timestamp=None):
+        """Tam olarak `target` karesine konumlan ve o kareyi (BGR) döndür.
+
+        CAP_PROP_POS_FRAMES ile atlama her kapsayıcı/codec'te kare doğruluğunda
+        değildir ve okunan konum da bunu kanıtlamaz: atlamadan sonra çözülen
+        karenin zaman damgası beklenen zamanla karşılaştırılır. Tutmazsa video
+        baştan çözülerek ilerlenir. Video hedeften kısaysa None döner.
+        """
+        expected = timestamp if timestamp is not None else target * 1000.0 / fps
+        capture.set(cv2.CAP_PROP_POS_FRAMES, target)
+        if capture.grab() and abs(capture.get(cv2.CAP_PROP_POS_MSEC) - expected) < 500.0 / fps:
+            ok, frame = capture.retrieve()
+            if ok:
+                return frame
+        # Doğrulanamadı: baştan kare kare ilerle
+        capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+        if int(capture.get(cv2.CAP_PROP_POS_FRAMES)) != 0:
+            raise ValueError("Video başına dönülemedi")
+        for _ in range(target):
+            if not capture.grab():
+                return None
+        ok, frame = capture.read()
+        return frame if ok else None
+
+    def run(self):
+        capture = cv2.VideoCapture(self.input_path)
+        if not capture.isOpened():
+            raise ValueError(f"Video açılamadı: {self.input_path}")
+        fps = capture.get(cv2.CAP_PROP_FPS) or 25.0
+        width = int(capture.get(cv2.CAP_PROP_FRAME_WIDTH))
+        height = int(capture.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        total = int(capture.get(cv2.CAP_PROP_FRAME_COUNT)) or None
+        first = self.start_frame - self.warmup
+        first_frame = None
+        if first > 0:
+            first_frame = self._seek(capture, first, fps, self.seek_timestamp)
+        count = None
+        if self.end_frame is not None:
+            count = self.end_frame - first
+            total = self.end_frame - self.start_frame
+        elif total is not None:
+            total -= self.start_frame
+
+        writer = cv2.VideoWriter(
+            self.output_path, cv2.VideoWriter_fourcc(*self.fourcc), fps, (width, height)
+        )
+        if not writer.isOpened():
+            capture.release()
+            raise ValueError(f"Video yazılamadı: {self.output_path}")
+
+        q_in = queue.Queue(maxsize=self.queue_size)
+        q_out = queue.Queue(maxsize=self.queue_size)
+        decoder = threading.Thread(target=self._decode, args=(capture, q_in, count, first_frame), daemon=True,
+                                   name="video-decode")
+        encoder = threading.Thread(target=self._encode, args=(writer, q_out), daemon=True, name="video-encode")
+        decoder.start()
+        encoder.start()
+
+        start = time.monotonic()
+        index = 0
+        position = first
+        try:
+            while True:
+                if self.token is not None:
+                    self.token.check()
+                frame = self._get(q_in)
+                if frame is self._END:
+                    break
+                rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+                result = self.process_frame(rgb, position)
+                position += 1
+                if position <= self.start_frame:
+                    continue  # Isınma karesi: yazılmaz
+                if not self._put(q_out, cv2.cvtColor(result, cv2.COLOR_RGB2BGR)):
+                    break
+                index += 1
+                if self.progress is not None:
+                    elapsed = time.monotonic() - start
+                    self.progress(index, total or index, index / elapsed if elapsed > 0 else 0.0)
+        except BaseException:
+            self._stop.set()
+            raise
+        finally:
+            self._put(q_out, self._END)
+            encoder.join()
+            self._stop.set()
+            decoder.join()
+
+        if self._errors:
+            raise self._errors[0]
+        elapsed = time.monotonic() - start
+        self.stats.update(frames=index, seconds=elapsed, fps=index / elapsed if elapsed > 0 else 0.0)
+        return self.stats
+
+
+# Video algılama sıklığı seçenekleri (etiket -> anahtar kare aralığı, 1: her kare)
+VIDEO_KEYFRAME_OPTIONS = {
+    "Her kare (en doğru)": 1,
+    "5 karede bir + takip": 5,
+    "10 karede bir + takip": 10,
+    "20 karede bir + takip": 20,
+}
+
+
+class FaceTracker:
+    """Anahtar karelerde algılama, aradaki karelerde seyrek optik akış ile takip.
+
+    Her yüz kutusunun içinden köşe noktaları seçilir ve Lucas-Kanade ile
+    ileri-geri izlenir; kutu noktaların ortanca kayması ve ölçek değişimi
+    kadar taşınır. Takip güveni düşerse (kaybolan noktalar, büyük ileri-geri
+    hata, izlenecek nokta bulunamayan yüz) ya da takip edilen kutuların
+    dışında yeni hareket belirirse bir sonraki anahtar kare beklenmeden
+    yeniden algılanır.
+    """
+
+    MAX_POINTS = 30          # Yüz başına izlenen en fazla nokta
+    MIN_POINTS = 4           # Bunun altında takip güvenilmez
+    MIN_SURVIVAL = 0.5       # Noktaların en az bu oranı sağ kalmalı
+    FB_ERROR = 1.5           # İleri-geri izleme hatası eşiği (piksel)
+    MOTION_WIDTH = 160
+    PIXEL_THRESHOLD = 25
+    MOTION_FRACTION = 0.01   # Kutuların dışında değişen piksel oranı: yeni hareket
+    MAX_MISSES = 1           # Algılayıcının kaçırdığı ama takip edilen yüz kaç anahtar kare tutulur
+
+    def __init__(self, detect, keyframe_interval=10):
+        self.detect = detect  # RGB ndarray -> yüz listesi
+        self.keyframe_interval = max(1, keyframe_interval)
+        self.motion_gap = max(2, self.keyframe_interval // 3)
+        self.stats = {"frames": 0, "detections": 0, "early": 0}
+        self.reset()
+
+    def reset(self):
+        self._tracks = []          # {"box", "points", "misses"}
+        self._prev_gray = None
+        self._prev_signature = None
+        self._since_detect = 0
+
+    @staticmethod
+    def _iou(a, b):
+        ix1, iy1 = max(a[0], b[0]), max(a[1], b[1])
+        ix2, iy2 = min(a[2], b[2]), min(a[3], b[3])
+        if ix2 <= ix1 or iy2 <= iy1:
+            return 0.0
+        inter = (ix2 - ix1) * (iy2 - iy1)
+        union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - inter
+        return inter / union if union > 0 else 0.0
+
+    def _seed(self, gray, box):
+        """Kutunun iç kısmından izlenecek köşe noktalarını seç"""
+        x1, y1, x2, y2 = box
+        inset_x, inset_y = (x2 - x1) // 10, (y2 - y1) // 10
+        mask = np.zeros(gray.shape, np.uint8)
+        mask[y1 + inset_y:y2 - inset_y, x1 + inset_x:x2 - inset_x] = 255
+        points = cv2.goodFeaturesToTrack(
+            gray, maxCorners=self.MAX_POINTS, qualityLevel=0.01, minDistance=3, mask=mask
+        )
+        return points.reshape(-1, 2) if points is not None else np.empty((0, 2), np.float32)
+
+    def _track(self, gray):
+        """Kutuları önceki kareden bu kareye taşı; güven düşükse False döndür"""
+        # Yeterli köşe noktası bulunamayan (düz, bulanık, karanlık) yüzler
+        # izlenemez: kutuları eski yerinde donup kalmasın, bu karede algıla
+        moving = [t for t in self._tracks if len(t["points"]) >= self.MIN_POINTS]
+        untrackable = len(moving) < len(self._tracks)
+        if not moving:
+            return not untrackable
+        p0 = np.concatenate([t["points"] for t in moving]).astype(np.float32).reshape(-1, 1, 2)
+        lk = dict(winSize=(21, 21), maxLevel=3,
+                  criteria=(cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 20, 0.03))
+        p1, st1, _ = cv2.calcOpticalFlowPyrLK(self._prev_gray, gray, p0, None, **lk)
+        p0r, st2, _ = cv2.calcOpticalFlowPyrLK(gray, self._prev_gray, p1, None, **lk)
+        fb_error = np.linalg.norm((p0 - p0r).reshape(-1, 2), axis=1)
+        good = (st1.ravel() == 1) & (st2.ravel() == 1) & (fb_error < self.FB_ERROR)
+        p0, p1 = p0.reshape(-1, 2), p1.reshape(-1, 2)
+
+        height, width = gray.shape
+        confident = not untrackable
+        start = 0
+        for track in moving:
+            count = len(track["points"])
+            sel = slice(start, start + count)
+            start += count
+            ok = good[sel]
+            if ok.sum() < self.MIN_POINTS or ok.mean() < self.MIN_SURVIVAL:
+                confident = False
+                continue
+            old, new = p0[sel][ok], p1[sel][ok]
+            dx, dy = np.median(new - old, axis=0)
+            # Ölçek: noktaların merkeze uzaklıklarının ortanca oranı
+            old_spread = np.linalg.norm(old - old.mean(axis=0), axis=1)
+            new_spread = np.linalg.norm(new - new.mean(axis=0), axis=1)
+            valid = old_spread > 1
+            ratio = float(np.median(new_spread[valid] / old_spread[valid])) if valid.any() else 1.0
+            ratio = min(1.25, max(0.8, ratio))
+
+            x1, y1, x2, y2 = track["box"]
+            cx, cy = (x1 + x2) / 2 + dx, (y1 + y2) / 2 + dy
+            hw, hh = (x2 - x1) * ratio / 2, (y2 - y1) * ratio / 2
+            # Kutu ondalıklı tutulur; her karede yuvarlama kayması birikmesin
+            box = (max(0.0, cx - hw), max(0.0, cy - hh), min(width, cx + hw), min(height, cy + hh))
+            if box[2] <= box[0] or box[3] <= box[1]:
+                confident = False
+                continue
+            track["box"] = box
+            track["points"] = new
+            track["shift"] = max(abs(dx), abs(dy))
+        return confident
+
+    def _signature(self, gray):
+        h, w = gray.shape
+        scale = self.MOTION_WIDTH / w
+        small = cv2.resize(gray, (self.MOTION_WIDTH, max(1, int(h * scale))), interpolation=cv2.INTER_AREA)
+        return cv2.GaussianBlur(small, (5, 5), 0), scale
+
+    def _new_motion(self, signature, scale):
+        """Takip edilen kutuların dışında hareket var mı"""
+        if self._prev_signature is None or self._prev_signature.shape != signature.shape:
+            return True
+        mask = cv2.absdiff(signature, self._prev_signature) > self.PIXEL_THRESHOLD
+        for track in self._tracks:
+            x1, y1, x2, y2 = track["box"]
+            pad_x, pad_y = (x2 - x1) * 0.2, (y2 - y1) * 0.2
+            mask[max(0, int((y1 - pad_y) * scale)):int((y2 + pad_y) * scale) + 1,
+                 max(0, int((x1 - pad_x) * scale)):int((x2 + pad_x) * scale) + 1] = False
+        return float(mask.mean()) > self.MOTION_FRACTION
+
+    def _redetect(self, rgb, gray):
+        detected = list(self.detect(rgb))
+        tracks = [{"box": box, "points": self._seed(gray, box), "misses": 0, "shift": 0} for box in detected]
+        # Algılayıcının bu karede kaçırdığı ama güvenle izlenen yüzleri kısa süre tut
+        for track in self._tracks:
+            if track["misses"] < self.MAX_MISSES and len(track["points"]) >= self.MIN_POINTS \
+                    and not any(self._iou(track["box"], box) > 0.3 for box in detected):
+                tracks.append(dict(track, misses=track["misses"] + 1))
+        self._tracks = tracks
+        self._since_detect = 0
+        self.stats["detections"] += 1
+
+    def update(self, rgb):
+        """Yeni kareyi işle ve bu karedeki yüz kutularını döndür"""
+        gray = cv2.cvtColor(rgb, cv2.COLOR_RGB2GRAY)
+        signature, scale = self._signature(gray)
+        self._since_detect += 1
+
+        if self._prev_gray is None or self._prev_gray.shape != gray.shape:
+            self._tracks = []
+            self._redetect(rgb, gray)
+        else:
+            confident = self._track(gray)
+            if self._since_detect >= self.keyframe_interval:
+                self._redetect(rgb, gray)
+            elif not confident or (self._since_detect >= self.motion_gap
+                                   and self._new_motion(signature, scale)):
+                self.stats["early"] += 1
+                self._redetect(rgb, gray)
+
+        self._prev_gray = gray
+        self._prev_signature = signature
+        self.stats["frames"] += 1
+
+        # Takip edilen kutuları hareket kadar genişlet (bulanıklık/gecikme payı)
+        height, width = gray.shape
+        faces = []
+        for track in self._tracks:
+            x1, y1, x2, y2 = track["box"]
+            pad = track.get("shift", 0) + (2 if self._since_detect else 0)
+            faces.append((max(0, int(x1 - pad)), max(0, int(y1 - pad)),
+                          min(width, int(math.ceil(x2 + pad))), min(height, int(math.ceil(y2 + pad)))))
+        return faces
+
+
+def video_frame_processor(detect, redact, keyframe_interval, check=None):
+    """Video kareleri için (rgb, indeks) -> rgb işleyicisi ve takipçisini döndür
+
+    keyframe_interval > 1 ise aradaki karelerde yüzler FaceTracker ile takip edilir.
+    redact: (PIL görüntü, yüzler) -> None (yerinde)
+    """
+    tracker = FaceTracker(detect, keyframe_interval) if keyframe_interval > 1 else None
+
+    def process_frame(rgb, index):
+        if check is not None:
+            check()
+        faces = tracker.update(rgb) if tracker is not None else detect(rgb)
+        if not faces:
+            return rgb
+        image = Image.fromarray(rgb)
+        redact(image, faces)
+        return np.asarray(image)
+
+    return process_frame, tracker
+
+
+# Alt süreç durumu (_init_segment_worker tarafından doldurulur)
+_segment_state = {}
+
+
+def _init_segment_worker(job, progress_queue, stop_event):
+    """Video segment süreci başlatıcısı: her süreç kendi algılayıcısını yükler"""
+    _segment_state.update(
+        job=job,
+        engine=FaceDetectionEngine(job["model_path"], job["frontal_path"], job["profile_path"], max_instances=1),
+        redactor=FaceRedactor(job["blur_color"]),
+        progress=progress_queue,
+        stop=stop_event,
+    )
+
+
+def _process_video_segment(input_path, output_path, start, end, warmup, fourcc, seek_timestamp=None):
+    """Videonun [start, end) kare aralığını işleyip ayrı bir dosyaya yaz (alt süreçte)"""
+    job = _segment_state["job"]
+    engine = _segment_state["engine"]
+    redactor = _segment_state["redactor"]
+    progress_queue = _segment_state["progress"]
+    stop = _segment_state["stop"]
+
+    def check():
+        if stop.is_set():
+            raise TaskCancelled()
+
+    process_frame, tracker = video_frame_processor(
+        lambda rgb: engine.detect(rgb, job["method"]),
+        lambda image, faces: redactor.redact(
+            image, faces, job["blur_style"], job["blur_strength"], job["margin_percent"]
+        ),
+        job["keyframe_interval"], check
+    )
+    reported = [0]
+
+    def progress(done, total, fps):
+        # Kuyruğu boğmamak için kareleri gruplayarak bildir
+        if done - reported[0] >= 10 or done == total:
+            progress_queue.put(done - reported[0])
+            reported[0] = done
+
+    pipeline = VideoPipeline(
+        input_path, output_path, process_frame, fourcc=fourcc, progress=progress,
+        start_frame=start, end_frame=end, warmup=warmup, seek_timestamp=seek_timestamp
+    )
+    stats = pipeline.run()
+    if stats["frames"] > reported[0]:
+        progress_queue.put(stats["frames"] - reported[0])
+    stats["detections"] = tracker.stats["detections"] if tracker is not None else stats["frames"]
+    return stats
+
+
+class SegmentedVideoProcessor:
+    """Uzun videoyu kare aralıklarına bölüp ayrı süreçlerde işler ve birleştirir.
+
+    Sınırlar paketler çözülmeden taranan anahtar karelere (scan_keyframes)
+    oturtulur; arka uç anahtar kare bilgisi vermiyorsa kare sayısına göre
+    bölünür. Her segment, başlangıcından en az `warmup` kare önceki anahtar
+    kareden açılır ve bu kareler takipçiyi ısıtmak için işlenip yazılmaz.
+    Segmentler ffmpeg varsa yeniden kodlamadan (concat, kaynak sesiyle), yoksa
+    OpenCV ile birleştirilir.
+    """
+
+    MIN_SEGMENT_SECONDS = 10  # Bundan kısa segmentler süreç başlatma maliyetine değmez
+
+    def __init__(self, input_path, output_path, job, workers=None, token=None,
+                 progress=None, fourcc="mp4v"):
+        self.input_path = input_path
+        self.output_path = output_path
+        self.job = job            # Alt süreçlere giden ayarlar (yöntem, stil, model yolları...)
+        self.workers = workers or os.cpu_count() or 1
+        self.token = token
+        self.progress = progress  # (biten, toplam, fps)
+        self.fourcc = fourcc
+        self.stats = {"frames": 0, "fps": 0.0, "seconds": 0.0, "detections": 0,
+                      "segments": 0, "stitch": None}
+
+    @staticmethod
+    def probe(path):
+        """(fps, kare sayısı, genişlik, yükseklik)"""
+        capture = cv2.VideoCapture(path)
+        try:
+            if not capture.isOpened():
+                raise ValueError(f"Video açılamadı: {path}")
+            return (capture.get(cv2.CAP_PROP_FPS) or 25.0,
+                    int(capture.get(cv2.CAP_PROP_FRAME_COUNT)),
+                    int(capture.get(cv2.CAP_PROP_FRAME_WIDTH)),
+                    int(capture.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+        finally:
+            capture.release()
+
+    def plan(self, total, fps, keyframes=()):
+        """Kare aralıkları [(başlangıç, bitiş), ...]
+
+        keyframes: anahtar kare numaraları; verilirse iç sınırlar en yakın
+        anahtar kareye kaydırılır (boş kalan segmentler birleşir).
+        """
+        min_length = max(1, int(fps * self.MIN_SEGMENT_SECONDS))
+        count = max(1, min(self.workers, total // min_length))
+        bounds = [total * i // count for i in range(count + 1)]
+        if keyframes:
+            keyframes = sorted(keyframes)
+            inner = set()
+            for bound in bounds[1:-1]:
+                i = bisect.bisect_left(keyframes, bound)
+                nearest = min(keyframes[max(0, i - 1):i + 1], key=lambda k: abs(k - bound))
+                if 0 < nearest < total:
+                    inner.add(nearest)
+            bounds = [0] + sorted(inner) + [total]
+        return list(zip(bounds[:-1], bounds[1:]))
+
+    @staticmethod
+    def seek_point(start, warmup, keyframes):
+        """Segmentin açılacağı (kare, zaman ms): başlangıçtan en az `warmup` önceki anahtar kare"""
+        first = max(0, start - warmup)
+        if not keyframes:
+            return first, None
+        i = bisect.bisect_right([k for k, _ in keyframes], first) - 1
+        return keyframes[i] if i >= 0 else (first, None)
+
+    def run(self):
+        fps, total, width, height = self.probe(self.input_path)
+        keyframes, count = scan_keyframes(self.input_path)
+        if count:
+            total = count  # Paket sayısı kapsayıcının bildirdiği sayıdan güvenilir
+        segments = self.plan(total, fps, [k for k, _ in keyframes])
+        warmup = self.job["keyframe_interval"] if self.job["keyframe_interval"] > 1 else 0
+        seeks = [self.seek_point(a, warmup, keyframes) for a, _ in segments]
+        workdir = tempfile.mkdtemp(prefix="segments_", dir=get_cache_dir("video"))
+        parts = [os.path.join(workdir, f"part_{i:04d}.avi" if self.fourcc == "XVID" else f"part_{i:04d}.mp4")
+                 for i in range(len(segments))]
+
+        # spawn: Tk ve algılayıcı thread'leri olan süreci fork'lamak güvenli değil
+        ctx = multiprocessing.get_context("spawn")
+        progress_queue = ctx.Queue()
+        stop_event = ctx.Event()
+        start = time.monotonic()
+        done = 0
+        try:
+            with ProcessPoolExecutor(
+                max_workers=min(self.workers, len(segments)), mp_context=ctx,
+                initializer=_init_segment_worker, initargs=(self.job, progress_queue, stop_event)
+            ) as pool:
+                futures = [
+                    pool.submit(_process_video_segment, self.input_path, part, a, b, a - first,
+                                self.fourcc, timestamp)
+                    for part, (a, b), (first, timestamp) in zip(parts, segments, seeks)
+                ]
+                try:
+                    while not all(f.done() for f in futures):
+                        if self.token is not None:
+                            self.token.check()
+                        try:
+                            done += progress_queue.get(timeout=0.2)
+                        except queue.Empty:
+                            continue
+                        if self.progress is not None:
+                            elapsed = time.monotonic() - start
+                            self.progress(done, total, done / elapsed if elapsed > 0 else 0.0)
+                    results = [f.result() for f in futures]
+                except BaseException:
+                    stop_event.set()
+                    for f in futures:
+                        f.cancel()
+                    raise
+
+            self.stats["stitch"] = self._stitch(parts, fps, (width, height))
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+        elapsed = time.monotonic() - start
+        frames = sum(r["frames"] for r in results)
+        self.stats.update(
+            frames=frames, seconds=elapsed, fps=frames / elapsed if elapsed > 0 else 0.0,
+            detections=sum(r["detections"] for r in results), segments=len(segments)
+        )
+        return self.stats
+
+    def _stitch(self, parts, fps, size):
+        """Segment dosyalarını sırayla tek çıktıda birleştir, kullanılan yolu döndür"""
+        ffmpeg = shutil.which("ffmpeg")
+        if ffmpeg:
+            list_path = os.path.join(os.path.dirname(parts[0]), "parts.txt")
+            with open(list_path, "w", encoding="utf-8") as f:
+                for part in parts:
+                    f.write("file '{}'\n".format(part.replace("'", "'\\''")))
+            base = [ffmpeg, "-y", "-loglevel", "error", "-f", "concat", "-safe", "0", "-i", list_path]
+            # Önce kaynak videonun sesiyle, olmazsa sadece görüntü
+            for extra in (["-i", self.input_path, "-map", "0:v", "-map", "1:a?"], ["-map", "0:v"]):
+                result = subprocess.run(base + extra + ["-c", "copy", self.output_path], capture_output=True)
+                if result.returncode == 0:
+                    return "ffmpeg+ses" if "1:a?" in extra else "ffmpeg"
+
+        writer = cv2.VideoWriter(self.output_path, cv2.VideoWriter_fourcc(*self.fourcc), fps, size)
+        if not writer.isOpened():
+            raise ValueError(f"Video yazılamadı: {self.output_path}")
+        try:
+            for part in parts:
+                capture = cv2.VideoCapture(part)
+                while True:
+                    ok, frame = capture.read()
+                    if not ok:
+                        break
+                    writer.write(frame)
+                capture.release()
+        finally:
+            writer.release()
+        return "opencv"
+
+
+class LiveAnonymizer:
+    """Kamera akışını gerçek zamanlı anonimleştirmek için kare ve yüz kaynağı.
+
+    Yakalama thread'i sadece en son kareyi tutar (işlenmeyen eski kareler
+    atılır). Algılama MediaPipe LIVE_STREAM modunda `detect_async` ile
+    yapılır; önceki kare hâlâ algılanıyorsa yeni kare algılayıcıya verilmez.
+    MediaPipe yoksa aynı kurallarla çalışan tek bir Haar thread'i kullanılır.
+    Yüz kutuları kareye oranla (0-1) tutulur, böylece görüntü hangi boyutta
+    çizilirse çizilsin kullanılabilir.
+    """
+
+    DETECT_WIDTH = 640  # Algılama bu genişliğe küçültülmüş karede yapılır
+
+    def __init__(self, source, model_path=None, fallback_detect=None):
+        self.source = source                    # Kamera indeksi (int) veya video dosyası
+        self.model_path = model_path
+        self.fallback_detect = fallback_detect  # RGB ndarray -> (x1, y1, x2, y2) listesi
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._frame = None                      # (RGB kare, yakalama zamanı, sıra no)
+        self._faces = []
+        self._busy = False
+        self._pending = {}                      # zaman damgası (ms) -> yakalama zamanı (_lock ile)
+        self._last_timestamp = 0                # _lock ile
+        self._wake = threading.Event()
+        self._ended = threading.Event()         # Kaynak okunamıyor (kamera koptu, dosya bozuk)
+        self._shown = None                      # Son gösterilen karenin sıra numarası
+        self._detector = None
+        self._threads = []
+        self.stats = {"captured": 0, "dropped": 0, "detected": 0, "detect_ms": 0.0}
+
+    def start(self):
+        capture = cv2.VideoCapture(self.source)
+        if not capture.isOpened():
+            raise ValueError(f"Kaynak açılamadı: {self.source}")
+        if MEDIAPIPE_AVAILABLE and self.model_path and os.path.exists(self.model_path):
+            options = vision.FaceDetectorOptions(
+                base_options=python.BaseOptions(model_asset_path=self.model_path),
+                running_mode=vision.RunningMode.LIVE_STREAM,
+                min_detection_confidence=0.4,
+                min_suppression_threshold=0.3,
+                result_callback=self._on_result
+            )
+            self._detector = vision.FaceDetector.create_from_options(options)
+        elif self.fallback_detect is not None:
+            self._threads.append(threading.Thread(target=self._fallback_loop, daemon=True, name="live-detect"))
+        else:
+            capture.release()
+            raise ValueError("Yüz algılama modeli yüklenemedi")
+        self._threads.append(threading.Thread(
+            target=self._capture_loop, args=(capture,), daemon=True, name="live-capture"
+        ))
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        for thread in self._threads:
+            thread.join(timeout=2)
+        if self._detector is not None:
+            self._detector.close()
+            self._detector = None
+
+    @property
+    def ended(self):
+        """Yakalama thread'i kaynak okunamadığı için durdu mu"""
+        return self._ended.is_set()
+
+    def _capture_loop(self, capture):
+        # Dosya kaynağı canlı akış yerine geçer: kendi hızında oynatılır ve başa sarar
+        is_file = not isinstance(self.source, int)
+        interval = 1.0 / (capture.get(cv2.CAP_PROP_FPS) or 30.0) if is_file else 0.0
+        next_time = time.monotonic()
+        sequence = 0
+        rewound = False
+        try:
+            while not self._stop.is_set():
+                ok, frame = capture.read()
+                if not ok:
+                    # Başa sardıktan sonra da okunamıyorsa dosya kullanılamaz
+                    if is_file and sequence and not rewound:
+                        capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                        rewound = True
+                        continue
+                    break
+                rewound = False
+                if interval:
+                    next_time += interval
+                    delay = next_time - time.monotonic()
+                    if delay > 0:
+                        time.sleep(delay)
+                    else:
+                        next_time = time.monotonic()
+                now = time.monotonic()
+                rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+                sequence += 1
+                with self._lock:
+                    if self._frame is not None and self._frame[2] not in (self._shown, None):
+                        self.stats["dropped"] += 1  # Gösterilmeden üzerine yazıldı
+                    self._frame = (rgb, now, sequence)
+                    self.stats["captured"] += 1
+                    submit = not self._busy
+                    if submit:
+                        self._busy = True
+                if submit:
+                    self._submit(rgb, now)
+        finally:
+            capture.release()
+            if not self._stop.is_set():
+                self._ended.set()
+
+    def _detection_input(self, rgb):
+        h, w = rgb.shape[:2]
+        if w > self.DETECT_WIDTH:
+            rgb = cv2.resize(rgb, (self.DETECT_WIDTH, int(h * self.DETECT_WIDTH / w)), interpolation=cv2.INTER_AREA)
+        return rgb
+
+    def _submit(self, rgb, captured_at):
+        if self._detector is None:
+            self._wake.set()  # Yedek thread en son kareyi alır
+            return
+        # LIVE_STREAM zaman damgaları kesin artan olmalı. Sonuç geri çağrısı
+        # MediaPipe thread'inde çalışır; kilit detect_async sırasında tutulmaz
+        with self._lock:
+            timestamp = max(self._last_timestamp + 1, int(captured_at * 1000))
+            self._last_timestamp = timestamp
+            self._pending[timestamp] = captured_at
+        small = np.ascontiguousarray(self._detection_input(rgb))
+        try:
+            self._detector.detect_async(mp.Image(image_format=mp.ImageFormat.SRGB, data=small), timestamp)
+        except Exception as e:
+            print(f"Canlı algılama hatası: {e}")
+            with self._lock:
+                self._pending.pop(timestamp, None)
+                self._busy = False
+
+    def _on_result(self, result, output_image, timestamp_ms):
+        """MediaPipe sonuç geri çağrısı (MediaPipe thread'inde)"""
+        width, height = output_image.width, output_image.height
+        faces = []
+        for detection in result.detections:
+            bbox = detection.bounding_box
+            x1, y1 = max(0, bbox.origin_x) / width, max(0, bbox.origin_y) / height
+            x2 = min(width, bbox.origin_x + bbox.width) / width
+            y2 = min(height, bbox.origin_y + bbox.height) / height
+            if x2 > x1 and y2 > y1:
+                faces.append((x1, y1, x2, y2))
+        with self._lock:
+            captured_at = self._pending.pop(timestamp_ms, None)
+        self._store(faces, captured_at)
+
+    def _fallback_loop(self):
+        while not self._stop.is_set():
+            self._wake.wait(0.5)
+            self._wake.clear()
+            with self._lock:
+                frame = self._frame
+            if frame is None or self._stop.is_set():
+                continue
+            rgb, captured_at, _ = frame
+            small = self._detection_input(rgb)
+            h, w = small.shape[:2]
+            faces = [(x1 / w, y1 / h, x2 / w, y2 / h) for x1, y1, x2, y2 in self.fallback_detect(small)]
+            self._store(faces, captured_at)
+
+    def _store(self, faces, captured_at):
+        with self._lock:
+            self._faces = faces
+            self._busy = False
+            self.stats["detected"] += 1
+            if captured_at is not None:
+                latency = (time.monotonic() - captured_at) * 1000
+                # Üstel ortalama: ekrandaki sayı titremesin
+                self.stats["detect_ms"] += (latency - self.stats["detect_ms"]) * 0.2
+
+    def latest(self, after=None):
+        """(RGB kare, yakalama zamanı, sıra no, oransal yüzler); `after`dan yeni kare yoksa None"""
+        with self._lock:
+            if self._frame is None or self._frame[2] == after:
+                return None
+            rgb, captured_at, sequence = self._frame
+            self._shown = sequence
+            return rgb, captured_at, sequence, list(self._faces)
+
+
+class VideoPreview:
+    """Video inceleme için zaman çizelgesi kaynağı.
+
+    İlk açılışta paketler çözülmeden taranarak anahtar kare indeksi çıkarılır;
+    bir kareye atlarken ya okuma konumundan ileri gidilir ya da en yakın
+    önceki anahtar kareye sarılıp oradan çözülür (hangisi daha az kare
+    çözecekse). Çözülen ve işlenen kareler bellek bütçeli bir LRU'da, yüz
+    kutuları ise kare başına (küçük olduğundan sınırsız) tutulur; böylece
+    incelenmiş bir bölümde ileri geri gezinmek yeniden çözme ve algılama
+    gerektirmez, stil değişince sadece boyama tekrarlanır.
+
+    Çözme ve algılama kilit dışında yapılır: `_lock` sadece önbellek ve yüz
+    tablosuna kısa erişimleri korur, okuyucuyu (capture) ise `_decode_lock`
+    sıralar. Böylece UI thread'i bir işçi kareleri çözerken beklemez.
+    """
+
+    def __init__(self, path, detect, redact, preview_width=960, budget_bytes=256 * 1024 * 1024):
+        self.path = path
+        self.detect = detect      # (RGB ndarray, yöntem, token) -> yüz listesi
+        self.redact = redact      # (PIL görüntü, yüzler, stil ayarları) -> None (yerinde)
+        self.budget_bytes = budget_bytes
+        self.capture = cv2.VideoCapture(path)
+        if not self.capture.isOpened():
+            raise ValueError(f"Video açılamadı: {path}")
+        self.fps = self.capture.get(cv2.CAP_PROP_FPS) or 25.0
+        self.total = int(self.capture.get(cv2.CAP_PROP_FRAME_COUNT))
+        width = int(self.capture.get(cv2.CAP_PROP_FRAME_WIDTH))
+        height = int(self.capture.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        scale = min(1.0, preview_width / width) if width else 1.0
+        self.size = (max(1, int(width * scale)), max(1, int(height * scale)))
+        self.position = 0         # Okuyucunun bir sonraki çözeceği kare
+        self.anchors = self._build_anchor_index()
+        if self.total <= 0:
+            self.capture.release()
+            raise ValueError(f"Videoda okunabilir kare yok: {path}")
+        self.cache = OrderedDict()  # ("raw", i) -> ndarray, ("out", i, ayarlar) -> PIL
+        self.nbytes = 0
+        self.faces = {}           # (kare, yöntem) -> yüzler (önizleme koordinatlarında)
+        self.stats = {"decoded": 0, "detected": 0, "hits": 0, "seeks": 0}
+        self._lock = threading.Lock()         # cache, nbytes, faces, stats
+        self._decode_lock = threading.Lock()  # capture, position
+        self._closed = False
+
+    def _build_anchor_index(self):
+        """Anahtar kare numaraları (paketler çözülmeden taranır)"""
+        keyframes, count = scan_keyframes(self.path)
+        anchors = [index for index, _ in keyframes]
+        if count:
+            self.total = count
+        if not anchors or anchors[0] != 0:
+            if self.total <= 0:
+                self.total = self._count_frames()  # Kapsayıcı kare sayısını bildirmiyor
+            # Arka uç anahtar kare bilgisi vermiyor: saniyede bir çapa varsay
+            step = max(1, int(round(self.fps)))
+            anchors = list(range(0, max(1, self.total), step))
+        return anchors
+
+    def _count_frames(self):
+        """Kareleri çözmeden sayarak toplam kare sayısını bul"""
+        raw = cv2.VideoCapture(self.path)
+        count = 0
+        try:
+            while raw.grab():
+                count += 1
+        finally:
+            raw.release()
+        return count
+
+    def anchor_for(self, index):
+        return self.anchors[max(0, bisect.bisect_right(self.anchors, index) - 1)]
+
+    def _put(self, key, value, nbytes):
+        self.cache[key] = (value, nbytes)
+        self.nbytes += nbytes
+        while self.nbytes > self.budget_bytes and len(self.cache) > 1:
+            _, (_, old) = self.cache.popitem(last=False)
+            self.nbytes -= old
+
+    def _get(self, key):
+        entry = self.cache.get(key)
+        if entry is None:
+            return None
+        self.cache.move_to_end(key)
+        return entry[0]
+
+    def _decoded(self, index, token=None):
+        """Karenin önizleme boyutundaki RGB hali (gerekirse çözülür, işçi thread'i)"""
+        with self._lock:
+            rgb = self._get(("raw", index))
+        if rgb is not None:
+            return rgb
+        try:
+            with self._decode_lock:
+                if self._closed:
+                    raise TaskCancelled()
+                with self._lock:
+                    rgb = self._get(("raw", index))  # Başka bir işçi bu arada çözmüş olabilir
+                if rgb is not None:
+                    return rgb
+                anchor = self.anchor_for(index)
+                # İleri okumak, anahtar kareden çözmekten ucuzsa sarma
+                if not (self.position <= index and index - self.position <= index - anchor):
+                    self.capture.set(cv2.CAP_PROP_POS_FRAMES, anchor)
+                    self.position = anchor
+                    with self._lock:
+                        self.stats["seeks"] += 1
+                while self.position <= index:
+                    if token is not None:
+                        token.check()
+                    ok, frame = self.capture.read()
+                    if not ok:
+                        break
+                    small = cv2.resize(frame, self.size, interpolation=cv2.INTER_AREA) \
+                        if (frame.shape[1], frame.shape[0]) != self.size else frame
+                    decoded = cv2.cvtColor(small, cv2.COLOR_BGR2RGB)
+                    # Yoldaki kareler de önbelleğe girer: geri sarmada tekrar çözülmez
+                    with self._lock:
+                        self._put(("raw", self.position), decoded, decoded.nbytes)
+                        self.stats["decoded"] += 1
+                    if self.position == index:
+                        rgb = decoded
+                    self.position += 1
+        finally:
+            self._release_if_closed()  # Pencere çözme sürerken kapandıysa
+        return rgb
+
+    def cached(self, index, method, settings):
+        """İşlenmiş kare önbellekteyse döndür (UI thread'i için, beklemez)
+
+        Kilit o an bir işçide ise None döner; kare işçi üzerinden gelir.
+        """
+        if not self._lock.acquire(blocking=False):
+            return None
+        try:
+            image = self._get(("out", index, method, settings))
+            if image is not None:
+                self.stats["hits"] += 1
+            return image
+        finally:
+            self._lock.release()
+
+    def frame(self, index, method, settings, token=None):
+        """İşlenmiş (yüzleri gizlenmiş) önizleme karesi"""
+        index = max(0, min(index, self.total - 1))
+        key = ("out", index, method, settings)
+        with self._lock:
+            image = self._get(key)
+            if image is not None:
+                self.stats["hits"] += 1
+                return image
+        rgb = self._decoded(index, token)
+        if rgb is None:
+            raise ValueError(f"Kare okunamadı: {index}")
+        with self._lock:
+            faces = self.faces.get((index, method))
+        if faces is None:
+            faces = list(self.detect(rgb, method, token))
+            with self._lock:
+                self.stats["detected"] += 1
+                self.faces[(index, method)] = faces
+        image = Image.fromarray(rgb)
+        if faces:
+            self.redact(image, faces, settings)
+        with self._lock:
+            self._put(key, image, rgb.nbytes)
+        return image
+
+    def close(self):
+        """Okuyucuyu bırak (çözme sürüyorsa, biten işçi bırakır; beklemez)"""
+        self._closed = True
+        with self._lock:
+            self.cache.clear()
+            self.nbytes = 0
+        self._release_if_closed()
+
+    def _release_if_closed(self):
+        if self._closed and self._decode_lock.acquire(blocking=False):
+            try:
+                self.capture.release()
+            finally:
+                self._decode_lock.release()
+
+
+class PerceptualHashIndex:
+    """Toplu işlemde neredeyse aynı kareler için algısal özet (dHash) indeksi.
+
+    Seri çekim ve etkinlik fotoğraflarında art arda gelen kareler birbirine
+    çok benzer. Özeti (aynı boyutta) bir öncekine yeterince yakın olan
+    görüntü o görüntünün yüz kutularını alır; istenirse her kutunun
+    çevresinde küçük bir kırpıntıda yeniden algılama yapılarak kutu
+    düzeltilir. Sadece yüz bulunan sonuçlar paylaşılır: yüzsüz bir kareye
+    benzemek tam algılamayı atlatmaz. Özetin yakın olması yüzlerin aynı
+    yerde olduğunu garanti etmediğinden, yeniden kullanılan kutulara her
+    zaman düşük çözünürlükte tam kare algılamasının sonuçları eklenir
+    (yeni giren veya yer değiştiren yüzler açıkta kalmasın).
+    """
+
+    HASH_SIZE = 8
+    REFINE_PAD = 0.5  # Yerel algılama için kutu bu oranda genişletilir
+    CHECK_DIM = 512   # Yeniden kullanımda tam kare denetimi bu uzun kenarda yapılır
+
+    def __init__(self, threshold=6, window=256):
+        self.threshold = threshold  # 64 bitte en fazla farklı bit
+        self.entries = []           # (özet, boyut, kutular), en yeniler sonda
+        self.window = window        # Seri çekimde eşler yakındadır: son N kayıt taranır
+
+    @classmethod
+    def dhash(cls, cv_image):
+        """Yatay gradyan özeti (64 bit tamsayı)"""
+        gray = cv2.cvtColor(cv_image, cv2.COLOR_RGB2GRAY) if cv_image.ndim == 3 else cv_image
+        small = cv2.resize(gray, (cls.HASH_SIZE + 1, cls.HASH_SIZE), interpolation=cv2.INTER_AREA)
+        bits = (small[:, 1:] > small[:, :-1]).flatten()
+        return int(np.packbits(bits).view(">u8")[0])
+
+    @staticmethod
+    def distance(a, b):
+        return bin(a ^ b).count("1")
+
+    def find(self, hash_value, size):
+        """Eşik içindeki en yakın kaydın kutularını döndür (yoksa None)"""
+        best, best_distance = None, self.threshold + 1
+        for other, other_size, boxes in reversed(self.entries[-self.window:]):
+            if other_size != size:
+                continue
+            d = self.distance(hash_value, other)
+            if d < best_distance:
+                best, best_distance = boxes, d
+                if d == 0:
+                    break
+        return best
+
+    def add(self, hash_value, size, boxes):
+        if boxes:
+            self.entries.append((hash_value, size, list(boxes)))
+            if len(self.entries) > self.window * 2:
+                del self.entries[:-self.window]
+
+    @classmethod
+    def coarse_detect(cls, cv_image, detect):
+        """Küçültülmüş tam karede algıla, kutuları tam çözünürlükte döndür"""
+        height, width = cv_image.shape[:2]
+        scale = min(1.0, cls.CHECK_DIM / max(height, width))
+        if scale < 1.0:
+            small = cv2.resize(cv_image, (max(1, int(width * scale)), max(1, int(height * scale))),
+                               interpolation=cv2.INTER_AREA)
+        else:
+            small = cv_image
+        return [
+            (max(0, int(x1 / scale)), max(0, int(y1 / scale)),
+             min(width, int(math.ceil(x2 / scale))), min(height, int(math.ceil(y2 / scale))))
+            for x1, y1, x2, y2 in detect(small)
+        ]
+
+    @classmethod
+    def refine(cls, cv_image, boxes, detect):
+        """Her kutunun çevresinde yerel algılama; bulunamazsa kutu aynen kalır"""
+        height, width = cv_image.shape[:2]
+        refined = []
+        for box in boxes:
+            x1, y1, x2, y2 = box
+            pad_x, pad_y = int((x2 - x1) * cls.REFINE_PAD), int((y2 - y1) * cls.REFINE_PAD)
+            cx1, cy1 = max(0, x1 - pad_x), max(0, y1 - pad_y)
+            cx2, cy2 = min(width, x2 + pad_x), min(height, y2 + pad_y)
+            found = detect(np.ascontiguousarray(cv_image[cy1:cy2, cx1:cx2]))
+            candidates = [(a + cx1, b + cy1, c + cx1, d + cy1) for a, b, c, d in found]
+            best = max(candidates, key=lambda f: FaceTracker._iou(f, box), default=None)
+            refined.append(best if best is not None and FaceTracker._iou(best, box) > 0.1 else box)
+        return refined
+
+
+class Document:
+    """Oturumda açık tek bir fotoğraf: yüzler, seçimler, geçmiş ve (varsa) pikseller"""
+
+    def __init__(self, path, face_locations=None, history_budget=64 * 1024 * 1024):
+        self.path = path
+        self.face_locations = list(face_locations or [])
+        self.selected_faces = [True] * len(self.face_locations)
+        self.history = ImageHistory(budget_bytes=history_budget)
+        self.original_image = None
+        self.processed_image = None
+        self.cv_image = None
+        self.show_selection = bool(self.face_locations)  # Seçim halkaları gösteriliyor mu
+        self.transient = False  # İnceleme modunda açıldı; düzenlenmezse geçişte kapatılır
+        self._processed_blob = None  # Bellekten atılınca düzenlenmiş görüntü (zlib)
+
+    @property
+    def is_resident(self):
+        return self.original_image is not None
+
+    def pixel_bytes(self):
+        total = self.history.total_bytes()
+        for image in (self.original_image, self.processed_image):
+            if image is not None:
+                total += image.width * image.height * len(image.getbands())
+        if self.cv_image is not None:
+            total += self.cv_image.nbytes
+        if self._processed_blob is not None:
+            total += len(self._processed_blob[2])
+        return total
+
+
+class DocumentSession:
+    """Birden çok açık belgeyi tutan oturum.
+
+    Decode edilmiş pikseller ve geri alma geçmişleri bellek bütçeli bir LRU'da
+    tutulur; bütçe aşılınca en eski belgelerin pikselleri atılır (düzenlenmişse
+    sıkıştırılarak saklanır, geçmişin tam görüntü tutan kayıtları da sıkıştırılır)
+    ve belge tekrar açıldığında diskten tembel olarak yeniden yüklenir.
+    Yüz listeleri ve seçimler her zaman bellekte kalır.
+    """
+
+    def __init__(self, loader, budget_bytes=768 * 1024 * 1024):
+        self.loader = loader  # yol -> PIL (RGB)
+        self.budget_bytes = budget_bytes
+        self.documents = OrderedDict()  # yol -> Document (en son kullanılan sonda)
+
+    @staticmethod
+    def _key(path):
+        return os.path.abspath(path)
+
+    def __len__(self):
+        return len(self.documents)
+
+    def get(self, path):
+        return self.documents.get(self._key(path))
+
+    def open(self, path, image=None, face_locations=None, cv_image=None):
+        """Belgeyi aç (varsa mevcut belgeyi döndür), pikselleri yükle ve en yeni yap"""
+        key = self._key(path)
+        doc = self.documents.get(key)
+        if doc is None:
+            doc = Document(key, face_locations)
+            self.documents[key] = doc
+        self.documents.move_to_end(key)
+        self.hydrate(doc, image, cv_image)
+        return doc
+
+    def hydrate(self, doc, image=None, cv_image=None):
+        """Atılmış pikselleri diskten (ve sıkıştırılmış düzenlemelerden) geri yükle"""
+        if not doc.is_resident:
+            doc.original_image = image if image is not None else self.loader(doc.path)
+            doc.cv_image = cv_image if cv_image is not None else np.array(doc.original_image)
+            if doc._processed_blob is not None:
+                mode, size, data = doc._processed_blob
+                doc.processed_image = Image.frombytes(mode, size, zlib.decompress(data))
+                doc._processed_blob = None
+            else:
+                doc.processed_image = doc.original_image.copy()
+        self._enforce_budget(keep=doc)
+
+    def evict(self, doc):
+        """Belgenin piksellerini bellekten at"""
+        if not doc.is_resident:
+            return
+        processed = doc.processed_image
+        if processed is not None and ImageChops.difference(processed, doc.original_image).getbbox():
+            doc._processed_blob = (processed.mode, processed.size, zlib.compress(processed.tobytes(), 1))
+        doc.original_image = None
+        doc.processed_image = None
+        doc.cv_image = None
+        doc.history.compact()
+
+    def _enforce_budget(self, keep=None):
+        total = sum(d.pixel_bytes() for d in self.documents.values())
+        for doc in list(self.documents.values()):
+            if total <= self.budget_bytes:
+                break
+            if doc is keep or not doc.is_resident:
+                continue
+            before = doc.pixel_bytes()
+            self.evict(doc)
+            total -= before - doc.pixel_bytes()
+        # Pikseller atıldıktan sonra da aşılıyorsa en eski belgelerin geçmişi budanır
+        for doc in list(self.documents.values()):
+            if total <= self.budget_bytes:
+                break
+            if doc is not keep:
+                total -= doc.history.trim(total - self.budget_bytes)
+
+    def close(self, path):
+        return self.documents.pop(self._key(path), None)
+
+    def recent(self):
+        """Belgeleri en son kullanılandan başlayarak listele"""
+        return list(reversed(self.documents.values()))
+
+
+def get_cache_dir(name):
+    """Kullanıcıya özel önbellek klasörünü (~/.faceblur/<name>) döndür"""
+    path = os.path.join(Path.home(), ".faceblur", name)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+class ThumbnailCache:
+    """Diskte kalıcı küçük resim önbelleği ve arka plan üretim havuzu.
+
+    Anahtar (yol, değiştirilme zamanı, boyut, küçük resim boyutu) olduğundan
+    dosya değişince küçük resim otomatik olarak yeniden üretilir.
+    """
+
+    def __init__(self, thumb_size=160, cache_dir=None, max_workers=None, memory_items=512):
+        self.thumb_size = thumb_size
+        self.cache_dir = cache_dir or get_cache_dir("thumbnails")
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.memory = OrderedDict()  # anahtar -> PIL küçük resim
+        self.memory_items = memory_items
+        self._lock = threading.Lock()
+        workers = max_workers or max(2, min(4, (os.cpu_count() or 2) - 1))
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="thumbnail")
+
+    def cache_key(self, path):
+        stat = os.stat(path)
+        raw = f"{os.path.abspath(path)}|{stat.st_mtime_ns}|{stat.st_size}|{self.thumb_size}"
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def get_cached(self, path):
+        """Bellekteki küçük resmi (varsa) hemen döndür"""
+        try:
+            key = self.cache_key(path)
+        except OSError:
+            return None
+        with self._lock:
+            thumb = self.memory.get(key)
+            if thumb is not None:
+                self.memory.move_to_end(key)
+            return thumb
+
+    def request(self, path):
+        """Küçük resmi arka planda getir/üret (Future döndürür)"""
+        return self.executor.submit(self.load_or_create, path)
+
+    def load_or_create(self, path):
+        """Küçük resmi bellekten, diskten veya küçültülmüş decode ile üret"""
+        key = self.cache_key(path)
+        with self._lock:
+            thumb = self.memory.get(key)
+            if thumb is not None:
+                return thumb
+
+        disk_path = os.path.join(self.cache_dir, key + ".jpg")
+        thumb = None
+        if os.path.exists(disk_path):
+            try:
+                thumb = Image.open(disk_path)
+                thumb.load()
+            except Exception:
+                thumb = None
+
+        if thumb is None:
+            img = Image.open(path)
+            # JPEG'lerde tam çözünürlük yerine küçültülmüş (1/2..1/8) decode
+            img.draft('RGB', (self.thumb_size, self.thumb_size))
+            if img.mode != 'RGB':
+                img = img.convert('RGB')
+            img.thumbnail((self.thumb_size, self.thumb_size), Image.BILINEAR)
+            thumb = img
+            try:
+                thumb.save(disk_path, format="JPEG", quality=85)
+            except OSError as e:
+                print(f"Küçük resim önbelleğe yazılamadı: {e}")
+
+        with self._lock:
+            self.memory[key] = thumb
+            while len(self.memory) > self.memory_items:
+                self.memory.popitem(last=False)
+        return thumb
+
+
+class ThumbnailGrid(ctk.CTkFrame):
+    """Sanallaştırılmış, kaydırılabilir küçük resim ızgarası.
+
+    Sadece görünür satırlardaki hücreler için Tk görüntüsü oluşturulur;
+    görünümden çıkan hücreler silinir ve bekleyen üretimleri iptal edilir.
+    """
+
+    def __init__(self, master, file_paths, thumbnail_cache, **kwargs):
+        super().__init__(master, **kwargs)
+        self.file_paths = list(file_paths)
+        self.thumbnails = thumbnail_cache
+        self.cell_w = thumbnail_cache.thumb_size + 16
+        self.cell_h = thumbnail_cache.thumb_size + 34
+        self.columns = 1
+        self.cells = {}  # indeks -> {"items": [...], "photo": PhotoImage, "future": Future}
+
+        self.canvas = Canvas(self, bg="#252525", highlightthickness=0)
+        self.scrollbar = ctk.CTkScrollbar(self, command=self._on_scrollbar)
+        self.canvas.configure(yscrollcommand=self.scrollbar.set)
+        self.scrollbar.pack(side="right", fill="y")
+        self.canvas.pack(side="left", fill="both", expand=True)
+
+        self.canvas.bind("<Configure>", lambda e: self._relayout())
+        self.canvas.bind("<MouseWheel>", self._on_mouse_wheel)
+        self.canvas.bind("<Button-4>", self._on_mouse_wheel)
+        self.canvas.bind("<Button-5>", self._on_mouse_wheel)
+        self.bind("<Destroy>", self._on_destroy, add="+")
+
+    def _on_scrollbar(self, *args):
+        self.canvas.yview(*args)
+        self._update_visible()
+
+    def _on_mouse_wheel(self, event):
+        if event.num == 4 or getattr(event, "delta", 0) > 0:
+            self.canvas.yview_scroll(-1, "units")
+        else:
+            self.canvas.yview_scroll(1, "units")
+        self._update_visible()
+
+    def _relayout(self):
+        """Genişlik değişince sütun sayısını ve kaydırma alanını yeniden hesapla"""
+        width = max(self.canvas.winfo_width(), self.cell_w)
+        columns = max(1, width // self.cell_w)
+        if columns != self.columns:
+            self.columns = columns
+            self._clear_cells()
+        rows = -(-len(self.file_paths) // self.columns)
+        self.canvas.configure(
+            scrollregion=(0, 0, self.columns * self.cell_w, rows * self.cell_h),
+            yscrollincrement=self.cell_h // 4
+        )
+        self._update_visible()
+
+    def _visible_range(self):
+        """Görünür (+1 satır tampon) hücre indeks aralığı"""
+        top = self.canvas.canvasy(0)
+        bottom = top + self.canvas.winfo_height()
+        first_row = max(0, int(top // self.cell_h) - 1)
+        last_row = int(bottom // self.cell_h) + 1
+        start = first_row * self.columns
+        end = min(len(self.file_paths), (last_row + 1) * self.columns)
+        return start, end
+
+    def _update_visible(self):
+        start, end = self._visible_range()
+
+        # Görünümden çıkan hücreleri bırak
+        for index in [i for i in self.cells if i < start or i >= end]:
+            self._drop_cell(index)
+
+        for index in range(start, end):
+            if index not in self.cells:
+                self._create_cell(index)
+
+    def _create_cell(self, index):
+        row, col = divmod(index, self.columns)
+        x = col * self.cell_w + 8
+        y = row * self.cell_h + 8
+        size = self.thumbnails.thumb_size
+        name = Path(self.file_paths[index]).name
+        if len(name) > 22:
+            name = name[:19] + "..."
+
+        items = [
+            self.canvas.create_rectangle(x, y, x + size, y + size, outline="gray30", fill="gray15"),
+            self.canvas.create_text(
+                x + size // 2, y + size + 12, text=name, fill="gray70", font=("Segoe UI", 9)
+            ),
+        ]
+        cell = {"items": items, "photo": None, "future": None}
+        self.cells[index] = cell
+
+        thumb = self.thumbnails.get_cached(self.file_paths[index])
+        if thumb is not None:
+            self._show_thumbnail(index, thumb)
+        else:
+            future = self.thumbnails.request(self.file_paths[index])
+            cell["future"] = future
+            future.add_done_callback(lambda f, i=index: self._on_thumbnail_ready(i, f))
+
+    def _on_thumbnail_ready(self, index, future):
+        """Arka plan üretimi bitti (havuz thread'i) -> Tk thread'ine aktar"""
+        if future.cancelled():
+            return
+        try:
+            thumb = future.result()
+        except Exception:
+            thumb = None
+        try:
+            self.after(0, lambda: self._show_thumbnail(index, thumb, future))
+        except RuntimeError:
+            pass  # Pencere kapanmış
+
+    def _show_thumbnail(self, index, thumb, future=None):
+        cell = self.cells.get(index)
+        if cell is None or (future is not None and cell["future"] is not future):
+            return  # Hücre bu arada görünümden çıktı
+        if thumb is None:
+            x1, y1, x2, y2 = self.canvas.coords(cell["items"][0])
+            cell["items"].append(self.canvas.create_text(
+                (x1 + x2) / 2, (y1 + y2) / 2, text="⚠️", fill="#E74C3C", font=("Segoe UI", 16)
+            ))
+            return
+
+        x1, y1, x2, y2 = self.canvas.coords(cell["items"][0])
+        cell["photo"] = ImageTk.PhotoImage(thumb)
+        cell["items"].append(self.canvas.create_image(
+            (x1 + x2) / 2, (y1 + y2) / 2, image=cell["photo"], anchor="center"
+        ))
+
+    def _drop_cell(self, index):
+        cell = self.cells.pop(index)
+        if cell["future"] is not None:
+            cell["future"].cancel()
+        for item in cell["items"]:
+            self.canvas.delete(item)
+
+    def _clear_cells(self):
+        for index in list(self.cells):
+            self._drop_cell(index)
+
+    def _on_destroy(self, event):
+        if event.widget is self:
+            for cell in self.cells.values():
+                if cell["future"] is not None:
+                    cell["future"].cancel()
+            self.cells.clear()
+
+
+class ReviewPrefetcher:
+    """İnceleme modunda sıradaki görüntüleri önceden decode edip yüzlerini algılar.
+
+    Mevcut görüntünün etrafındaki küçük bir pencere (1 geri, `ahead` ileri)
+    Future olarak tutulur; pencereden çıkanlar iptal edilir ve bellekten atılır.
+    """
+
+    def __init__(self, file_paths, load, detect, ahead=3):
+        self.file_paths = list(file_paths)
+        self.load = load        # yol -> PIL (RGB)
+        self.detect = detect    # (cv_image, yöntem) -> yüz listesi
+        self.ahead = ahead
+        self.futures = {}       # (indeks, yöntem) -> Future[(image, cv_image, faces)]
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="review-prefetch")
+
+    def __len__(self):
+        return len(self.file_paths)
+
+    def _work(self, index, method):
+        image = self.load(self.file_paths[index])
+        cv_image = np.array(image)
+        faces = self.detect(cv_image, method)
+        return image, cv_image, faces
+
+    def get(self, index, method):
+        """İndeksin sonucunu (gerekirse hemen kuyruğa alarak) Future olarak döndür"""
+        key = (index, method)
+        future = self.futures.get(key)
+        if future is None or future.cancelled():
+            future = self.executor.submit(self._work, index, method)
+            self.futures[key] = future
+        return future
+
+    def prefetch(self, index, method):
+        """Pencereyi `index` etrafına kaydır; sıradakileri önceden başlat"""
+        keep = {(i, method) for i in range(max(0, index - 1), min(len(self), index + self.ahead + 1))}
+        for key in [k for k in self.futures if k not in keep]:
+            self.futures.pop(key).cancel()
+        for i in range(index + 1, min(len(self), index + self.ahead + 1)):
+            self.get(i, method)
+
+    def shutdown(self):
+        for future in self.futures.values():
+            future.cancel()
+        self.futures.clear()
+        self.executor.shutdown(wait=False)
+
+
+class TaskCancelled(Exception):
+    """İş, daha yeni bir istek tarafından geçersiz kılındı"""
+
+
+class CancelToken:
+    """Uzun işlerin ara adımlarda kontrol ettiği iptal bayrağı"""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def check(self):
+        """İptal edildiyse TaskCancelled fırlat"""
+        if self._event.is_set():
+            raise TaskCancelled()
+
+
+class Task:
+    """Yürütücüye gönderilmiş tek bir iş"""
+
+    def __init__(self, kind, fn, on_done, on_error, key):
+        self.kind = kind
+        self.fn = fn            # fn(token) -> sonuç (arka plan thread'i)
+        self.on_done = on_done  # on_done(sonuç) (Tk thread'i)
+        self.on_error = on_error
+        self.key = key
+        self.token = CancelToken()
+
+
+class TaskExecutor:
+    """Etkileşimli işler (algılama, render, kaydetme, yükleme) için yürütücü.
+
+    Her iş türü aynı anda en fazla bir kez çalışır. Yeni istek eskisini
+    geçersiz kılar: çalışan işin token'ı iptal edilir ve yeni iş, o bitince
+    başlar (arada gelen istekler sadece sonuncusuyla değiştirilir). Aynı
+    anahtarla tekrarlanan istekler çalışan işe bağlanır. Sonuçlar Tk
+    thread'inde ve yalnızca iş hâlâ o türün en son isteğiyse uygulanır.
+    """
+
+    def __init__(self, root, max_workers=4):
+        self.root = root
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="task")
+        self._lock = threading.Lock()
+        self._running = {}  # tür -> Task
+        self._pending = {}  # tür -> Task
+        self._latest = {}   # tür -> Task (sonucu uygulanacak tek iş)
+
+    def submit(self, kind, fn, on_done=None, on_error=None, key=None):
+        """İşi kuyruğa al ve token'ını döndür"""
+        with self._lock:
+            running = self._running.get(kind)
+            if (key is not None and running is not None and running.key == key
+                    and not running.token.cancelled):
+                # Aynı iş zaten çalışıyor: tekrar hesaplama yapma
+                self._drop_pending(kind)
+                self._latest[kind] = running
+                return running.token
+
+            task = Task(kind, fn, on_done, on_error, key)
+            self._latest[kind] = task
+            self._drop_pending(kind)
+            if running is None:
+                self._start(task)
+            else:
+                running.token.cancel()
+                self._pending[kind] = task
+            return task.token
+
+    def cancel(self, kind):
+        """Türün çalışan ve bekleyen işlerini iptal et"""
+        with self._lock:
+            running = self._running.get(kind)
+            if running is not None:
+                running.token.cancel()
+            self._drop_pending(kind)
+            self._latest.pop(kind, None)
+
+    def is_busy(self, kind):
+        with self._lock:
+            return kind in self._running or kind in self._pending
+
+    def _drop_pending(self, kind):
+        pending = self._pending.pop(kind, None)
+        if pending is not None:
+            pending.token.cancel()
+
+    def _start(self, task):
+        self._running[task.kind] = task
+        self.executor.submit(self._run, task)
+
+    def _run(self, task):
+        outcome = None
+        try:
+            task.token.check()
+            outcome = (True, task.fn(task.token))
+        except TaskCancelled:
+            pass
+        except Exception as e:
+            outcome = (False, e)
+
+        with self._lock:
+            self._running.pop(task.kind, None)
+            pending = self._pending.pop(task.kind, None)
+            if pending is not None:
+                self._start(pending)
+
+        if outcome is not None and not task.token.cancelled:
+            try:
+                self.root.after(0, lambda: self._deliver(task, outcome))
+            except RuntimeError:
+                pass  # Pencere kapanmış
+
+    def _deliver(self, task, outcome):
+        with self._lock:
+            current = self._latest.get(task.kind) is task and not task.token.cancelled
+            if current:
+                del self._latest[task.kind]
+        if not current:
+            return  # Bu arada daha yeni bir istek geldi
+        ok, value = outcome
+        if ok:
+            if task.on_done:
+                task.on_done(value)
+        elif task.on_error:
+            task.on_error(value)
+        else:
+            print(f"{task.kind} hatası: {value}")
+
+
+class DetectorPool:
+    """Tek bir model için thread-safe algılayıcı örnek havuzu.
+
+    Örnekler ihtiyaç oldukça (en fazla `max_instances`) oluşturulur ve her
+    örnek aynı anda sadece bir thread'e verilir (checkout / checkin).
+    Bekleme süresi ve kullanım oranı istatistikleri tutulur.
+    """
+
+    def __init__(self, name, factory, max_instances=2):
+        self.name = name
+        self.factory = factory  # () -> yeni algılayıcı örneği
+        self.max_instances = max_instances
+        self._cond = threading.Condition()
+        self._idle = []
+        self._created = 0
+        self._in_use = 0
+        self._started = time.monotonic()
+        self.checkouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.busy_time = 0.0
+
+    def checkout(self):
+        """Boşta bir örnek al (gerekirse oluştur, hepsi meşgulse bekle)"""
+        start = time.monotonic()
+        create = False
+        with self._cond:
+            while not self._idle and self._created >= self.max_instances:
+                self._cond.wait()
+            if self._idle:
+                instance = self._idle.pop()
+            else:
+                self._created += 1
+                create = True
+
+        if create:
+            try:
+                instance = self.factory()
+            except Exception:
+                with self._cond:
+                    self._created -= 1
+                    self._cond.notify()
+                raise
+
+        waited = time.monotonic() - start
+        with self._cond:
+            self._in_use += 1
+            self.checkouts += 1
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+        return instance
+
+    def checkin(self, instance, busy_seconds=0.0):
+        """Örneği havuza geri ver"""
+        with self._cond:
+            self._in_use -= 1
+            self.busy_time += busy_seconds
+            self._idle.append(instance)
+            self._cond.notify()
+
+    @contextmanager
+    def acquire(self):
+        instance = self.checkout()
+        start = time.monotonic()
+        try:
+            yield instance
+        finally:
+            self.checkin(instance, time.monotonic() - start)
+
+    def stats(self):
+        with self._cond:
+            elapsed = max(time.monotonic() - self._started, 1e-9)
+            return {
+                "name": self.name,
+                "instances": self._created,
+                "in_use": self._in_use,
+                "checkouts": self.checkouts,
+                "avg_wait_ms": 1000 * self.total_wait / self.checkouts if self.checkouts else 0.0,
+                "max_wait_ms": 1000 * self.max_wait,
+                "utilization": self.busy_time / (elapsed * max(self._created, 1)),
+            }
+
+
+class FaceDetectionEngine:
+    """Yüz algılama modelleri ve algılama mantığı (arayüzden bağımsız).
+
+    Her model için ayrı bir DetectorPool tutulur; böylece farklı thread'ler
+    kendi örnekleriyle aynı süreç içinde paralel algılama yapabilir.
+    """
+
+    MAX_DIM = 1024
+
+    def __init__(self, model_path=None, frontal_path=None, profile_path=None, max_instances=None):
+        self.max_instances = max_instances or max(1, min(4, (os.cpu_count() or 2) // 2))
+        self.mediapipe = None
+        self.frontal = None
+        self.profile = None
+
+        # MediaPipe Face Detection (Tasks API, IMAGE modu)
+        if MEDIAPIPE_AVAILABLE:
+            if model_path and os.path.exists(model_path):
+                self.mediapipe = self._create_pool(
+                    "mediapipe", lambda: self._create_mediapipe(model_path),
+                    "MediaPipe yüz algılama hazır.", "MediaPipe yükleme hatası"
+                )
+            else:
+                print(f"Model dosyası bulunamadı: {model_path}")
+
+        # OpenCV Haar Cascade (yedek olarak)
+        if frontal_path and os.path.exists(frontal_path):
+            self.frontal = self._create_pool(
+                "frontal", lambda: self._create_cascade(frontal_path),
+                "Frontal Haar Cascade hazır.", "Cascade yükleme hatası"
+            )
+        if profile_path and os.path.exists(profile_path):
+            self.profile = self._create_pool(
+                "profile", lambda: self._create_cascade(profile_path),
+                "Profile Haar Cascade hazır.", "Cascade yükleme hatası"
+            )
+
+    def _create_pool(self, name, factory, ready_message, error_message):
+        """Havuzu oluştur ve ilk örneği hemen yükleyerek modeli doğrula"""
+        pool = DetectorPool(name, factory, self.max_instances)
+        try:
+            with pool.acquire():
+                pass
+        except Exception as e:
+            print(f"{error_message}: {e}")
+            return None
+        print(ready_message)
+        return pool
+
+    @staticmethod
+    def _create_mediapipe(model_path):
+        base_options = python.BaseOptions(model_asset_path=model_path)
+        options = vision.FaceDetectorOptions(
+            base_options=base_options,
+            min_detection_confidence=0.4,
+            min_suppression_threshold=0.3
+        )
+        return vision.FaceDetector.create_from_options(options)
+
+    @staticmethod
+    def _create_cascade(path):
+        cascade = cv2.CascadeClassifier(path)
+        if cascade.empty():
+            raise ValueError(f"Cascade yüklenemedi: {path}")
+        return cascade
+
+    @property
+    def available(self):
+        return self.mediapipe is not None or self.frontal is not None
+
+    def pools(self):
+        return [p for p in (self.mediapipe, self.frontal, self.profile) if p is not None]
+
+    def stats(self):
+        """Havuz başına bekleme süresi ve kullanım oranı"""
+        return [pool.stats() for pool in self.pools()]
+
+    def stats_text(self):
+        return "\n".join(
+            f"{st['name']}: {st['instances']} örnek, %{st['utilization'] * 100:.0f} kullanım, "
+            f"ort. bekleme {st['avg_wait_ms']:.1f} ms"
+            for st in self.stats()
+        )
+
+    @staticmethod
+    def merge_faces(base_list, new_list, threshold=0.4):
+        """new_list'teki kutulardan base_list ile çakışmayanları ekle (IoU)"""
+        for n_face in new_list:
+            nx1, ny1, nx2, ny2 = n_face
+            is_duplicate = False
+            for b_face in base_list:
+                bx1, by1, bx2, by2 = b_face
+                # IoU
+                ix1, iy1 = max(nx1, bx1), max(ny1, by1)
+                ix2, iy2 = min(nx2, bx2), min(ny2, by2)
+                if ix2 > ix1 and iy2 > iy1:
+                    i_area = (ix2 - ix1) * (iy2 - iy1)
+                    a1 = (nx2 - nx1) * (ny2 - ny1)
+                    a2 = (bx2 - bx1) * (by2 - by1)
+                    iou = i_area / (a1 + a2 - i_area)
+                    if iou > threshold:
+                        is_duplicate = True
+                        break
+            if not is_duplicate:
+                base_list.append(n_face)
+        return base_list
+
+    def detect(self, cv_image, method, token=None):
+        """Yüz algılama (Hız için optimize edilmiş) - herhangi bir thread'den çağrılabilir
+
+        token: verilirse aşamalar arasında iptal kontrol edilir (TaskCancelled)
+        """
+        orig_h, orig_w = cv_image.shape[:2]
+        
+        # PERFORMANS OPTİMİZASYONU: Büyük resimleri algılama için ölçeklendir (Maks 1024px)
+        max_dim = self.MAX_DIM
+        if max(orig_h, orig_w) > max_dim:
+            scale = max_dim / max(orig_h, orig_w)
+            target_w = int(orig_w * scale)
+            target_h = int(orig_h * scale)
+            work_img = cv2.resize(cv_image, (target_w, target_h), interpolation=cv2.INTER_AREA)
+        else:
+            scale = 1.0
+            work_img = cv_image
+            target_w, target_h = orig_w, orig_h
+
+        all_faces = []
+        
+        def get_mediapipe_faces(img):
+            mp_faces = []
+            if self.mediapipe is not None:
+                mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=img)
+                with self.mediapipe.acquire() as detector:
+                    detection_result = detector.detect(mp_image)
+                for detection in detection_result.detections:
+                    bbox = detection.bounding_box
+                    # Koordinatları orijinal ölçeğe çevir
+                    x1 = int(max(0, bbox.origin_x) / scale)
+                    y1 = int(max(0, bbox.origin_y) / scale)
+                    x2 = int(min(orig_w, (bbox.origin_x + bbox.width) / scale))
+                    y2 = int(min(orig_h, (bbox.origin_y + bbox.height) / scale))
+                    
+                    # Pillow 'Coordinate lower is less than upper' hatasını önlemek için güvenlik kontrolü
+                    if x2 > x1 and y2 > y1:
+                        mp_faces.append((x1, y1, x2, y2))
+            return mp_faces
+
+        def get_opencv_faces(img):
+            cv_faces = []
+            gray = cv2.cvtColor(img, cv2.COLOR_RGB2GRAY)
+            
+            # Parametreler work_img boyutuna göre ayarlandı
+            if self.frontal is not None:
+                with self.frontal.acquire() as cascade:
+                    detected = cascade.detectMultiScale(
+                        gray, scaleFactor=1.1, minNeighbors=5, minSize=(20, 20)
+                    )
+                for (x, y, fw, fh) in detected:
+                    x1, y1 = int(x / scale), int(y / scale)
+                    x2, y2 = int((x + fw) / scale), int((y + fh) / scale)
+                    # Güvenlik Kontrolü
+                    if x2 > x1 and y2 > y1:
+                        cv_faces.append((x1, y1, x2, y2))
+            
+            if self.profile is not None:
+                with self.profile.acquire() as cascade:
+                    detected_profile = cascade.detectMultiScale(
+                        gray, scaleFactor=1.1, minNeighbors=5, minSize=(20, 20)
+                    )
+                for (x, y, fw, fh) in detected_profile:
+                    x1, y1 = int(x / scale), int(y / scale)
+                    x2, y2 = int((x + fw) / scale), int((y + fh) / scale)
+                    # Güvenlik Kontrolü
+                    if x2 > x1 and y2 > y1:
+                        cv_faces.append((x1, y1, x2, y2))
+            return cv_faces
+
+        try:
+            # Algılama her zaman küçültülmüş 'work_img' üzerinde yapılmalı (Performans için)
+            if method == "mediapipe":
+                all_faces = get_mediapipe_faces(work_img)
+            elif method == "opencv_haar":
+                all_faces = get_opencv_faces(work_img)
+            elif method == "hybrid":
+                mp_faces = get_mediapipe_faces(work_img)
+                if token is not None:
+                    token.check()
+                cv_faces = get_opencv_faces(work_img)
+                all_faces = self.merge_faces(mp_faces, cv_faces)
+        except TaskCancelled:
+            raise
+        except Exception as e:
+            print(f"Algılama hatası: {e}")
+        
+        return all_faces
+
+
+# Algılama isteklerinin öncelikleri (küçük olan önce)
+PRIORITY_INTERACTIVE = 0
+PRIORITY_PREFETCH = 1
+PRIORITY_BATCH = 2
+
+
+class DetectionScheduler:
+    """Algılama isteklerini öncelik sırasıyla çalıştıran zamanlayıcı.
+
+    İşçi sayısı algılayıcı havuzunun örnek sayısı kadardır; bütün algılamalar
+    buradan geçer. Etkileşimli istekler kuyruktaki ön yükleme ve toplu işlem
+    isteklerinin önüne geçer; kullanıcı son `idle_delay` saniye içinde
+    etkinse toplu işlem istekleri bekletilir.
+    """
+
+    def __init__(self, detect_fn, workers=1, idle_delay=0.75):
+        self.detect_fn = detect_fn  # (cv_image, yöntem, token) -> yüz listesi
+        self.idle_delay = idle_delay
+        self._cond = threading.Condition()
+        self._queue = []  # yığın: (öncelik, sıra, Future, argümanlar)
+        self._seq = itertools.count()
+        self._last_activity = 0.0
+        for i in range(workers):
+            threading.Thread(target=self._worker, daemon=True, name=f"detector-{i}").start()
+
+    def note_activity(self):
+        """Kullanıcı etkileşimini kaydet (toplu işlem geri çekilir)"""
+        self._last_activity = time.monotonic()
+
+    def idle_remaining(self):
+        """Kullanıcı boşta sayılana kadar kalan süre (saniye)"""
+        return self.idle_delay - (time.monotonic() - self._last_activity)
+
+    def wait_until_idle(self, should_stop=None):
+        """Kullanıcı boşta kalana kadar bekle (toplu işlem thread'leri için)"""
+        while True:
+            remaining = self.idle_remaining()
+            if remaining <= 0 or (should_stop is not None and should_stop()):
+                return
+            time.sleep(min(remaining, 0.1))
+
+    def submit(self, cv_image, method, priority=PRIORITY_INTERACTIVE, token=None):
+        """Algılamayı kuyruğa al (Future döndürür)"""
+        future = Future()
+        with self._cond:
+            heapq.heappush(self._queue, (priority, next(self._seq), future, (cv_image, method, token)))
+            self._cond.notify()
+        return future
+
+    def detect(self, cv_image, method, priority=PRIORITY_INTERACTIVE, token=None):
+        """Algılamayı kuyruğa al ve sonucunu bekle"""
+        future = self.submit(cv_image, method, priority, token)
+        if token is None:
+            return future.result()
+        while True:
+            try:
+                return future.result(timeout=0.05)
+            except FutureTimeoutError:
+                if token.cancelled:
+                    future.cancel()
+                    raise TaskCancelled()
+
+    def _next(self):
+        with self._cond:
+            while True:
+                if self._queue:
+                    if self._queue[0][0] < PRIORITY_BATCH:
+                        break
+                    remaining = self.idle_remaining()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)  # Kullanıcı etkin: toplu işlem bekler
+                else:
+                    self._cond.wait()
+            return heapq.heappop(self._queue)
+
+    def _worker(self):
+        while True:
+            _, _, future, (cv_image, method, token) = self._next()
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                if token is not None:
+                    token.check()
+                future.set_result(self.detect_fn(cv_image, method, token))
+            except BaseException as e:
+                future.set_exception(e)
+
+
 class FaceBlurApp(ctk.CTk):
     def __init__(self):
         super().__init__()
@@ -71,6 +3342,7 @@ class FaceBlurApp(ctk.CTk):
         self.title("🎭 Yüz Bulanıklaştırıcı")
         self.geometry("1200x800")
         self.minsize(900, 600)
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
         
         # İşletim sistemi tespiti
         self.system = platform.system()
@@ -130,8 +3402,17 @@ class FaceBlurApp(ctk.CTk):
         self.blur_strength = ctk.IntVar(value=3)
         self.detection_method = ctk.StringVar(value="hybrid")
         self.blur_style = ctk.StringVar(value="gaussian")  # gaussian, pixelate, black, color, emoji
-        self.blur_color = "#000000"  # Renk dolgusu için varsayılan renk
         self.face_margin = ctk.IntVar(value=15)  # Seçim alanı genişletme yüzdesi (%)
+        self.live_preview_enabled = ctk.BooleanVar(value=True)  # Slider'larla canlı önizleme
+        save_preset = user_settings.get("save_preset", "balanced")
+        self.save_preset = save_preset if save_preset in SAVE_PRESETS else "balanced"
+        self.video_parallel = ctk.BooleanVar(value=user_settings.get("video_parallel", True))
+        self.batch_hash_reuse = ctk.BooleanVar(value=user_settings.get("batch_hash_reuse", False))
+        self.batch_hash_refine = ctk.BooleanVar(value=user_settings.get("batch_hash_refine", False))
+        keyframe_interval = user_settings.get("video_keyframe_interval", 10)
+        self.video_keyframe_interval = (
+            keyframe_interval if keyframe_interval in VIDEO_KEYFRAME_OPTIONS.values() else 10
+        )
 
 
 
@@ -154,18 +3435,47 @@ class FaceBlurApp(ctk.CTk):
         self.pan_start_x = 0
         self.pan_start_y = 0
         
+        # Döşemeli görüntüleyici (mipmap + döşeme önbelleği)
+        self.tile_renderer = TiledImageRenderer()
+        self._render_job = None  # Bekleyen (birleştirilmiş) yeniden çizim
+        
+        # Seçim halkaları (canvas vektör öğeleri olarak çizilir)
+        self.selection_overlays_visible = False
+        self.face_overlay_items = []  # Her yüz için (elips, etiket kutusu, etiket yazısı)
+        
+        # Canlı önizleme ve arka plan render durumu
+        self.live_preview_active = False
+        self._live_preview_job = None
+        self._live_preview_photo = None
+        self._render_callbacks = []  # Render bitince çalışacaklar (ör. bekleyen kaydetme)
+        self.tasks = TaskExecutor(self)  # Algılama/render/kaydetme/yükleme işleri
+        self.redactor = FaceRedactor("#000000", pool=ThreadPoolExecutor(
+            max_workers=os.cpu_count() or 4, thread_name_prefix="redact"
+        ))  # Yüz stilleri; kalabalık fotoğraflarda yüz başına paralel yama üretimi
+        self._progress_job = None
+        self.redaction_cache = RedactionCache()  # Yüz başına işlenmiş yama önbelleği
+        self.thumbnail_cache = None  # Toplu işlem ızgarası için (ilk kullanımda oluşturulur)
+        self.review = None  # Klasör inceleme modu (ReviewPrefetcher)
+        self.review_index = 0
+        self.session = DocumentSession(loader=self._decode_image)  # Açık belgeler
+        self.large_images = {}  # yol -> OutOfCoreImage (bellek dışı açılan büyük görüntüler)
+        self._large_pending = {}  # yol -> Future (raster'ı oluşturulmakta olanlar)
+        self._large_lock = threading.Lock()
+        OutOfCoreImage.sweep_orphans()
+        self.large_image = None  # Etkin belge bellek dışıysa
+        self.document = None  # Etkin belge
+        
         # Geri Al / Yinele (Undo/Redo) Sistem Değişkenleri
-        self.undo_stack = []
-        self.redo_stack = []
-        self.max_stack_size = 20
+        self.history = ImageHistory(budget_bytes=256 * 1024 * 1024)  # Bayt bütçeli, fark tabanlı
 
 
 
         
-        # Yüz algılama modelleri
-        self.face_cascade = None
-        self.face_detector = None
+        # Yüz algılama modelleri (model başına örnek havuzu) ve öncelikli zamanlayıcı
         self.load_detection_models()
+        self.scheduler = DetectionScheduler(
+            self.detection_engine.detect, workers=self.detection_engine.max_instances
+        )
         
         # UI oluştur
         self.create_ui()
@@ -177,54 +3487,19 @@ class FaceBlurApp(ctk.CTk):
         
     def load_detection_models(self):
         """Yüz algılama modellerini yükle"""
-        # MediaPipe Face Detection (Tasks API)
-        if MEDIAPIPE_AVAILABLE:
-            try:
-                # Model dosyasının yolu (EXE uyumlu)
-                model_path = self.get_resource_path('blaze_face_short_range.tflite')
-                
-                if os.path.exists(model_path):
-                    base_options = python.BaseOptions(model_asset_path=model_path)
-                    options = vision.FaceDetectorOptions(
-                        base_options=base_options,
-                        min_detection_confidence=0.4,
-                        min_suppression_threshold=0.3
-                    )
-                    self.face_detector = vision.FaceDetector.create_from_options(options)
-                    print("MediaPipe yüz algılama hazır.")
-                else:
-                    print(f"Model dosyası bulunamadı: {model_path}")
-                    self.face_detector = None
-            except Exception as e:
-                print(f"MediaPipe yükleme hatası: {e}")
-                self.face_detector = None
+        # Model dosyasının yolu (EXE uyumlu)
+        model_path = self.get_resource_path('blaze_face_short_range.tflite')
         
-        # OpenCV Haar Cascade (yedek olarak)
-        self.profile_cascade = None
-        try:
-            # Önce frontal cascade yükle (EXE uyumlu)
-            local_cascade = self.get_resource_path('haarcascade_frontalface_default.xml')
-            if not os.path.exists(local_cascade):
-                # Eğer yerelde yoksa cv2 içinden dene
-                local_cascade = os.path.join(cv2.data.haarcascades, 'haarcascade_frontalface_default.xml')
-
-            if os.path.exists(local_cascade):
-                self.face_cascade = cv2.CascadeClassifier(local_cascade)
-                if not self.face_cascade.empty():
-                    print("Frontal Haar Cascade hazır.")
-            
-            # Profile cascade yükle (Yan profiller için)
-            profile_path = os.path.join(cv2.data.haarcascades, 'haarcascade_profileface.xml')
-            if os.path.exists(profile_path):
-                self.profile_cascade = cv2.CascadeClassifier(profile_path)
-                if not self.profile_cascade.empty():
-                    print("Profile Haar Cascade hazır.")
-                    
-        except Exception as e:
-            print(f"Cascade yükleme hatası: {e}")
-            self.face_cascade = None
-            self.profile_cascade = None
-
+        # Önce frontal cascade (EXE uyumlu), yerelde yoksa cv2 içinden
+        frontal_path = self.get_resource_path('haarcascade_frontalface_default.xml')
+        if not os.path.exists(frontal_path):
+            frontal_path = os.path.join(cv2.data.haarcascades, 'haarcascade_frontalface_default.xml')
+        
+        # Profile cascade (Yan profiller için)
+        profile_path = os.path.join(cv2.data.haarcascades, 'haarcascade_profileface.xml')
+        
+        self.detector_paths = (model_path, frontal_path, profile_path)
+        self.detection_engine = FaceDetectionEngine(model_path, frontal_path, profile_path)
 
     
     def bind_keyboard_shortcuts(self):
@@ -255,6 +3530,17 @@ class FaceBlurApp(ctk.CTk):
         # Delete - Seçili yüzü sil (ilk seçili olanı)
         self.bind("<Delete>", lambda e: self.delete_first_selected_face())
         
+        # Kullanıcı etkinliği: toplu işlem bu sırada geri çekilir
+        for sequence in ("<Any-KeyPress>", "<Any-ButtonPress>", "<MouseWheel>", "<B1-Motion>"):
+            self.bind_all(sequence, lambda e: self.scheduler.note_activity(), add="+")
+        
+        # Ctrl+Tab - Bir önceki açık belgeye geç
+        self.bind("<Control-Tab>", lambda e: self.switch_to_previous_document())
+        
+        # PageUp / PageDown - İnceleme modunda önceki / sonraki
+        self.bind("<Prior>", lambda e: self.review_prev())
+        self.bind("<Next>", lambda e: self.review_next())
+        
         # Ctrl+A - Tüm yüzleri seç
         self.bind("<Control-a>", lambda e: self.select_all_faces())
         self.bind("<Control-A>", lambda e: self.select_all_faces())
@@ -378,6 +3664,113 @@ class FaceBlurApp(ctk.CTk):
             command=self.batch_process
         )
         self.batch_btn.pack(padx=15, pady=5, fill="x")
+        
+        # Klasör İnceleme Butonu
+        self.review_btn = ctk.CTkButton(
+            self.sidebar_scroll,
+            text="🗂️ Klasör İncele",
+            font=ctk.CTkFont(size=14, weight="bold"),
+            height=45,
+            fg_color="#16A085",
+            hover_color="#138D75",
+            command=self.start_review
+        )
+        self.review_btn.pack(padx=15, pady=5, fill="x")
+        
+        # Video İnceleme Butonu
+        self.video_preview_btn = ctk.CTkButton(
+            self.sidebar_scroll,
+            text="🎞️ Video İncele",
+            font=ctk.CTkFont(size=14, weight="bold"),
+            height=45,
+            fg_color="#884EA0",
+            hover_color="#76448A",
+            command=self.open_video_preview
+        )
+        self.video_preview_btn.pack(padx=15, pady=5, fill="x")
+        
+        # Canlı Kamera Butonu
+        self.live_btn = ctk.CTkButton(
+            self.sidebar_scroll,
+            text="📹 Canlı Kamera",
+            font=ctk.CTkFont(size=14, weight="bold"),
+            height=45,
+            fg_color="#16A085",
+            hover_color="#138D75",
+            command=self.open_live_mode
+        )
+        self.live_btn.pack(padx=15, pady=5, fill="x")
+        
+        # Animasyon / Fotoğraf Serisi Butonu
+        self.sequence_btn = ctk.CTkButton(
+            self.sidebar_scroll,
+            text="🎞️ Animasyon / Seri",
+            font=ctk.CTkFont(size=14, weight="bold"),
+            height=45,
+            fg_color="#8E44AD",
+            hover_color="#7D3C98",
+            command=self.process_sequence
+        )
+        self.sequence_btn.pack(padx=15, pady=5, fill="x")
+        
+        # Video Butonu
+        self.video_btn = ctk.CTkButton(
+            self.sidebar_scroll,
+            text="🎬 Video",
+            font=ctk.CTkFont(size=14, weight="bold"),
+            height=45,
+            fg_color="#C0392B",
+            hover_color="#A93226",
+            command=self.process_video
+        )
+        self.video_btn.pack(padx=15, pady=5, fill="x")
+        
+        # İnceleme gezinme çubuğu (sadece inceleme modunda görünür)
+        self.review_nav_frame = ctk.CTkFrame(self.sidebar_scroll, fg_color="transparent")
+        
+        self.review_prev_btn = ctk.CTkButton(
+            self.review_nav_frame,
+            text="◀",
+            width=40,
+            command=self.review_prev
+        )
+        self.review_prev_btn.pack(side="left")
+        
+        self.review_pos_label = ctk.CTkLabel(
+            self.review_nav_frame,
+            text="",
+            font=ctk.CTkFont(size=12)
+        )
+        self.review_pos_label.pack(side="left", expand=True)
+        
+        self.review_next_btn = ctk.CTkButton(
+            self.review_nav_frame,
+            text="▶",
+            width=40,
+            command=self.review_next
+        )
+        self.review_next_btn.pack(side="right")
+        
+        # Açık belgeler arası geçiş (birden fazla belge açıkken görünür)
+        self.documents_frame = ctk.CTkFrame(self.sidebar_scroll, fg_color="transparent")
+        
+        self.document_menu = ctk.CTkOptionMenu(
+            self.documents_frame,
+            values=[""],
+            command=self.on_document_menu
+        )
+        self.document_menu.pack(side="left", fill="x", expand=True)
+        
+        self.close_document_btn = ctk.CTkButton(
+            self.documents_frame,
+            text="✖",
+            width=32,
+            fg_color="gray30",
+            hover_color="#C0392B",
+            command=self.close_document
+        )
+        self.close_document_btn.pack(side="right", padx=(5, 0))
+        self._document_menu_paths = {}
 
         
         # Ayırıcı
@@ -405,7 +3798,8 @@ class FaceBlurApp(ctk.CTk):
             self.sidebar_scroll,
             text="🌫️ Gaussian Blur",
             variable=self.blur_style,
-            value="gaussian"
+            value="gaussian",
+            command=self.on_style_change
         )
         self.style_gaussian.pack(padx=25, pady=2, anchor="w")
         
@@ -413,7 +3807,8 @@ class FaceBlurApp(ctk.CTk):
             self.sidebar_scroll,
             text="🔲 Pikselleştirme",
             variable=self.blur_style,
-            value="pixelate"
+            value="pixelate",
+            command=self.on_style_change
         )
         self.style_pixelate.pack(padx=25, pady=2, anchor="w")
         
@@ -421,7 +3816,8 @@ class FaceBlurApp(ctk.CTk):
             self.sidebar_scroll,
             text="⬛ Siyah Kutu",
             variable=self.blur_style,
-            value="black"
+            value="black",
+            command=self.on_style_change
         )
         self.style_black.pack(padx=25, pady=2, anchor="w")
         
@@ -429,7 +3825,8 @@ class FaceBlurApp(ctk.CTk):
             self.sidebar_scroll,
             text="🎨 Renk Dolgusu",
             variable=self.blur_style,
-            value="color"
+            value="color",
+            command=self.on_style_change
         )
         self.style_color.pack(padx=25, pady=2, anchor="w")
         
@@ -437,9 +3834,19 @@ class FaceBlurApp(ctk.CTk):
             self.sidebar_scroll,
             text="😊 Emoji",
             variable=self.blur_style,
-            value="emoji"
+            value="emoji",
+            command=self.on_style_change
         )
         self.style_emoji.pack(padx=25, pady=2, anchor="w")
+        
+        # Canlı Önizleme (slider hareket ederken ekran çözünürlüğünde önizleme)
+        self.live_preview_switch = ctk.CTkSwitch(
+            self.sidebar_scroll,
+            text="⚡ Canlı Önizleme",
+            variable=self.live_preview_enabled,
+            command=self.on_live_preview_toggle
+        )
+        self.live_preview_switch.pack(padx=25, pady=(8, 2), anchor="w")
 
         
         # Ayırıcı
@@ -686,6 +4093,53 @@ class FaceBlurApp(ctk.CTk):
         )
         self.status_label.pack(pady=10)
         
+        # Uzun işlemler için ilerleme çubuğu (sadece işlem sırasında görünür)
+        self.progress_bar = ctk.CTkProgressBar(self.status_frame, height=8)
+        self.progress_bar.set(0)
+        
+        # --- KAYIT AYARI ---
+        self.save_preset_label = ctk.CTkLabel(
+            self.sidebar_scroll,
+            text="💾 Kayıt Ayarı (Tekli ve Toplu):",
+            font=ctk.CTkFont(size=12)
+        )
+        self.save_preset_label.pack(padx=25, anchor="w", pady=(15, 0))
+        
+        self.save_preset_menu = ctk.CTkOptionMenu(
+            self.sidebar_scroll,
+            values=[p["label"] for p in SAVE_PRESETS.values()],
+            command=self.change_save_preset
+        )
+        self.save_preset_menu.set(SAVE_PRESETS[self.save_preset]["label"])
+        self.save_preset_menu.pack(padx=25, pady=5, fill="x")
+        
+        # --- VİDEO AYARI ---
+        self.video_keyframe_label = ctk.CTkLabel(
+            self.sidebar_scroll,
+            text="🎬 Video Algılama Sıklığı:",
+            font=ctk.CTkFont(size=12)
+        )
+        self.video_keyframe_label.pack(padx=25, anchor="w", pady=(10, 0))
+        
+        self.video_keyframe_menu = ctk.CTkOptionMenu(
+            self.sidebar_scroll,
+            values=list(VIDEO_KEYFRAME_OPTIONS),
+            command=self.change_video_keyframe_interval
+        )
+        self.video_keyframe_menu.set(next(
+            label for label, n in VIDEO_KEYFRAME_OPTIONS.items() if n == self.video_keyframe_interval
+        ))
+        self.video_keyframe_menu.pack(padx=25, pady=5, fill="x")
+        
+        self.video_parallel_check = ctk.CTkCheckBox(
+            self.sidebar_scroll,
+            text="Uzun videoları çekirdeklere böl",
+            variable=self.video_parallel,
+            command=self._save_app_settings,
+            font=ctk.CTkFont(size=12)
+        )
+        self.video_parallel_check.pack(padx=25, pady=5, anchor="w")
+        
         # --- GÖRÜNÜM AYARLARI ---
         self.separator_theme = ctk.CTkFrame(self.sidebar_scroll, height=2, fg_color="gray30")
         self.separator_theme.pack(fill="x", padx=15, pady=15)
@@ -771,6 +4225,8 @@ class FaceBlurApp(ctk.CTk):
             "D: Çizim Modu\n"
             "Delete: Seçili Yüzü Sil\n"
             "Ctrl+A: Tümünü Seç\n"
+            "PgUp/PgDn: Önceki/Sonraki\n"
+            "Ctrl+Tab: Önceki Belge\n"
             "Esc: Çizimden Çık"
         )
         
@@ -821,6 +4277,7 @@ class FaceBlurApp(ctk.CTk):
         self.canvas.bind("<ButtonPress-1>", self.on_canvas_press)
         self.canvas.bind("<B1-Motion>", self.on_canvas_drag)
         self.canvas.bind("<ButtonRelease-1>", self.on_canvas_release)
+        self.canvas.bind("<Configure>", lambda e: self.schedule_render())
         
         # Placeholder text
         self.placeholder_text_id = self.canvas.create_text(
@@ -831,9 +4288,8 @@ class FaceBlurApp(ctk.CTk):
             justify="center"
         )
         
-        # Canvas image reference
-        self.canvas_image = None
-        self.canvas_image_id = None
+        # Canvas'ta gösterilen döşemelerin referansları (GC'den korumak için)
+        self.canvas_tiles = []
 
 
         
@@ -891,6 +4347,8 @@ class FaceBlurApp(ctk.CTk):
         """Orijinal görüntüyü geçici olarak göster"""
         if self.original_image:
             self.display_image(self.original_image)
+            # Canlı önizlemeyi karşılaştırma süresince gizle
+            self.canvas.delete("live_preview")
             self.status_label.configure(text="👁️ Orijinal Görüntü (İşlenmemiş)")
 
     def show_processed(self):
@@ -1101,71 +4559,196 @@ class FaceBlurApp(ctk.CTk):
 
     
     def update_preview_with_selection(self):
-        """Seçili yüzleri farklı renkte göster"""
+        """Seçili yüzleri farklı renkte göster (canvas öğeleri yerinde güncellenir)"""
         if self.original_image is None:
             return
         
-        preview_image = self.original_image.copy()
-        draw = ImageDraw.Draw(preview_image)
+        current = self.tile_renderer.current
+        if (self.selection_overlays_visible and current is not None
+                and current["image"] is self.original_image):
+            # Temel görüntü zaten ekranda, sadece halkaları güncelle
+            self._sync_face_overlays()
+            if self.live_preview_active:
+                self.schedule_live_preview()
+        else:
+            self.display_image(self.original_image, show_selection=True)
+
+    def _face_overlay_box(self, index):
+        """Yüz halkasının (margin dahil) resim koordinatlarını ve rengini hesapla"""
+        x1, y1, x2, y2 = self.face_locations[index]
+        is_selected = index < len(self.selected_faces) and self.selected_faces[index]
+        
+        if is_selected:
+            # Seçili ise margin hesapla
+            margin_percent = self.face_margin.get() / 100.0
+            img_w, img_h = self.original_image.size
+            box = self.redactor.margin_box((x1, y1, x2, y2), margin_percent, img_w, img_h, as_int=False)
+            return box, "#00FF00"  # Yeşil - seçili
+        
+        # Seçili değilse orijinal koordinatları kullan
+        return (x1, y1, x2, y2), "#FF6B6B"  # Kırmızı - seçili değil
+
+    def _sync_face_overlays(self):
+        """Seçim halkalarını ve #N etiketlerini canvas üzerinde oluştur/güncelle"""
+        if not self.selection_overlays_visible or self.original_image is None:
+            self.canvas.delete("face_overlay")
+            self.face_overlay_items = []
+            return
+        
+        # Silinen yüzlere ait fazla öğeleri kaldır
+        while len(self.face_overlay_items) > len(self.face_locations):
+            for item in self.face_overlay_items.pop():
+                self.canvas.delete(item)
         
-        margin_percent = self.face_margin.get() / 100.0
+        scale = self.display_scale
+        off_x, off_y = self.display_offset_x, self.display_offset_y
+        padding = 5 * scale
+        tags = ("face_overlay", "viewport")
         
-        for i, (x1, y1, x2, y2) in enumerate(self.face_locations):
-            # Seçili mi kontrol et
-            is_selected = i < len(self.selected_faces) and self.selected_faces[i]
+        for i in range(len(self.face_locations)):
+            (nx1, ny1, nx2, ny2), color = self._face_overlay_box(i)
             
-            if is_selected:
-                # Seçili ise margin hesapla
-                w = x2 - x1
-                h = y2 - y1
-                mx = w * margin_percent
-                my = h * margin_percent
-                
-                # Yeni koordinatlar
-                img_w, img_h = self.original_image.size
-                nx1 = max(0, x1 - mx)
-                ny1 = max(0, y1 - my)
-                nx2 = min(img_w, x2 + mx)
-                ny2 = min(img_h, y2 + my)
-                color = "#00FF00"  # Yeşil - seçili
-            else:
-                # Seçili değilse orijinal koordinatları kullan
-                nx1, ny1, nx2, ny2 = x1, y1, x2, y2
-                color = "#FF6B6B"  # Kırmızı - seçili değil
-            
-            # Elips çiz
-            padding = 5
-            for j in range(4):
-                draw.ellipse(
-                    [nx1-padding-j, ny1-padding-j, nx2+padding+j, ny2+padding+j], 
-                    outline=color
-                )
+            # Resim -> canvas koordinatları
+            cx1 = nx1 * scale + off_x - padding
+            cy1 = ny1 * scale + off_y - padding
+            cx2 = nx2 * scale + off_x + padding
+            cy2 = ny2 * scale + off_y + padding
             
-            # Numara etiketi
-            text = f"#{i+1}"
-            text_x = nx1 - 5
-            text_y = ny1 - 25
+            # Numara etiketi (ekran pikseli cinsinden sabit boyut)
+            text_x = cx1
+            text_y = cy1 - 22
             if text_y < 5:
-                text_y = ny2 + 5
-            draw.rectangle([text_x, text_y, text_x + 35, text_y + 20], fill=color)
-            draw.text((text_x + 5, text_y + 2), text, fill="black")
-
-
-        
-        self.display_image(preview_image)
+                text_y = cy2 + 3
+            
+            if i < len(self.face_overlay_items):
+                oval_id, label_bg_id, label_id = self.face_overlay_items[i]
+                self.canvas.coords(oval_id, cx1, cy1, cx2, cy2)
+                self.canvas.itemconfigure(oval_id, outline=color)
+                self.canvas.coords(label_bg_id, text_x, text_y, text_x + 35, text_y + 20)
+                self.canvas.itemconfigure(label_bg_id, fill=color)
+                self.canvas.coords(label_id, text_x + 5, text_y + 2)
+                self.canvas.itemconfigure(label_id, text=f"#{i+1}")
+            else:
+                oval_id = self.canvas.create_oval(cx1, cy1, cx2, cy2, outline=color, width=3, tags=tags)
+                label_bg_id = self.canvas.create_rectangle(
+                    text_x, text_y, text_x + 35, text_y + 20, fill=color, outline="", tags=tags
+                )
+                label_id = self.canvas.create_text(
+                    text_x + 5, text_y + 2, text=f"#{i+1}", fill="black", anchor="nw",
+                    font=("Segoe UI", 10, "bold"), tags=tags
+                )
+                self.face_overlay_items.append((oval_id, label_bg_id, label_id))
         
     def on_blur_change(self, value):
         """Bulanıklaştırma değeri değiştiğinde"""
         self.blur_value_label.configure(text=f"{int(value)}")
+        self.schedule_live_preview()
     
     def on_margin_change(self, value):
         """Margin değeri değiştiğinde"""
         self.margin_value_label.configure(text=f"{int(value)}%")
         if self.face_locations:
+            self.schedule_live_preview()
             self.update_preview_with_selection()
             # Önerileri de margin genişliğine göre güncelle
             self._update_smart_suggestions()
 
+    def on_style_change(self):
+        """Bulanıklaştırma stili değiştiğinde"""
+        self.schedule_live_preview()
+
+    # --- CANLI ÖNİZLEME ---
+    def on_live_preview_toggle(self):
+        """Canlı önizleme anahtarı değiştiğinde"""
+        if self.live_preview_enabled.get():
+            self.schedule_live_preview()
+        else:
+            self._clear_live_preview()
+
+    def schedule_live_preview(self):
+        """Slider hareketlerini boşta çalışacak tek bir önizleme çizimine birleştir"""
+        if not self.live_preview_enabled.get() or self.original_image is None:
+            return
+        if not any(self.selected_faces):
+            self._clear_live_preview()
+            return
+        
+        self.live_preview_active = True
+        if self._live_preview_job is None:
+            self._live_preview_job = self.after_idle(self._flush_live_preview)
+
+    def _flush_live_preview(self):
+        """Birleştirilmiş canlı önizleme çizimini çalıştır"""
+        self._live_preview_job = None
+        self._render_live_preview()
+
+    def _clear_live_preview(self):
+        """Canlı önizlemeyi kapat (tam çözünürlük render uygulandığında vb.)"""
+        self.live_preview_active = False
+        if self._live_preview_job is not None:
+            self.after_cancel(self._live_preview_job)
+            self._live_preview_job = None
+        self.canvas.delete("live_preview")
+        self._live_preview_photo = None
+
+    def _render_live_preview(self):
+        """Seçili stili, görünür bölgenin ekran çözünürlüğündeki proxy'sine uygula"""
+        self.canvas.delete("live_preview")
+        if not self.live_preview_active or self.original_image is None:
+            return
+        
+        canvas_width = max(self.canvas.winfo_width(), 2)
+        canvas_height = max(self.canvas.winfo_height(), 2)
+        img_w, img_h = self.original_image.size
+        scale = self.display_scale
+        disp_w, disp_h = int(img_w * scale), int(img_h * scale)
+        
+        # Görünür bölge (ekran koordinatları, bulanıklık kenarları için küçük pay ile)
+        pad = 32
+        x0 = max(0, -self.display_offset_x - pad)
+        y0 = max(0, -self.display_offset_y - pad)
+        x1 = min(disp_w, canvas_width - self.display_offset_x + pad)
+        y1 = min(disp_h, canvas_height - self.display_offset_y + pad)
+        if x1 <= x0 or y1 <= y0:
+            return
+        
+        # Yakınlaştırılmışken proxy'yi "sığdır" çözünürlüğünde işleyip büyüt (maliyet sabit kalır)
+        fit_scale = scale / self.zoom_level
+        proxy_scale = min(scale, fit_scale)
+        k = proxy_scale / scale
+        px0, py0 = int(x0 * k), int(y0 * k)
+        px1, py1 = max(px0 + 1, int(math.ceil(x1 * k))), max(py0 + 1, int(math.ceil(y1 * k)))
+        proxy = self.tile_renderer.render_region(
+            proxy_scale, px0, py0, px1, py1, source=self.original_image
+        )
+        
+        # Seçili yüzlerin margin'li kutularını proxy koordinatlarına taşı
+        margin_percent = self.face_margin.get() / 100.0
+        blur_style = self.blur_style.get()
+        blur_strength = int(self.blur_strength.get())
+        for i, box in enumerate(self.face_locations):
+            if i >= len(self.selected_faces) or not self.selected_faces[i]:
+                continue
+            mx1, my1, mx2, my2 = self.redactor.margin_box(box, margin_percent, img_w, img_h, as_int=False)
+            bx1, by1 = int(mx1 * proxy_scale) - px0, int(my1 * proxy_scale) - py0
+            bx2, by2 = int(mx2 * proxy_scale) - px0, int(my2 * proxy_scale) - py0
+            if bx2 <= bx1 or by2 <= by1:
+                continue
+            if bx2 < 0 or by2 < 0 or bx1 > proxy.width or by1 > proxy.height:
+                continue  # Görünür alanın dışında
+            self.redactor.apply_style(proxy, bx1, by1, bx2, by2, blur_style, blur_strength, proxy_scale)
+        
+        if proxy_scale != scale:
+            proxy = proxy.resize((x1 - x0, y1 - y0), Image.BILINEAR)
+        
+        self._live_preview_photo = ImageTk.PhotoImage(proxy)
+        self.canvas.create_image(
+            self.display_offset_x + x0, self.display_offset_y + y0,
+            anchor="nw", image=self._live_preview_photo, tags=("live_preview", "viewport")
+        )
+        # Seçim halkaları önizlemenin üstünde kalsın
+        self.canvas.tag_raise("face_overlay")
+
     def change_appearance_mode(self, new_appearance_mode: str):
         """Açık/Koyu tema değişimi"""
         ctk.set_appearance_mode(new_appearance_mode)
@@ -1188,12 +4771,29 @@ class FaceBlurApp(ctk.CTk):
         ctk.set_window_scaling(new_scaling_float)
         self._save_app_settings()
 
+    def change_save_preset(self, label: str):
+        """Kaydetme hız/boyut ön ayarı (tekli kayıt ve toplu işlem)"""
+        for name, preset in SAVE_PRESETS.items():
+            if preset["label"] == label:
+                self.save_preset = name
+        self._save_app_settings()
+
+    def change_video_keyframe_interval(self, label: str):
+        """Videoda kaç karede bir tam algılama yapılacağı (aradakiler takip edilir)"""
+        self.video_keyframe_interval = VIDEO_KEYFRAME_OPTIONS.get(label, 10)
+        self._save_app_settings()
+
     def _save_app_settings(self):
         """Mevcut görünüm ayarlarını settings.json dosyasına kaydet"""
         current_settings = {
             "appearance_mode": self.appearance_mode.get(),
             "color_theme": self.color_theme.get(),
-            "ui_scaling": self.ui_scaling.get()
+            "ui_scaling": self.ui_scaling.get(),
+            "save_preset": self.save_preset,
+            "video_keyframe_interval": self.video_keyframe_interval,
+            "video_parallel": self.video_parallel.get(),
+            "batch_hash_reuse": self.batch_hash_reuse.get(),
+            "batch_hash_refine": self.batch_hash_refine.get()
         }
         save_settings(current_settings)
 
@@ -1224,57 +4824,318 @@ class FaceBlurApp(ctk.CTk):
         file_path = filedialog.askopenfilename(
             title="Fotoğraf Seç",
             filetypes=[
-                ("Görüntü Dosyaları", "*.png *.jpg *.jpeg *.bmp *.gif *.webp"),
+                ("Görüntü Dosyaları", "*.png *.jpg *.jpeg *.bmp *.gif *.webp *.avif"),
                 ("Tüm Dosyalar", "*.*")
             ]
         )
         if file_path:
             self.load_image_from_path(file_path)
     
+    def _decode_image(self, file_path):
+        """Dosyayı aç ve RGB'ye çevir (arka plan thread'lerinden de çağrılabilir)
+
+        Çok büyük görüntüler bellek dışı açılır ve genel bakışları döndürülür.
+        """
+        key = os.path.abspath(file_path)
+        with self._large_lock:
+            large = self.large_images.get(key)
+        if large is not None:
+            return large.overview
+        with Image.open(file_path) as probe:
+            width, height = probe.size
+        if width * height < OUT_OF_CORE_PIXELS:
+            return codec.decode(file_path)
+        
+        # Aynı dosya için tek raster: sonradan gelenler oluşturanı bekler
+        with self._large_lock:
+            large = self.large_images.get(key)
+            future = self._large_pending.get(key)
+            owner = large is None and future is None
+            if owner:
+                future = self._large_pending[key] = Future()
+        if large is not None:
+            return large.overview
+        if not owner:
+            return future.result().overview
+        try:
+            large = OutOfCoreImage(file_path)
+        except BaseException as e:
+            with self._large_lock:
+                del self._large_pending[key]
+            future.set_exception(e)
+            raise
+        with self._large_lock:
+            self.large_images[key] = large
+            del self._large_pending[key]
+        future.set_result(large)
+        return large.overview
+    
     def load_image_from_path(self, file_path):
-        """Belirtilen yoldan görüntü yükle"""
+        """Belirtilen yoldan görüntü yükle (zaten açıksa o belgeye geç)"""
+        if self.session.get(file_path) is not None:
+            self.switch_document(file_path)
+            return
+        
+        # Decode arka planda; daha yeni bir yükleme isteği bunu geçersiz kılar
+        self.status_label.configure(text="⏳ Yükleniyor...")
+        self.tasks.submit(
+            "load",
+            lambda token: self._decode_image(file_path),
+            on_done=lambda image: self._set_loaded_image(file_path, image),
+            on_error=lambda e: messagebox.showerror("Hata", f"Görüntü yüklenirken hata oluştu:\n{e}"),
+            key=file_path
+        )
+    
+    def _set_loaded_image(self, file_path, image, cv_image=None, faces=None):
+        """Decode edilmiş görüntüyü (ve varsa önceden algılanmış yüzleri) yeni belge olarak aç"""
+        if self.session.get(file_path) is not None:
+            self.switch_document(file_path)  # Açık belgenin yüzleri ve geçmişi korunur
+            return
+        self._store_document()
+        doc = self.session.open(file_path, image, faces, cv_image)
+        self._activate_document(doc)
+    
+    def _store_document(self):
+        """Çalışma durumunu etkin belgeye geri yaz"""
+        doc = self.document
+        if doc is None or doc.original_image is not self.original_image:
+            return
+        doc.face_locations = self.face_locations
+        doc.selected_faces = self.selected_faces
+        doc.processed_image = self.processed_image
+        doc.show_selection = self.selection_overlays_visible
+    
+    def switch_document(self, path):
+        """Açık bir belgeye geç (pikseller bellekteyse anında)"""
+        doc = self.session.get(path)
+        if doc is None or doc is self.document:
+            return
+        self.tasks.cancel("load")  # Kullanıcı başka bir belgeye geçti
+        self._store_document()
         try:
-            # PIL ile yükle
-            self.original_image = Image.open(file_path)
-            
-            # RGBA ise RGB'ye çevir
-            if self.original_image.mode == 'RGBA':
-                background = Image.new('RGB', self.original_image.size, (255, 255, 255))
-                background.paste(self.original_image, mask=self.original_image.split()[3])
-                self.original_image = background
-            elif self.original_image.mode != 'RGB':
-                self.original_image = self.original_image.convert('RGB')
-            
-            self.processed_image = self.original_image.copy()
-            
-            # NumPy array olarak sakla (MediaPipe için)
-            self.cv_image = np.array(self.original_image)
-            
-            # Yüz konumlarını ve geçmişi sıfırla
-            self.face_locations = []
-            self.selected_faces = []
-            self.undo_stack.clear()
-            self.redo_stack.clear()
-            self.update_face_checkboxes()
-
-            
-            # Çizim modunu kapat
-            if self.drawing_mode:
-                self.toggle_drawing_mode()
-            
-            # Görüntüyü göster
-            self.display_image(self.original_image)
-            
-            # Placeholder'ı gizle
-            self.canvas.delete(self.placeholder_text_id)
-            
-            # Durum güncelle
-            file_name = Path(file_path).name
-            self.status_label.configure(text=f"📷 {file_name}")
-            self.face_count_label.configure(text="")
-            
+            self.session.open(doc.path)
         except Exception as e:
             messagebox.showerror("Hata", f"Görüntü yüklenirken hata oluştu:\n{e}")
+            return
+        self._activate_document(doc)
+    
+    def switch_to_previous_document(self):
+        recent = self.session.recent()
+        if len(recent) > 1:
+            self.switch_document(recent[1].path)
+    
+    def close_document(self):
+        """Etkin belgeyi oturumdan kaldır ve bir öncekine geç"""
+        if self.document is None or len(self.session) < 2:
+            return
+        self._discard_document(self.document)
+        self.document = None
+        recent = self.session.recent()[0]
+        self.session.open(recent.path)
+        self._activate_document(recent)
+    
+    def on_close(self):
+        """Pencere kapanırken arka plan işlerini durdur ve geçici raster'ları sil"""
+        for kind in self.EXPORT_KINDS:
+            self.tasks.cancel(kind)  # Yarım kalan çıktıyı işin kendisi siler
+        if self.review is not None:
+            self.review.shutdown()
+        with self._large_lock:
+            larges = list(self.large_images.values())
+            self.large_images.clear()
+        for large in larges:
+            large.close()
+        self.destroy()
+    
+    EXPORT_KINDS = ("sequence", "video")  # Dosyaya yazan dışa aktarım işleri
+    
+    def _export_busy(self, kind, label):
+        """Aynı türden bir dışa aktarım sürüyorsa uyar ve True döndür.
+
+        Yürütücü aynı türden yeni işi eskisinin yerine koyar; sessizce iptal
+        edilen dışa aktarım yarım bir dosya bırakırdı.
+        """
+        if not self.tasks.is_busy(kind):
+            return False
+        messagebox.showwarning("Uyarı", f"Bir {label} işlemi zaten sürüyor.\nBitmesini bekleyin.")
+        return True
+    
+    @staticmethod
+    def _remove_partial_output(paths):
+        """İptal edilen veya hata veren dışa aktarımın yazdığı dosyaları sil"""
+        for path in paths:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+    
+    def _discard_document(self, doc):
+        """Belgeyi oturumdan ve (varsa) bellek dışı görüntüsüyle birlikte kaldır"""
+        self.session.close(doc.path)
+        with self._large_lock:
+            large = self.large_images.pop(doc.path, None)
+        if large is not None:
+            large.close()
+    
+    def on_document_menu(self, label):
+        path = self._document_menu_paths.get(label)
+        if path is not None:
+            self.switch_document(path)
+    
+    def _update_document_menu(self):
+        """Belge seçim menüsünü oturumla eşitle"""
+        self._document_menu_paths = {}
+        for doc in self.session.recent():
+            label = Path(doc.path).name
+            while label in self._document_menu_paths:
+                label += "'"
+            self._document_menu_paths[label] = doc.path
+        
+        if len(self._document_menu_paths) > 1:
+            labels = list(self._document_menu_paths)
+            self.document_menu.configure(values=labels)
+            self.document_menu.set(labels[0])
+            if not self.documents_frame.winfo_ismapped():
+                self.documents_frame.pack(after=self.batch_btn, padx=15, pady=5, fill="x")
+        else:
+            self.documents_frame.pack_forget()
+    
+    def _activate_document(self, doc):
+        """Belgenin durumunu çalışma alanına yükle ve göster"""
+        # Önceki görüntü için süren algılama/render sonuçları artık geçersiz
+        self.tasks.cancel("detect")
+        self.tasks.cancel("render")
+        self._render_callbacks = []
+        self.hide_progress()
+        self.document = doc
+        with self._large_lock:
+            self.large_image = self.large_images.get(doc.path)
+        self.original_image = doc.original_image
+        self.processed_image = doc.processed_image
+        
+        # NumPy array olarak sakla (MediaPipe için)
+        self.cv_image = doc.cv_image
+        
+        # Yüz konumları, seçimler ve geçmiş belgeye aittir
+        self.face_locations = doc.face_locations
+        self.selected_faces = doc.selected_faces
+        self.history = doc.history
+        self.redaction_cache.clear()
+        self.update_face_checkboxes()
+        self._clear_live_preview()
+        
+        # Çizim modunu kapat
+        if self.drawing_mode:
+            self.toggle_drawing_mode()
+        
+        # Görüntüyü belgeden çıkıldığı haliyle göster
+        self.selection_overlays_visible = doc.show_selection
+        self.refresh_display()
+        
+        # Placeholder'ı gizle
+        self.canvas.delete(self.placeholder_text_id)
+        
+        # Durum güncelle
+        file_name = Path(doc.path).name
+        self.status_label.configure(text=f"📷 {file_name}")
+        self._update_document_menu()
+        if self.face_locations:
+            self._update_smart_suggestions()
+            self.face_count_label.configure(text=f"🎭 {len(self.face_locations)} yüz bulundu")
+        else:
+            self.face_count_label.configure(text="")
+    
+    # --- KLASÖR İNCELEME MODU ---
+    def start_review(self):
+        """Bir klasördeki fotoğrafları tek tek incelemek için inceleme modunu başlat"""
+        folder = filedialog.askdirectory(title="İncelenecek Klasörü Seç")
+        if not folder:
+            return
+        
+        extensions = ('.png', '.jpg', '.jpeg', '.bmp', '.gif', '.webp')
+        file_paths = sorted(
+            os.path.join(folder, f) for f in os.listdir(folder)
+            if f.lower().endswith(extensions)
+        )
+        if not file_paths:
+            messagebox.showwarning("Uyarı", "Klasörde desteklenen fotoğraf bulunamadı!")
+            return
+        
+        if self.review is not None:
+            self.review.shutdown()
+        self.review = ReviewPrefetcher(
+            file_paths,
+            load=self._decode_image,
+            detect=lambda cv_image, method: self._detect_faces_sync(
+                cv_image, method=method, priority=PRIORITY_PREFETCH
+            )
+        )
+        self.review_nav_frame.pack(after=self.review_btn, padx=15, pady=5, fill="x")
+        self.show_review_image(0)
+    
+    def review_next(self):
+        if self.review is not None and self.review_index + 1 < len(self.review):
+            self.show_review_image(self.review_index + 1)
+    
+    def review_prev(self):
+        if self.review is not None and self.review_index > 0:
+            self.show_review_image(self.review_index - 1)
+    
+    def show_review_image(self, index):
+        """İnceleme listesindeki görüntüyü göster; hazır değilse hazır olunca göster"""
+        self.review_index = index
+        self.review_pos_label.configure(text=f"{index + 1} / {len(self.review)}")
+        
+        method = self.detection_method.get()
+        future = self.review.get(index, method)
+        self.review.prefetch(index, method)
+        
+        path = self.review.file_paths[index]
+        if future.done():
+            self.tasks.cancel("load")
+            try:
+                self._on_review_ready(path, future.result())
+            except Exception as e:
+                self._on_review_error(path, e)
+            return
+        
+        def wait(token):
+            # Ön yükleme bitene kadar bekle; daha yeni gezinme bunu iptal eder
+            while True:
+                token.check()
+                try:
+                    return future.result(timeout=0.05)
+                except FutureTimeoutError:
+                    pass
+        
+        self.status_label.configure(text="⏳ Yükleniyor...")
+        self.tasks.submit(
+            "load",
+            wait,
+            on_done=lambda result: self._on_review_ready(path, result),
+            on_error=lambda e: self._on_review_error(path, e)
+        )
+    
+    def _on_review_ready(self, path, result):
+        """Önceden yüklenen görüntüyü etkinleştir (Tk thread'i)
+
+        İnceleme sırasında açılan ve düzenlenmeden geçilen belgeler oturumdan
+        kaldırılır; aksi halde gezilen her fotoğraf kalıcı bir belge olurdu.
+        """
+        image, cv_image, faces = result
+        previous = self.document
+        is_new = self.session.get(path) is None
+        self._set_loaded_image(path, image, cv_image, faces)
+        doc = self.document
+        if is_new and doc is not None and doc.path == os.path.abspath(path):
+            doc.transient = True
+        if (previous is not None and previous is not doc and previous.transient
+                and not previous.history.can_undo() and not previous.history.can_redo()):
+            self._discard_document(previous)
+            self._update_document_menu()
+    
+    def _on_review_error(self, path, error):
+        messagebox.showerror("Hata", f"Görüntü yüklenirken hata oluştu:\n{Path(path).name}\n{error}")
     
     # --- ZOOM & PAN METHODS ---
     def on_mouse_wheel(self, event):
@@ -1289,17 +5150,17 @@ class FaceBlurApp(ctk.CTk):
             
     def zoom_in(self):
         self.zoom_level = min(self.zoom_level * 1.2, 10.0) # Maks 10x
-        self.refresh_display()
+        self.schedule_render()
         
     def zoom_out(self):
         self.zoom_level = max(self.zoom_level / 1.2, 0.1) # Min 0.1x
-        self.refresh_display()
+        self.schedule_render()
         
     def reset_zoom(self):
         self.zoom_level = 1.0
         self.pan_offset_x = 0
         self.pan_offset_y = 0
-        self.refresh_display()
+        self.schedule_render()
         
     def start_pan(self, event):
         """Kaydırmayı başlat"""
@@ -1309,7 +5170,7 @@ class FaceBlurApp(ctk.CTk):
         self.canvas.config(cursor="fleur")
         
     def do_pan(self, event):
-        """Kaydır"""
+        """Kaydır (mevcut canvas öğelerini taşı, yeniden çizimi erteleyerek birleştir)"""
         if self.is_panning:
             dx = event.x - self.pan_start_x
             dy = event.y - self.pan_start_y
@@ -1317,29 +5178,47 @@ class FaceBlurApp(ctk.CTk):
             self.pan_offset_y += dy
             self.pan_start_x = event.x
             self.pan_start_y = event.y
-            self.refresh_display()
+            
+            # Görüntüyü yeniden üretmeden anında kaydır
+            self.display_offset_x += dx
+            self.display_offset_y += dy
+            self.canvas.move("viewport", dx, dy)
+            
+            # Kenarlarda açılan döşemeler bir sonraki boşta çizilecek
+            self.schedule_render()
             
     def stop_pan(self, event):
         """Kaydırmayı bitir"""
         self.is_panning = False
         self.canvas.config(cursor="")
 
+    def schedule_render(self):
+        """Yeniden çizimi boşta çalışacak tek bir işe birleştir"""
+        if self._render_job is None:
+            self._render_job = self.after_idle(self._flush_render)
+
+    def _flush_render(self):
+        """Birleştirilmiş yeniden çizimi çalıştır"""
+        self._render_job = None
+        self.refresh_display()
+
     def refresh_display(self):
         """Mevcut durumu (orijinal veya işlenmiş) yeniden çiz"""
         current_img = self.processed_image if self.processed_image else self.original_image
         if current_img:
-            # Eğer algılama yapılmışsa ve işlenmiş görüntü yoksa seçim halkalarını göster
-            if not self.processed_image and self.face_locations:
-                self.update_preview_with_selection()
+            # Seçim halkaları gösteriliyorsa orijinal üzerinde göstermeye devam et
+            if self.selection_overlays_visible and self.face_locations:
+                self.display_image(self.original_image, show_selection=True)
             else:
                 self.display_image(current_img)
 
-    def display_image(self, pil_image):
+    def display_image(self, pil_image, show_selection=False):
         """Görüntüyü canvas'ta göster (Zoom ve Pan destekli)"""
         if pil_image is None:
             return
         
-        self.canvas.update()
+        self.selection_overlays_visible = show_selection
+        
         canvas_width = self.canvas.winfo_width()
         canvas_height = self.canvas.winfo_height()
         
@@ -1359,26 +5238,38 @@ class FaceBlurApp(ctk.CTk):
         self.display_offset_x = (canvas_width - new_width) // 2 + self.pan_offset_x
         self.display_offset_y = (canvas_height - new_height) // 2 + self.pan_offset_y
         
-        # Performans için sadece görünür alanı resize etsek iyi olurdu ama 
-        # şimdilik basit tutup tüm resmi resize ediyoruz (PIL Lanczos kalitelidir)
+        # Tüm resmi yeniden boyutlandırmak yerine sadece görünür döşemeleri çiz
         try:
             # Çok küçük veya çok büyük resize hatalarını engelle
             if new_width < 1 or new_height < 1: return
             
-            resized_image = pil_image.resize((new_width, new_height), Image.LANCZOS)
-            self.canvas_image = ImageTk.PhotoImage(resized_image)
-            
-            if self.canvas_image_id:
-                self.canvas.delete(self.canvas_image_id)
-            
-            self.canvas_image_id = self.canvas.create_image(
-                self.display_offset_x, self.display_offset_y,
-                anchor="nw",
-                image=self.canvas_image
-            )
+            self.tile_renderer.set_image(pil_image)
+            self._draw_visible_tiles(canvas_width, canvas_height)
+            self._sync_face_overlays()
+            self._render_live_preview()
         except Exception as e:
             print(f"Görüntüleme hatası: {e}")
 
+    def _draw_visible_tiles(self, canvas_width, canvas_height):
+        """Görünür alandaki döşemeleri canvas'a yerleştir"""
+        tiles = self.tile_renderer.visible_tiles(
+            self.display_scale, self.display_offset_x, self.display_offset_y,
+            canvas_width, canvas_height
+        )
+        
+        photos = []
+        self.canvas.delete("image_tile")
+        for tx, ty, cx, cy in tiles:
+            photo = self.tile_renderer.get_tile_photo(self.display_scale, tx, ty)
+            photos.append(photo)
+            self.canvas.create_image(cx, cy, anchor="nw", image=photo, tags=("image_tile", "viewport"))
+        
+        # Döşemeler her zaman seçim halkalarının altında kalsın
+        self.canvas.tag_lower("image_tile")
+        
+        # Önceki referansları ancak yeni döşemeler yerleştikten sonra bırak
+        self.canvas_tiles = photos
+
     
     def detect_faces(self):
         """Yüzleri algıla"""
@@ -1387,48 +5278,52 @@ class FaceBlurApp(ctk.CTk):
             return
         
         self.status_label.configure(text="🔍 Yüzler algılanıyor...")
-        self.update()
         
         # Çizim modunu kapat
         if self.drawing_mode:
             self.toggle_drawing_mode()
         
-        # Thread ile algılama yap
-        thread = threading.Thread(target=self._detect_faces_thread)
-        thread.start()
+        # Arka planda algıla (aynı görüntü için tekrar basışlar çalışan işe bağlanır)
+        cv_image = self.cv_image
+        method = self.detection_method.get()
+        print(f"Seçili yöntem: {method}")
+        large = self.large_image
+        if large is not None:
+            # Bellek dışı görüntü: genel bakış + tam çözünürlük döşemeleri
+            detect = lambda token: large.detect(
+                self.detection_engine, method, token,
+                detect_fn=lambda image, m, t: self._detect_faces_sync(image, method=m, token=t)
+            )
+        else:
+            detect = lambda token: self._detect_faces_sync(cv_image, method=method, token=token)
+        self.tasks.submit(
+            "detect",
+            detect,
+            on_done=lambda faces: self._on_faces_detected(cv_image, method, faces),
+            on_error=lambda e: messagebox.showerror("Hata", f"Yüz algılama hatası:\n{e}"),
+            key=(id(cv_image), method)
+        )
     
-    def _detect_faces_thread(self):
-        """Yüz algılama işlemi (arka plan thread'i)"""
-        try:
-            method = self.detection_method.get()
-            print(f"Seçili yöntem: {method}")
-            
-            # Senkron algılama metodunu kullan (tutarlılık için)
-            new_faces = self._detect_faces_sync(self.cv_image)
-            
-            if not new_faces and method != "hybrid" and not (self.face_detector or self.face_cascade):
-                self.after(0, lambda: messagebox.showerror(
-                    "Hata",
-                    "Yüz algılama modeli yüklenemedi."
-                ))
-                return
-
-            
-            # Mevcut durumu geri alma için kaydet (yüzler eklenmeden önce)
-            self.after(0, self._save_state)
-            
-            # Mevcut yüzlere ekle (çakışanları atla)
-            for new_face in new_faces:
-
-                if not self._is_duplicate_face(new_face):
-                    self.face_locations.append(new_face)
-                    self.selected_faces.append(True)
-            
-            # Sonuçları göster
-            self.after(0, lambda m=method: self._show_detection_results(m))
-            
-        except Exception as e:
-            self.after(0, lambda: messagebox.showerror("Hata", f"Yüz algılama hatası:\n{e}"))
+    def _on_faces_detected(self, cv_image, method, new_faces):
+        """Algılama sonucunu UI thread'inde uygula"""
+        if cv_image is not self.cv_image:
+            return  # Bu arada başka görüntü yüklendi
+        
+        if not new_faces and method != "hybrid" and not self.detection_engine.available:
+            messagebox.showerror("Hata", "Yüz algılama modeli yüklenemedi.")
+            return
+        
+        # Mevcut durumu geri alma için kaydet (yüzler eklenmeden önce)
+        self._save_state()
+        
+        # Mevcut yüzlere ekle (çakışanları atla)
+        for new_face in new_faces:
+            if not self._is_duplicate_face(new_face):
+                self.face_locations.append(new_face)
+                self.selected_faces.append(True)
+        
+        # Sonuçları göster
+        self._show_detection_results(method)
     
     def _is_duplicate_face(self, new_face, threshold=0.5):
         """Yeni yüzün mevcut yüzlerle çakışıp çakışmadığını kontrol et"""
@@ -1561,8 +5456,8 @@ class FaceBlurApp(ctk.CTk):
                 self.update_preview_with_selection()
 
     
-    def apply_blur(self):
-        """Bulanıklaştırma uygula"""
+    def apply_blur(self, on_done=None):
+        """Bulanıklaştırma uygula (tam çözünürlük render arka planda yapılır)"""
         if self.original_image is None:
             messagebox.showwarning("Uyarı", "Önce bir fotoğraf yükleyin!")
             return
@@ -1576,298 +5471,145 @@ class FaceBlurApp(ctk.CTk):
             messagebox.showwarning("Uyarı", "Bulanıklaştırmak için en az bir yüz seçin!")
             return
         
-        # Seçili stili al
+        # Ayarları UI thread'inde oku (Tk değişkenleri thread-safe değil)
         blur_style = self.blur_style.get()
+        blur_strength = int(self.blur_strength.get())
+        margin_percent = self.face_margin.get() / 100.0
+        face_boxes = [
+            box for i, box in enumerate(self.face_locations)
+            if i < len(self.selected_faces) and self.selected_faces[i]
+        ]
+        source_image = self.original_image
         
         self.status_label.configure(text="✨ İşleniyor...")
-        self.update()
         
         # İşlemden önce durumu kaydet
         self._save_state()
         
-        try:
-
-            # Orijinal görüntünün kopyasını al
-            result_image = self.original_image.copy()
-            blur_strength = int(self.blur_strength.get())
-            
-            margin_percent = self.face_margin.get() / 100.0
-            img_w, img_h = self.original_image.size
-            blurred_count = 0
-
-            
-            for i, (x1, y1, x2, y2) in enumerate(self.face_locations):
-                # Sadece seçili yüzleri işle
-                if i >= len(self.selected_faces) or not self.selected_faces[i]:
-                    continue
-                
-                # Margin hesapla
-                w = x2 - x1
-                h = y2 - y1
-                mx = w * margin_percent
-                my = h * margin_percent
-                
-                nx1 = int(max(0, x1 - mx))
-                ny1 = int(max(0, y1 - my))
-                nx2 = int(min(img_w, x2 + mx))
-                ny2 = int(min(img_h, y2 + my))
-                
-                blurred_count += 1
-                
-                # Seçili stile göre işlem yap
-                if blur_style == "gaussian":
-                    result_image = self._apply_gaussian_blur(result_image, nx1, ny1, nx2, ny2, blur_strength)
-                elif blur_style == "pixelate":
-                    result_image = self._apply_pixelate(result_image, nx1, ny1, nx2, ny2, blur_strength)
-                elif blur_style == "black":
-                    result_image = self._apply_black_box(result_image, nx1, ny1, nx2, ny2)
-                elif blur_style == "color":
-                    result_image = self._apply_color_fill(result_image, nx1, ny1, nx2, ny2)
-                elif blur_style == "emoji":
-                    result_image = self._apply_emoji(result_image, nx1, ny1, nx2, ny2)
-
-            
-            self.processed_image = result_image
-            self.display_image(self.processed_image)
-            
-            style_names = {
-                "gaussian": "Blur",
-                "pixelate": "Pikselleştirme",
-                "black": "Siyah Kutu",
-                "color": "Renk Dolgusu",
-                "emoji": "Emoji"
-            }
-            style_name = style_names.get(blur_style, "İşlem")
-            self.status_label.configure(text=f"✅ {blurred_count} yüz - {style_name}")
-            
-        except Exception as e:
-            messagebox.showerror("Hata", f"İşlem hatası:\n{e}")
-
-    # --- UNDO / REDO METHODS (MEMORY OPTIMIZED) ---
-    def _save_state(self):
-        """Mevcut durumu geri alma yığınına kaydet (Bellek Dostu - JPEG Sıkıştırma)"""
-        import io
-        
-        # Görüntüyü bellek içinde sıkıştırarak sakla (RAM tasarrufu)
-        buffer = None
-        if self.processed_image:
-            buffer = io.BytesIO()
-            self.processed_image.save(buffer, format="JPEG", quality=85)
-            img_data = buffer.getvalue()
-        else:
-            img_data = None
-
-        state = {
-            "face_locations": list(self.face_locations),
-            "selected_faces": list(self.selected_faces),
-            "processed_image_data": img_data
-        }
-        self.undo_stack.append(state)
-        self.redo_stack.clear()
-        
-        if len(self.undo_stack) > self.max_stack_size:
-            self.undo_stack.pop(0)
-
-    def undo(self, event=None):
-        """Son işlemi geri al"""
-        if not self.undo_stack:
-            self.status_label.configure(text="ℹ️ Geri alınacak işlem yok")
-            return
-            
-        current_state = self._get_current_state_serialized()
-        self.redo_stack.append(current_state)
-        
-        last_state = self.undo_stack.pop()
-        self._apply_state_serialized(last_state)
-        self.status_label.configure(text="↩️ İşlem geri alındı")
-
-    def redo(self, event=None):
-        """Geri alınan işlemi yinele"""
-        if not self.redo_stack:
-            self.status_label.configure(text="ℹ️ İleri alınacak işlem yok")
-            return
-            
-        current_state = self._get_current_state_serialized()
-        self.undo_stack.append(current_state)
-        
-        next_state = self.redo_stack.pop()
-        self._apply_state_serialized(next_state)
-        self.status_label.configure(text="↪️ İşlem yinelendi")
+        # Geçersiz kılınan render'ların bekleyen işleri (ör. kaydetme) son render'a devredilir
+        if on_done:
+            self._render_callbacks.append(on_done)
+        
+        def worker(token):
+            # Değişmeyen yüzlerin yamaları önbellekten yapıştırılır
+            result_image = source_image.copy()
+            blurred_count = self.redactor.redact(
+                result_image, face_boxes, blur_style, blur_strength, margin_percent,
+                source=source_image, cache=self.redaction_cache, token=token,
+                progress=self.report_progress
+            )
+            return result_image, blurred_count
+        
+        def on_error(e):
+            self.hide_progress()
+            # Bekleyen işler (ör. kaydetme) sonraki bir render'a kalmasın
+            pending, self._render_callbacks = self._render_callbacks, []
+            message = f"İşlem hatası:\n{e}"
+            if pending:
+                message += "\n\nBekleyen kaydetme yapılmadı."
+            messagebox.showerror("Hata", message)
+        
+        self.tasks.submit(
+            "render",
+            worker,
+            on_done=lambda result: self._on_blur_rendered(source_image, *result, blur_style),
+            on_error=on_error
+        )
 
-    def _get_current_state_serialized(self):
-        """Mevcut durumu sıkıştırılmış formatta al"""
-        import io
-        img_data = None
-        if self.processed_image:
-            buf = io.BytesIO()
-            self.processed_image.save(buf, format="JPEG", quality=85)
-            img_data = buf.getvalue()
-            
-        return {
-            "face_locations": list(self.face_locations),
-            "selected_faces": list(self.selected_faces),
-            "processed_image_data": img_data
+    def _on_blur_rendered(self, source_image, result_image, blurred_count, blur_style):
+        """Arka plan render sonucunu (hâlâ güncelse) UI thread'inde uygula"""
+        self.hide_progress()
+        if source_image is not self.original_image:
+            return  # Bu arada başka görüntü yüklendi
+        
+        self.processed_image = result_image
+        self._clear_live_preview()
+        self.display_image(self.processed_image)
+        
+        style_names = {
+            "gaussian": "Blur",
+            "pixelate": "Pikselleştirme",
+            "black": "Siyah Kutu",
+            "color": "Renk Dolgusu",
+            "emoji": "Emoji"
         }
-
-    def _apply_state_serialized(self, state):
-        """Sıkıştırılmış durumu çöz ve uygula"""
-        import io
-        self.face_locations = list(state["face_locations"])
-        self.selected_faces = list(state["selected_faces"])
+        style_name = style_names.get(blur_style, "İşlem")
+        self.status_label.configure(text=f"✅ {blurred_count} yüz - {style_name}")
         
-        if state["processed_image_data"]:
-            self.processed_image = Image.open(io.BytesIO(state["processed_image_data"]))
-        else:
-            self.processed_image = self.original_image.copy() if self.original_image else None
-            
-        # UI Güncelle
-        self.update_face_checkboxes()
-        if self.processed_image:
-            self.display_image(self.processed_image)
-            
-        if self.face_locations:
-            self.update_preview_with_selection()
-        self._update_smart_suggestions()
+        callbacks, self._render_callbacks = self._render_callbacks, []
+        for callback in callbacks:
+            callback()
 
-
-    
-    def _apply_gaussian_blur(self, image, x1, y1, x2, y2, strength):
-        """Gaussian blur uygula"""
-        face_width = x2 - x1
-        face_height = y2 - y1
-        
-        # Yüz bölgesini kırp
-        face_region = image.crop((x1, y1, x2, y2))
-        
-        # Gaussian blur uygula
-        blurred_face = face_region.filter(
-            ImageFilter.GaussianBlur(radius=strength)
-        )
-        
-        # Elips maskesi oluştur
-        mask = Image.new('L', (face_width, face_height), 0)
-        mask_draw = ImageDraw.Draw(mask)
-        mask_draw.ellipse([0, 0, face_width, face_height], fill=255)
-        
-        # Maskeyi yumuşat
-        mask = mask.filter(ImageFilter.GaussianBlur(radius=10))
-        
-        # Blurlanmış yüzü yapıştır
-        image.paste(blurred_face, (x1, y1), mask)
-        return image
-    
-    def _apply_pixelate(self, image, x1, y1, x2, y2, strength):
-        """Pikselleştirme efekti uygula"""
-        face_width = x2 - x1
-        face_height = y2 - y1
-        
-        # Yüz bölgesini kırp
-        face_region = image.crop((x1, y1, x2, y2))
-        
-        # Piksel boyutu (1-100 arası strength değerine göre)
-        pixel_size = max(4, min(50, int(face_width / (100 - strength + 10))))
-        
-        # Küçült ve tekrar büyüt (pikselleştirme efekti)
-        small_size = (max(1, face_width // pixel_size), max(1, face_height // pixel_size))
-        face_small = face_region.resize(small_size, Image.NEAREST)
-        pixelated_face = face_small.resize((face_width, face_height), Image.NEAREST)
-        
-        # Elips maskesi
-        mask = Image.new('L', (face_width, face_height), 0)
-        mask_draw = ImageDraw.Draw(mask)
-        mask_draw.ellipse([0, 0, face_width, face_height], fill=255)
-        mask = mask.filter(ImageFilter.GaussianBlur(radius=5))
-        
-        image.paste(pixelated_face, (x1, y1), mask)
-        return image
-    
-    def _apply_black_box(self, image, x1, y1, x2, y2):
-        """Siyah kutu uygula"""
-        draw = ImageDraw.Draw(image)
-        
-        face_width = x2 - x1
-        face_height = y2 - y1
-        
-        # Elips çiz
-        draw.ellipse([x1, y1, x2, y2], fill="black")
-        return image
-    
-    def _apply_color_fill(self, image, x1, y1, x2, y2):
-        """Renk dolgusu uygula"""
-        draw = ImageDraw.Draw(image)
-        
-        # Varsayılan renk: koyu gri
-        color = self.blur_color
-        
-        # Elips çiz
-        draw.ellipse([x1, y1, x2, y2], fill=color)
-        return image
-    
-    def _apply_emoji(self, image, x1, y1, x2, y2):
-        """Emoji uygula"""
-        draw = ImageDraw.Draw(image)
-        
-        face_width = x2 - x1
-        face_height = y2 - y1
-        
-        # Önce altın sarısı elips arka plan
-        draw.ellipse([x1, y1, x2, y2], fill="#FFD700")  # Altın sarısı arka plan
-        
-        # Emoji metni
-        emoji = "😊"
-        font_size = int(min(face_width, face_height) * 0.65)  # Biraz daha küçük
-        
-        try:
-            from PIL import ImageFont
-            # Segoe UI Emoji fontunu kullanmayı dene
-            font = ImageFont.truetype("seguiemj.ttf", font_size)
-        except:
-            # Font bulunamazsa varsayılan
-            try:
-                font = ImageFont.truetype("arial.ttf", font_size)
-            except:
-                font = None
-        
-        # Emoji'yi merkeze yerleştir
-        if font:
-            # Text boyutunu al (bbox kullanarak)
-            bbox = draw.textbbox((0, 0), emoji, font=font)
-            text_width = bbox[2] - bbox[0]
-            text_height = bbox[3] - bbox[1]
+    def report_progress(self, done, total, detail=None):
+        """Arka plan işinin ilerlemesini bildir (herhangi bir thread'den, kareler birleştirilir)"""
+        self._progress_value = done / total if total else 1.0
+        self._progress_detail = detail
+        if self._progress_job is None:
+            try:
+                self._progress_job = self.after(0, self._flush_progress)
+            except RuntimeError:
+                pass
+    
+    def _flush_progress(self):
+        self._progress_job = None
+        if not self.progress_bar.winfo_ismapped():
+            self.progress_bar.pack(fill="x", padx=10, pady=(0, 10))
+        self.progress_bar.set(self._progress_value)
+        text = f"✨ İşleniyor... %{int(self._progress_value * 100)}"
+        if self._progress_detail:
+            text += f"\n{self._progress_detail}"
+        self.status_label.configure(text=text)
+    
+    def hide_progress(self):
+        if self._progress_job is not None:
+            self.after_cancel(self._progress_job)
+            self._progress_job = None
+        self.progress_bar.pack_forget()
+    
+    # --- UNDO / REDO METHODS (DELTA TABANLI, BELLEK BÜTÇELİ) ---
+    def _save_state(self):
+        """Mevcut durumu geri alma geçmişine kaydet (kopyasız; sıkıştırma arka planda)"""
+        self.history.push(self.face_locations, self.selected_faces, self.processed_image)
+
+    def undo(self, event=None):
+        """Son işlemi geri al"""
+        if not self.history.can_undo():
+            self.status_label.configure(text="ℹ️ Geri alınacak işlem yok")
+            return
             
-            # Merkeze yerleştir
-            text_x = x1 + (face_width - text_width) // 2
-            text_y = y1 + (face_height - text_height) // 2
+        state = self.history.undo(self.face_locations, self.selected_faces, self.processed_image)
+        self._apply_history_state(state)
+        self.status_label.configure(text="↩️ İşlem geri alındı")
+
+    def redo(self, event=None):
+        """Geri alınan işlemi yinele"""
+        if not self.history.can_redo():
+            self.status_label.configure(text="ℹ️ İleri alınacak işlem yok")
+            return
             
-            draw.text((text_x, text_y), emoji, fill="black", font=font)
+        state = self.history.redo(self.face_locations, self.selected_faces, self.processed_image)
+        self._apply_history_state(state)
+        self.status_label.configure(text="↪️ İşlem yinelendi")
+
+    def _apply_history_state(self, state):
+        """Geçmişten geri yüklenen durumu uygula"""
+        face_locations, selected_faces, image = state
+        self.face_locations = list(face_locations)
+        self.selected_faces = list(selected_faces)
+        
+        if image is not None:
+            self.processed_image = image
         else:
-            # Font yoksa basit smiley daire
-            center_x = (x1 + x2) // 2
-            center_y = (y1 + y2) // 2
-            radius = min(face_width, face_height) // 3
-            
-            # Gülümseyen yüz çiz
-            draw.ellipse([center_x - radius, center_y - radius, 
-                         center_x + radius, center_y + radius], fill="yellow", outline="black", width=2)
-            
-            # Gözler
-            eye_radius = radius // 6
-            left_eye_x = center_x - radius // 2
-            right_eye_x = center_x + radius // 2
-            eye_y = center_y - radius // 3
+            self.processed_image = self.original_image.copy() if self.original_image else None
             
-            draw.ellipse([left_eye_x - eye_radius, eye_y - eye_radius,
-                         left_eye_x + eye_radius, eye_y + eye_radius], fill="black")
-            draw.ellipse([right_eye_x - eye_radius, eye_y - eye_radius,
-                         right_eye_x + eye_radius, eye_y + eye_radius], fill="black")
+        # UI Güncelle
+        self.update_face_checkboxes()
+        if self.processed_image:
+            self.display_image(self.processed_image)
             
-            # Gülümseme (yay)
-            smile_y = center_y + radius // 4
-            draw.arc([center_x - radius//2, smile_y - radius//3,
-                     center_x + radius//2, smile_y + radius//3], 
-                    start=0, end=180, fill="black", width=2)
-        
-        return image
+        if self.face_locations:
+            self.update_preview_with_selection()
+        self._update_smart_suggestions()
 
     
     def save_image(self):
@@ -1882,27 +5624,478 @@ class FaceBlurApp(ctk.CTk):
             filetypes=[
                 ("PNG", "*.png"),
                 ("JPEG", "*.jpg"),
+                ("WebP", "*.webp"),
+                ("AVIF", "*.avif"),
                 ("BMP", "*.bmp"),
                 ("Tüm Dosyalar", "*.*")
             ]
         )
         
         if file_path:
+            if self.live_preview_active and any(self.selected_faces):
+                # Canlı önizlemedeki ayarlar henüz tam çözünürlükte uygulanmadı
+                self.apply_blur(on_done=lambda: self._write_image(file_path))
+            else:
+                self._write_image(file_path)
+
+    def _write_image(self, file_path):
+        """İşlenmiş görüntüyü arka planda diske yaz"""
+        image = self.processed_image
+        preset = self.save_preset
+        
+        if self.large_image is not None:
+            worker = self._large_save_worker(file_path, preset)
+            image = self.large_image
+        else:
+            def worker(token):
+                codec.save(image, file_path, preset)
+        
+        def on_saved(_):
+            self.status_label.configure(text=f"💾 Kaydedildi")
+            messagebox.showinfo("Başarılı", f"Görüntü başarıyla kaydedildi:\n{file_path}")
+        
+        self.status_label.configure(text="💾 Kaydediliyor...")
+        self.tasks.submit(
+            "save",
+            worker,
+            on_done=on_saved,
+            on_error=lambda e: messagebox.showerror("Hata", f"Kaydetme hatası:\n{e}"),
+            key=(id(image), file_path)
+        )
+    
+    def _large_save_worker(self, file_path, preset):
+        """Bellek dışı görüntü için kaydetme işi (seçili yüzler, mevcut ayarlarla)"""
+        large = self.large_image
+        blur_style = self.blur_style.get()
+        blur_strength = int(self.blur_strength.get())
+        margin_percent = self.face_margin.get() / 100.0
+        regions = []
+        for i, box in enumerate(self.face_locations):
+            if i < len(self.selected_faces) and self.selected_faces[i]:
+                full_box = large.to_full(box)
+                regions.append(self.redactor.margin_box(full_box, margin_percent, large.width, large.height))
+        
+        def render_patch(region):
+            return self.redactor.face_patch(region, 0, 0, region.width, region.height, blur_style, blur_strength)
+        
+        return lambda token: large.save(file_path, regions, render_patch, preset, token)
+    
+    def process_sequence(self):
+        """Animasyonlu GIF/WebP veya fotoğraf serisini kare kare işle"""
+        if self._export_busy("sequence", "seri"):
+            return
+        file_paths = filedialog.askopenfilenames(
+            title="Animasyon veya Fotoğraf Serisi Seç",
+            filetypes=[
+                ("Animasyon / Görüntü", "*.gif *.webp *.png *.jpg *.jpeg"),
+                ("Tüm Dosyalar", "*.*")
+            ]
+        )
+        if not file_paths:
+            return
+        
+        if len(file_paths) == 1:
+            source = file_paths[0]
+            if not SequenceProcessor.is_animated(source):
+                messagebox.showwarning("Uyarı", "Seçilen dosya animasyon değil.\nSeri için birden fazla fotoğraf seçin.")
+                return
+            ext = Path(source).suffix.lower()
+            output = filedialog.asksaveasfilename(
+                title="Animasyonu Kaydet",
+                initialfile=f"processed_{Path(source).name}",
+                defaultextension=ext,
+                filetypes=[("GIF", "*.gif"), ("WebP", "*.webp")]
+            )
+        else:
+            source = sorted(file_paths)
+            output = filedialog.askdirectory(title="Çıktı Klasörünü Seç")
+        if not output:
+            return
+        
+        # Ayarları UI thread'inde oku
+        method = self.detection_method.get()
+        blur_style = self.blur_style.get()
+        blur_strength = int(self.blur_strength.get())
+        margin_percent = self.face_margin.get() / 100.0
+        preset = self.save_preset
+        
+        def worker(token):
+            processor = SequenceProcessor(
+                detect=lambda cv_image: self._detect_faces_sync(
+                    cv_image, method=method, token=token, priority=PRIORITY_PREFETCH
+                ),
+                redact=lambda image, faces: self.redactor.redact(
+                    image, faces, blur_style, blur_strength, margin_percent
+                ),
+                token=token,
+                progress=self.report_progress
+            )
             try:
-                if file_path.lower().endswith(('.jpg', '.jpeg')):
-                    if self.processed_image.mode == 'RGBA':
-                        rgb_image = self.processed_image.convert('RGB')
-                        rgb_image.save(file_path, quality=95)
-                    else:
-                        self.processed_image.save(file_path, quality=95)
-                else:
-                    self.processed_image.save(file_path)
+                if isinstance(source, str):
+                    return processor.process_animation(source, output, preset)
+                return processor.process_sequence(source, output, preset)
+            except BaseException:
+                self._remove_partial_output(processor.written)
+                raise
+        
+        def on_done(stats):
+            self.hide_progress()
+            detected = stats["full"] + stats["regions"]
+            self.status_label.configure(text=f"✅ {stats['frames']} kare işlendi")
+            messagebox.showinfo(
+                "Seri İşlem Tamamlandı",
+                f"🎞️ Kare: {stats['frames']}\n"
+                f"🔍 Tam algılama: {stats['full']}\n"
+                f"🎯 Sadece hareketli bölge: {stats['regions']}\n"
+                f"♻️ Algılama tekrar kullanıldı: {stats['reused']}\n\n"
+                f"Algılama yapılan kare oranı: %{100 * detected / max(1, stats['frames']):.0f}\n\n"
+                f"📁 Çıktı:\n{output}"
+            )
+        
+        def on_error(e):
+            self.hide_progress()
+            messagebox.showerror("Hata", f"Seri işlem hatası:\n{e}")
+        
+        self.status_label.configure(text="🎞️ Kareler işleniyor...")
+        self.tasks.submit("sequence", worker, on_done=on_done, on_error=on_error)
+    
+    def process_video(self, input_path=None):
+        """Video dosyasındaki yüzleri akışlı olarak gizle"""
+        if self._export_busy("video", "video"):
+            return
+        if input_path is None:
+            input_path = filedialog.askopenfilename(
+                title="Video Seç",
+                filetypes=[
+                    ("Video Dosyaları", "*.mp4 *.avi *.mov *.mkv *.m4v"),
+                    ("Tüm Dosyalar", "*.*")
+                ]
+            )
+        if not input_path:
+            return
+        output_path = filedialog.asksaveasfilename(
+            title="Videoyu Kaydet",
+            initialfile=f"processed_{Path(input_path).stem}.mp4",
+            defaultextension=".mp4",
+            filetypes=[("MP4", "*.mp4"), ("AVI", "*.avi")]
+        )
+        if not output_path:
+            return
+        
+        # Ayarları UI thread'inde oku
+        method = self.detection_method.get()
+        blur_style = self.blur_style.get()
+        blur_strength = int(self.blur_strength.get())
+        margin_percent = self.face_margin.get() / 100.0
+        fourcc = "XVID" if output_path.lower().endswith(".avi") else "mp4v"
+        keyframe_interval = self.video_keyframe_interval
+        model_path, frontal_path, profile_path = self.detector_paths
+        job = {
+            "method": method, "blur_style": blur_style, "blur_strength": blur_strength,
+            "margin_percent": margin_percent, "blur_color": self.redactor.blur_color,
+            "keyframe_interval": keyframe_interval, "model_path": model_path,
+            "frontal_path": frontal_path, "profile_path": profile_path,
+        }
+        parallel = self.video_parallel.get() and (os.cpu_count() or 1) > 1
+        
+        def progress(done, total, fps):
+            self.report_progress(done, total, f"🎬 {done}/{total} kare • {fps:.1f} kare/sn")
+        
+        def export(token):
+            if parallel:
+                # Uzun videolar: segmentler ayrı süreçlerde, her biri kendi algılayıcısıyla
+                segmented = SegmentedVideoProcessor(
+                    input_path, output_path, job, token=token, progress=progress, fourcc=fourcc
+                )
+                fps, total, _, _ = segmented.probe(input_path)
+                if len(segmented.plan(total, fps)) > 1:
+                    return segmented.run()
+            
+            process_frame, tracker = video_frame_processor(
+                lambda rgb: self._detect_faces_sync(rgb, method=method, token=token, priority=PRIORITY_PREFETCH),
+                lambda image, faces: self.redactor.redact(image, faces, blur_style, blur_strength, margin_percent),
+                keyframe_interval
+            )
+            pipeline = VideoPipeline(
+                input_path, output_path, process_frame, token=token, fourcc=fourcc, progress=progress
+            )
+            stats = pipeline.run()
+            stats["detections"] = tracker.stats["detections"] if tracker is not None else stats["frames"]
+            return stats
+        
+        def worker(token):
+            try:
+                return export(token)
+            except BaseException:
+                self._remove_partial_output([output_path])
+                raise
+        
+        def on_done(stats):
+            self.hide_progress()
+            self.status_label.configure(text=f"✅ {stats['frames']} kare • {stats['fps']:.1f} kare/sn")
+            segments = stats.get("segments", 1)
+            audio_note = "Ses kanalı kaynaktan kopyalandı." if stats.get("stitch") == "ffmpeg+ses" \
+                else "Not: Ses kanalı kopyalanmaz."
+            messagebox.showinfo(
+                "Video Tamamlandı",
+                f"🎬 Kare: {stats['frames']}\n"
+                f"🔍 Algılama yapılan kare: {stats['detections']}\n"
+                + (f"⚙️ Paralel segment: {segments}\n" if segments > 1 else "")
+                + f"⏱️ Süre: {stats['seconds']:.1f} sn ({stats['fps']:.1f} kare/sn)\n\n"
+                f"{audio_note}\n\n📁 Çıktı:\n{output_path}"
+            )
+        
+        def on_error(e):
+            self.hide_progress()
+            messagebox.showerror("Hata", f"Video işleme hatası:\n{e}")
+        
+        self.status_label.configure(text="🎬 Video işleniyor...")
+        self.tasks.submit("video", worker, on_done=on_done, on_error=on_error)
+    
+    def open_video_preview(self):
+        """Videoyu zaman çizelgesi ile incele (kareler önbellekli, yüzler gizli)"""
+        input_path = filedialog.askopenfilename(
+            title="İncelenecek Video",
+            filetypes=[
+                ("Video Dosyaları", "*.mp4 *.avi *.mov *.mkv *.m4v"),
+                ("Tüm Dosyalar", "*.*")
+            ]
+        )
+        if not input_path:
+            return
+        
+        def redact(image, faces, settings):
+            blur_style, blur_strength, margin_percent, _ = settings
+            self.redactor.redact(image, faces, blur_style, blur_strength, margin_percent)
+        
+        def detect(rgb, method, token):
+            return self._detect_faces_sync(rgb, method=method, token=token)
+        
+        def on_error(e):
+            messagebox.showerror("Hata", f"Video açılamadı:\n{e}")
+        
+        # Anahtar kare taraması uzun videolarda sürebilir: arka planda
+        self.status_label.configure(text="🎞️ Video indeksleniyor...")
+        self.tasks.submit(
+            f"video_open:{input_path}", lambda token: VideoPreview(input_path, detect, redact),
+            on_done=self._show_video_preview, on_error=on_error
+        )
+    
+    def _show_video_preview(self, preview):
+        """VideoPreview için inceleme penceresi"""
+        self.status_label.configure(
+            text=f"🎞️ {Path(preview.path).name}: {preview.total} kare, {len(preview.anchors)} anahtar kare"
+        )
+        window = ctk.CTkToplevel(self)
+        window.title(f"Video İnceleme - {Path(preview.path).name}")
+        window.geometry(f"{max(640, preview.size[0] + 40)}x{preview.size[1] + 190}")
+        window.transient(self)
+        
+        display = Label(window, bg="black")
+        display.pack(fill="both", expand=True, padx=10, pady=10)
+        
+        info_label = ctk.CTkLabel(window, text="", font=ctk.CTkFont(size=12), text_color="gray")
+        info_label.pack()
+        
+        controls = ctk.CTkFrame(window, fg_color="transparent")
+        controls.pack(fill="x", padx=10, pady=10)
+        
+        state = {"index": 0, "photo": None}
+        scrub_kind = f"scrub:{id(preview)}"  # Pencere başına: iki inceleme penceresi birbirini iptal etmesin
+        
+        def settings():
+            return (self.blur_style.get(), int(self.blur_strength.get()),
+                    self.face_margin.get() / 100.0, self.redactor.blur_color)
+        
+        def show(index, image):
+            if index != state["index"] or not window.winfo_exists():
+                return  # Bu arada başka kareye geçildi
+            state["photo"] = ImageTk.PhotoImage(image)
+            display.configure(image=state["photo"])
+            seconds = index / preview.fps
+            info_label.configure(
+                text=f"Kare {index + 1}/{preview.total} • {int(seconds // 60):02d}:{seconds % 60:05.2f} • "
+                     f"çözülen {preview.stats['decoded']} • algılanan {preview.stats['detected']} • "
+                     f"önbellek isabeti {preview.stats['hits']} • {preview.nbytes / (1024 * 1024):.0f} MB"
+            )
+        
+        def seek(value):
+            index = int(round(float(value)))
+            state["index"] = index
+            method, style = self.detection_method.get(), settings()
+            image = preview.cached(index, method, style)
+            if image is not None:
+                show(index, image)
+                return
+            # Sürüklerken sadece son istenen kare işlenir (eskiler iptal edilir)
+            self.tasks.submit(
+                scrub_kind, lambda token: preview.frame(index, method, style, token),
+                on_done=lambda image: show(index, image),
+                on_error=lambda e: info_label.configure(text=f"⚠️ {e}"),
+                key=(index, method, style)
+            )
+        
+        def step(delta):
+            index = max(0, min(preview.total - 1, state["index"] + delta))
+            slider.set(index)
+            seek(index)
+        
+        ctk.CTkButton(controls, text="◀", width=40, command=lambda: step(-1)).pack(side="left", padx=5)
+        slider = ctk.CTkSlider(
+            controls, from_=0, to=max(1, preview.total - 1),
+            number_of_steps=max(1, preview.total - 1), command=seek
+        )
+        slider.set(0)
+        slider.pack(side="left", fill="x", expand=True, padx=5)
+        ctk.CTkButton(controls, text="▶", width=40, command=lambda: step(1)).pack(side="left", padx=5)
+        ctk.CTkButton(
+            controls, text="💾 İşle ve Kaydet", width=130,
+            command=lambda: self.process_video(preview.path)
+        ).pack(side="left", padx=5)
+        
+        window.bind("<Left>", lambda e: step(-1))
+        window.bind("<Right>", lambda e: step(1))
+        
+        def on_close():
+            self.tasks.cancel(scrub_kind)
+            preview.close()
+            window.destroy()
+        
+        window.protocol("WM_DELETE_WINDOW", on_close)
+        seek(0)
+    
+    # Canlı modda hedef ekran yenileme hızı
+    LIVE_TARGET_FPS = 30
+
+    def open_live_mode(self):
+        """Kamera (veya akış yerine geçen video dosyası) için canlı anonimleştirme penceresi"""
+        live_window = getattr(self, "live_window", None)
+        if live_window is not None and live_window.winfo_exists():
+            live_window.lift()
+            return
+        
+        self.live_window = live_window = ctk.CTkToplevel(self)
+        live_window.title("Canlı Anonimleştirme")
+        live_window.geometry("900x640")
+        live_window.transient(self)
+        
+        controls = ctk.CTkFrame(live_window)
+        controls.pack(fill="x", padx=10, pady=10)
+        
+        ctk.CTkLabel(controls, text="Kaynak:", font=ctk.CTkFont(size=12)).pack(side="left", padx=(10, 5))
+        source_entry = ctk.CTkEntry(controls, width=260, placeholder_text="Kamera no (0) veya video yolu")
+        source_entry.insert(0, "0")
+        source_entry.pack(side="left", padx=5)
+        
+        def choose_file():
+            path = filedialog.askopenfilename(
+                parent=live_window,
+                title="Akış Yerine Video Seç",
+                filetypes=[("Video Dosyaları", "*.mp4 *.avi *.mov *.mkv *.m4v"), ("Tüm Dosyalar", "*.*")]
+            )
+            if path:
+                source_entry.delete(0, "end")
+                source_entry.insert(0, path)
+        
+        ctk.CTkButton(controls, text="📂", width=40, command=choose_file).pack(side="left", padx=5)
+        start_btn = ctk.CTkButton(controls, text="▶ Başlat", width=100)
+        start_btn.pack(side="left", padx=5)
+        
+        stats_label = ctk.CTkLabel(live_window, text="⏸️ Durduruldu", font=ctk.CTkFont(size=12), text_color="gray")
+        stats_label.pack(pady=(0, 5))
+        
+        # CTkImage yerine düz Tk etiketi: her karede yeniden ölçeklenmeden PhotoImage basılır
+        display = Label(live_window, bg="black")
+        display.pack(fill="both", expand=True, padx=10, pady=(0, 10))
+        
+        state = {"live": None, "job": None, "sequence": None, "photo": None,
+                 "fps": 0.0, "latency": 0.0, "last_shown": None}
+        frame_interval = 1.0 / self.LIVE_TARGET_FPS
+        # Tk thread'inde çizildiği için havuzsuz (sırayla) çalışan ayrı bir redaktör
+        redactor = FaceRedactor(self.redactor.blur_color)
+        
+        def render():
+            state["job"] = None
+            live = state["live"]
+            if live is None:
+                return
+            started = time.monotonic()
+            frame = live.latest(after=state["sequence"])
+            if frame is None and live.ended:
+                stop()
+                stats_label.configure(text="⏹️ Akış sona erdi (kaynak okunamıyor)")
+                return
+            if frame is not None:
+                rgb, captured_at, sequence, faces = frame
+                state["sequence"] = sequence
                 
-                self.status_label.configure(text=f"💾 Kaydedildi")
-                messagebox.showinfo("Başarılı", f"Görüntü başarıyla kaydedildi:\n{file_path}")
+                # Pencereye sığdır (LANCZOS yerine hızlı doğrusal ölçekleme)
+                box_w, box_h = max(1, display.winfo_width()), max(1, display.winfo_height())
+                h, w = rgb.shape[:2]
+                scale = min(box_w / w, box_h / h)
+                if abs(scale - 1.0) > 0.01:
+                    rgb = cv2.resize(rgb, (max(1, int(w * scale)), max(1, int(h * scale))), interpolation=cv2.INTER_LINEAR)
+                image = Image.fromarray(rgb)
+                if faces:
+                    boxes = [(int(x1 * image.width), int(y1 * image.height),
+                              int(x2 * image.width), int(y2 * image.height)) for x1, y1, x2, y2 in faces]
+                    redactor.redact(
+                        image, boxes, self.blur_style.get(), int(self.blur_strength.get()),
+                        self.face_margin.get() / 100.0, scale=min(1.0, scale)
+                    )
+                state["photo"] = ImageTk.PhotoImage(image)
+                display.configure(image=state["photo"])
                 
+                now = time.monotonic()
+                latency = (now - captured_at) * 1000
+                state["latency"] += (latency - state["latency"]) * 0.2
+                if state["last_shown"] is not None:
+                    fps = 1.0 / max(1e-6, now - state["last_shown"])
+                    state["fps"] += (fps - state["fps"]) * 0.1
+                state["last_shown"] = now
+                stats_label.configure(
+                    text=f"🔴 {state['fps']:.0f} kare/sn • uçtan uca gecikme {state['latency']:.0f} ms • "
+                         f"algılama {live.stats['detect_ms']:.0f} ms • atlanan kare {live.stats['dropped']} • "
+                         f"yüz {len(faces)}"
+                )
+            
+            # Hedef hıza göre bir sonraki kareyi planla (çizim süresi düşülür)
+            delay = max(1, int((frame_interval - (time.monotonic() - started)) * 1000))
+            state["job"] = live_window.after(delay, render)
+        
+        def stop():
+            if state["job"] is not None:
+                live_window.after_cancel(state["job"])
+                state["job"] = None
+            if state["live"] is not None:
+                state["live"].stop()
+                state["live"] = None
+            start_btn.configure(text="▶ Başlat", command=start)
+            stats_label.configure(text="⏸️ Durduruldu")
+        
+        def start():
+            value = source_entry.get().strip()
+            source = int(value) if value.isdigit() else value
+            model_path, _, _ = self.detector_paths
+            live = LiveAnonymizer(
+                source, model_path,
+                fallback_detect=lambda rgb: self.detection_engine.detect(rgb, "opencv_haar")
+            )
+            try:
+                live.start()
             except Exception as e:
-                messagebox.showerror("Hata", f"Kaydetme hatası:\n{e}")
+                messagebox.showerror("Hata", f"Canlı mod başlatılamadı:\n{e}", parent=live_window)
+                return
+            state.update(live=live, sequence=None, fps=0.0, latency=0.0, last_shown=None)
+            start_btn.configure(text="⏹ Durdur", command=stop)
+            render()
+        
+        def on_close():
+            stop()
+            live_window.destroy()
+        
+        start_btn.configure(command=start)
+        live_window.protocol("WM_DELETE_WINDOW", on_close)
     
     def reset_image(self):
         """Görüntüyü sıfırla"""
@@ -1913,6 +6106,7 @@ class FaceBlurApp(ctk.CTk):
             self.selected_faces = []
 
             self.update_face_checkboxes()
+            self._clear_live_preview()
             self.display_image(self.original_image)
             
             if self.drawing_mode:
@@ -1923,6 +6117,12 @@ class FaceBlurApp(ctk.CTk):
     
     def batch_process(self):
         """Toplu işlem - birden fazla fotoğraf işle"""
+        # Toplu işlem pencere kilitlemediği için aynı anda ikinci bir işlem başlatılmasın
+        batch_window = getattr(self, "batch_window", None)
+        if batch_window is not None and batch_window.winfo_exists():
+            batch_window.lift()
+            return
+        
         # Dosya seçimi
         file_paths = filedialog.askopenfilenames(
             title="Toplu İşlem İçin Fotoğraflar Seç",
@@ -1956,8 +6156,10 @@ class FaceBlurApp(ctk.CTk):
         file_count = len(file_paths)
         
         try:
-            # Görüntüyü yükle
+            # Görüntüyü yükle (JPEG'lerde algılama çözünürlüğünde hızlı/küçültülmüş decode)
             preview_image = Image.open(first_file)
+            full_size = preview_image.size
+            preview_image.draft('RGB', (1024, 1024))
             if preview_image.mode == 'RGBA':
                 background = Image.new('RGB', preview_image.size, (255, 255, 255))
                 background.paste(preview_image, mask=preview_image.split()[3])
@@ -1967,8 +6169,9 @@ class FaceBlurApp(ctk.CTk):
             
             cv_image = np.array(preview_image)
             
-            # Yüz algıla
+            # Yüz algıla (kutular decode edilen görüntünün koordinatlarında)
             face_locations = self._detect_faces_sync(cv_image)
+            decode_scale = preview_image.width / full_size[0]
             
             if not face_locations:
                 messagebox.showwarning(
@@ -2008,16 +6211,15 @@ class FaceBlurApp(ctk.CTk):
             left_frame = ctk.CTkFrame(content_frame)
             left_frame.pack(side="left", fill="both", expand=True, padx=(0, 10))
             
-            preview_label = ctk.CTkLabel(
-                left_frame,
-                text="Önizleme",
-                font=ctk.CTkFont(size=14, weight="bold")
-            )
-            preview_label.pack(pady=10)
+            # Sekmeler: ilk dosyanın önizlemesi ve tüm dosyaların küçük resimleri
+            preview_tabs = ctk.CTkTabview(left_frame)
+            preview_tabs.pack(fill="both", expand=True, padx=5, pady=5)
+            preview_tab = preview_tabs.add("Önizleme")
+            files_tab = preview_tabs.add(f"Dosyalar ({file_count})")
             
             # Canvas için frame
-            canvas_frame = ctk.CTkFrame(left_frame, fg_color="gray15")
-            canvas_frame.pack(fill="both", expand=True, padx=10, pady=10)
+            canvas_frame = ctk.CTkFrame(preview_tab, fg_color="gray15")
+            canvas_frame.pack(fill="both", expand=True, padx=5, pady=5)
             
             preview_canvas = Canvas(
                 canvas_frame,
@@ -2026,6 +6228,12 @@ class FaceBlurApp(ctk.CTk):
             )
             preview_canvas.pack(fill="both", expand=True, padx=5, pady=5)
             
+            # Küçük resim ızgarası (arka planda üretilir, diskte önbelleklenir)
+            if self.thumbnail_cache is None:
+                self.thumbnail_cache = ThumbnailCache()
+            thumbnail_grid = ThumbnailGrid(files_tab, file_paths, self.thumbnail_cache, fg_color="gray15")
+            thumbnail_grid.pack(fill="both", expand=True, padx=5, pady=5)
+            
             # Sağ panel - Ayarlar
             right_frame = ctk.CTkFrame(content_frame, width=300)
             right_frame.pack(side="right", fill="y")
@@ -2073,6 +6281,25 @@ class FaceBlurApp(ctk.CTk):
             )
             strength_label.pack(pady=2)
             
+            # Benzer karelerde (seri çekim) yüz kutularını yeniden kullan
+            hash_reuse_check = ctk.CTkCheckBox(
+                right_frame,
+                text="Benzer karelerde\nyüzleri yeniden kullan",
+                variable=self.batch_hash_reuse,
+                command=self._save_app_settings,
+                font=ctk.CTkFont(size=11)
+            )
+            hash_reuse_check.pack(pady=(10, 2), padx=10, anchor="w")
+            
+            hash_refine_check = ctk.CTkCheckBox(
+                right_frame,
+                text="Kutuları yerel olarak\ndoğrula",
+                variable=self.batch_hash_refine,
+                command=self._save_app_settings,
+                font=ctk.CTkFont(size=11)
+            )
+            hash_refine_check.pack(pady=2, padx=10, anchor="w")
+            
             # Güncelleme butonu
             update_btn = ctk.CTkButton(
                 right_frame,
@@ -2124,6 +6351,28 @@ class FaceBlurApp(ctk.CTk):
             )
             start_btn.pack(side="right", padx=5)
             
+            # Canvas boyutuna göre küçültülmüş proxy (ayar değişimleri arasında saklanır)
+            proxy_cache = {}
+            
+            def get_proxy(canvas_width, canvas_height):
+                """Önizleme canvas'ına sığan proxy'yi ve ölçeklenmiş yüz kutularını getir"""
+                if proxy_cache.get("canvas_size") != (canvas_width, canvas_height):
+                    # Ölçek tam çözünürlüğe göre (stil parametreleri buna göre ölçeklenir)
+                    scale = min(canvas_width / full_size[0], canvas_height / full_size[1]) * 0.9
+                    proxy_w = max(1, int(full_size[0] * scale))
+                    proxy_h = max(1, int(full_size[1] * scale))
+                    k = scale / decode_scale
+                    proxy_cache.update({
+                        "canvas_size": (canvas_width, canvas_height),
+                        "scale": scale,
+                        "image": preview_image.resize((proxy_w, proxy_h), Image.LANCZOS),
+                        "boxes": [
+                            (int(x1 * k), int(y1 * k), int(x2 * k), int(y2 * k))
+                            for (x1, y1, x2, y2) in face_locations
+                        ],
+                    })
+                return proxy_cache
+            
             def update_preview():
                 """Önizlemeyi güncelle"""
                 # Ayarları güncelle
@@ -2131,62 +6380,30 @@ class FaceBlurApp(ctk.CTk):
                 style_info.configure(text=f"Stil: {self.blur_style.get()}")
                 strength_label.configure(text=f"Seviye: {self.blur_strength.get()}")
                 
-                # Görüntüyü işle
-                result_image = preview_image.copy()
-                blur_strength = int(self.blur_strength.get())
-                blur_style = self.blur_style.get()
-                margin_percent = self.face_margin.get() / 100.0
-                img_w, img_h = preview_image.size
-                
-                for (x1, y1, x2, y2) in face_locations:
-                    # Margin hesapla
-                    w = x2 - x1
-                    h = y2 - y1
-                    mx = w * margin_percent
-                    my = h * margin_percent
-                    
-                    nx1 = int(max(0, x1 - mx))
-                    ny1 = int(max(0, y1 - my))
-                    nx2 = int(min(img_w, x2 + mx))
-                    ny2 = int(min(img_h, y2 + my))
-
-                    if blur_style == "gaussian":
-                        result_image = self._apply_gaussian_blur(result_image, nx1, ny1, nx2, ny2, blur_strength)
-                    elif blur_style == "pixelate":
-                        result_image = self._apply_pixelate(result_image, nx1, ny1, nx2, ny2, blur_strength)
-                    elif blur_style == "black":
-                        result_image = self._apply_black_box(result_image, nx1, ny1, nx2, ny2)
-                    elif blur_style == "color":
-                        result_image = self._apply_color_fill(result_image, nx1, ny1, nx2, ny2)
-                    elif blur_style == "emoji":
-                        result_image = self._apply_emoji(result_image, nx1, ny1, nx2, ny2)
-
-                
-                # Canvas'a göster
-                display_preview(result_image)
-            
-            def display_preview(img):
-                """Önizlemeyi canvas'ta göster"""
-                canvas_frame.update()
                 canvas_width = preview_canvas.winfo_width()
                 canvas_height = preview_canvas.winfo_height()
-                
                 if canvas_width <= 1:
                     canvas_width = 500
                 if canvas_height <= 1:
                     canvas_height = 500
                 
-                # Ölçeklendir
-                img_width, img_height = img.size
-                scale_x = canvas_width / img_width
-                scale_y = canvas_height / img_height
-                scale = min(scale_x, scale_y) * 0.9
-                
-                new_width = int(img_width * scale)
-                new_height = int(img_height * scale)
+                # Sadece proxy işlenir; kutular ve stil parametreleri proxy ölçeğinde
+                proxy = get_proxy(canvas_width, canvas_height)
+                result_image = proxy["image"].copy()
+                blur_strength = int(self.blur_strength.get())
+                blur_style = self.blur_style.get()
+                margin_percent = self.face_margin.get() / 100.0
+                self.redactor.redact(
+                    result_image, proxy["boxes"], blur_style, blur_strength, margin_percent,
+                    scale=proxy["scale"]
+                )
                 
-                resized = img.resize((new_width, new_height), Image.LANCZOS)
-                photo = ImageTk.PhotoImage(resized)
+                # Canvas'a göster
+                display_preview(result_image, canvas_width, canvas_height)
+            
+            def display_preview(img, canvas_width, canvas_height):
+                """Önizlemeyi canvas'ta göster (proxy zaten canvas boyutunda)"""
+                photo = ImageTk.PhotoImage(img)
                 
                 preview_canvas.delete("all")
                 preview_canvas.create_image(
@@ -2217,7 +6434,7 @@ class FaceBlurApp(ctk.CTk):
         self.batch_window.title("Toplu İşlem")
         self.batch_window.geometry("500x300")
         self.batch_window.transient(self)
-        self.batch_window.grab_set()
+        # Modal değil: toplu işlem sürerken ana pencerede çalışmaya devam edilebilir
         
         # İlerleme label
         self.batch_status_label = ctk.CTkLabel(
@@ -2263,11 +6480,23 @@ class FaceBlurApp(ctk.CTk):
         )
         self.batch_cancel_btn.pack(pady=10)
         
+        # Ayarları UI thread'inde oku (işlem sırasında değişse de toplu işlem etkilenmez)
+        settings = {
+            "method": self.detection_method.get(),
+            "blur_style": self.blur_style.get(),
+            "blur_strength": int(self.blur_strength.get()),
+            "margin_percent": self.face_margin.get() / 100.0,
+            "save_preset": self.save_preset,
+            "hash_reuse": self.batch_hash_reuse.get(),
+            "hash_refine": self.batch_hash_refine.get(),
+        }
+        
         # İşlemi thread'de başlat
         self.batch_cancelled = False
         thread = threading.Thread(
             target=self._batch_process_thread,
-            args=(file_paths, output_dir)
+            args=(file_paths, output_dir, settings),
+            daemon=True
         )
         thread.start()
     
@@ -2276,16 +6505,27 @@ class FaceBlurApp(ctk.CTk):
         self.batch_cancelled = True
         self.batch_status_label.configure(text="İptal ediliyor...")
     
-    def _batch_process_thread(self, file_paths, output_dir):
-        """Toplu işlem thread'i"""
+    def _batch_process_thread(self, file_paths, output_dir, settings):
+        """Toplu işlem thread'i (kullanıcı etkinken geri çekilir)"""
         total_files = len(file_paths)
         processed_count = 0
         success_count = 0
         failed_files = []
         total_faces = 0
+        hash_index = PerceptualHashIndex() if settings["hash_reuse"] else None
+        # Yeniden kullanılan kutular her zaman tam kare denetiminden geçer; bu
+        # yüzden rapor, iki yolun gerçek algılama süresini yan yana verir
+        reuse = {"reused": 0, "reused_seconds": 0.0, "full": 0, "full_seconds": 0.0} \
+            if hash_index is not None else None
+        
+        def detect(cv_image):
+            return self._detect_faces_sync(cv_image, method=settings["method"], priority=PRIORITY_BATCH)
         
         try:
             for i, file_path in enumerate(file_paths):
+                # Kullanıcı etkinken bekle: ön plandaki işler CPU'yu öncelikli kullanır
+                self.scheduler.wait_until_idle(lambda: self.batch_cancelled)
+                
                 if self.batch_cancelled:
                     self.after(0, lambda: self.batch_status_label.configure(text="❌ İptal edildi"))
                     return
@@ -2297,65 +6537,54 @@ class FaceBlurApp(ctk.CTk):
                 
                 try:
                     # Görüntüyü yükle
-                    image = Image.open(file_path)
-                    if image.mode == 'RGBA':
-                        background = Image.new('RGB', image.size, (255, 255, 255))
-                        background.paste(image, mask=image.split()[3])
-                        image = background
-                    elif image.mode != 'RGB':
-                        image = image.convert('RGB')
+                    image = codec.decode(file_path)
                     
                     cv_image = np.array(image)
                     
-                    # Yüz algılama
-                    face_locations = self._detect_faces_sync(cv_image)
+                    # Neredeyse aynı bir kare işlendiyse onun yüzlerini al ve doğrula
+                    face_locations = None
+                    started = time.perf_counter()
+                    if hash_index is not None:
+                        hash_value = PerceptualHashIndex.dhash(cv_image)
+                        face_locations = hash_index.find(hash_value, image.size)
+                        if face_locations is not None:
+                            if settings["hash_refine"]:
+                                face_locations = PerceptualHashIndex.refine(cv_image, face_locations, detect)
+                            # Yeni veya yer değiştirmiş yüzler için ucuz tam kare denetimi
+                            face_locations = FaceDetectionEngine.merge_faces(
+                                list(face_locations), PerceptualHashIndex.coarse_detect(cv_image, detect)
+                            )
+                            reuse["reused"] += 1
+                            reuse["reused_seconds"] += time.perf_counter() - started
+                    
+                    # Yüz algılama (etkileşimli isteklerden sonra)
+                    if face_locations is None:
+                        face_locations = detect(cv_image)
+                        if reuse is not None:
+                            reuse["full"] += 1
+                            reuse["full_seconds"] += time.perf_counter() - started
+                    if hash_index is not None:
+                        hash_index.add(hash_value, image.size, face_locations)
                     
                     if face_locations:
                         total_faces += len(face_locations)
                         
                         # Tüm yüzleri işle
                         result_image = image.copy()
-                        blur_strength = int(self.blur_strength.get())
-                        blur_style = self.blur_style.get()
-                        margin_percent = self.face_margin.get() / 100.0
-                        img_w, img_h = image.size
-                        
-                        for (x1, y1, x2, y2) in face_locations:
-                            # Margin hesapla
-                            w = x2 - x1
-                            h = y2 - y1
-                            mx = w * margin_percent
-                            my = h * margin_percent
-                            
-                            nx1 = int(max(0, x1 - mx))
-                            ny1 = int(max(0, y1 - my))
-                            nx2 = int(min(img_w, x2 + mx))
-                            ny2 = int(min(img_h, y2 + my))
-
-                            if blur_style == "gaussian":
-                                result_image = self._apply_gaussian_blur(result_image, nx1, ny1, nx2, ny2, blur_strength)
-                            elif blur_style == "pixelate":
-                                result_image = self._apply_pixelate(result_image, nx1, ny1, nx2, ny2, blur_strength)
-                            elif blur_style == "black":
-                                result_image = self._apply_black_box(result_image, nx1, ny1, nx2, ny2)
-                            elif blur_style == "color":
-                                result_image = self._apply_color_fill(result_image, nx1, ny1, nx2, ny2)
-                            elif blur_style == "emoji":
-                                result_image = self._apply_emoji(result_image, nx1, ny1, nx2, ny2)
-
+                        self.redactor.redact(
+                            result_image, face_locations, settings["blur_style"],
+                            settings["blur_strength"], settings["margin_percent"]
+                        )
                         
                         # Kaydet
                         output_path = os.path.join(output_dir, f"processed_{file_name}")
-                        if output_path.lower().endswith(('.jpg', '.jpeg')):
-                            result_image.save(output_path, quality=95)
-                        else:
-                            result_image.save(output_path)
+                        codec.save(result_image, output_path, settings["save_preset"])
                         
                         success_count += 1
                     else:
                         # Yüz bulunamadı, orijinali kopyala
                         output_path = os.path.join(output_dir, f"noface_{file_name}")
-                        image.save(output_path)
+                        codec.save(image, output_path, settings["save_preset"])
                         failed_files.append((file_name, "Yüz bulunamadı"))
                     
                 except Exception as e:
@@ -2371,117 +6600,28 @@ class FaceBlurApp(ctk.CTk):
             
             # İşlem tamamlandı
             self.after(0, lambda: self._show_batch_results(
-                total_files, success_count, len(failed_files), total_faces, failed_files, output_dir
+                total_files, success_count, len(failed_files), total_faces, failed_files, output_dir,
+                reuse
             ))
             
         except Exception as e:
             self.after(0, lambda: messagebox.showerror("Toplu İşlem Hatası", f"Beklenmeyen hata:\n{e}"))
             self.after(0, lambda: self.batch_window.destroy())
     
-    def _detect_faces_sync(self, cv_image):
-        """Senkron yüz algılama (Hız için optimize edilmiş)"""
-        method = self.detection_method.get()
-        orig_h, orig_w = cv_image.shape[:2]
-        
-        # PERFORMANS OPTİMİZASYONU: Büyük resimleri algılama için ölçeklendir (Maks 1024px)
-        max_dim = 1024
-        if max(orig_h, orig_w) > max_dim:
-            scale = max_dim / max(orig_h, orig_w)
-            target_w = int(orig_w * scale)
-            target_h = int(orig_h * scale)
-            work_img = cv2.resize(cv_image, (target_w, target_h), interpolation=cv2.INTER_AREA)
-        else:
-            scale = 1.0
-            work_img = cv_image
-            target_w, target_h = orig_w, orig_h
-
-        all_faces = []
-        
-        def get_mediapipe_faces(img):
-            mp_faces = []
-            if self.face_detector:
-                mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=img)
-                detection_result = self.face_detector.detect(mp_image)
-                for detection in detection_result.detections:
-                    bbox = detection.bounding_box
-                    # Koordinatları orijinal ölçeğe çevir
-                    x1 = int(max(0, bbox.origin_x) / scale)
-                    y1 = int(max(0, bbox.origin_y) / scale)
-                    x2 = int(min(orig_w, (bbox.origin_x + bbox.width) / scale))
-                    y2 = int(min(orig_h, (bbox.origin_y + bbox.height) / scale))
-                    
-                    # Pillow 'Coordinate lower is less than upper' hatasını önlemek için güvenlik kontrolü
-                    if x2 > x1 and y2 > y1:
-                        mp_faces.append((x1, y1, x2, y2))
-            return mp_faces
-
-        def get_opencv_faces(img):
-            cv_faces = []
-            gray = cv2.cvtColor(img, cv2.COLOR_RGB2GRAY)
-            
-            # Parametreler work_img boyutuna göre ayarlandı
-            if self.face_cascade:
-                detected = self.face_cascade.detectMultiScale(
-                    gray, scaleFactor=1.1, minNeighbors=5, minSize=(20, 20)
-                )
-                for (x, y, fw, fh) in detected:
-                    x1, y1 = int(x / scale), int(y / scale)
-                    x2, y2 = int((x + fw) / scale), int((y + fh) / scale)
-                    # Güvenlik Kontrolü
-                    if x2 > x1 and y2 > y1:
-                        cv_faces.append((x1, y1, x2, y2))
-            
-            if self.profile_cascade:
-                detected_profile = self.profile_cascade.detectMultiScale(
-                    gray, scaleFactor=1.1, minNeighbors=5, minSize=(20, 20)
-                )
-                for (x, y, fw, fh) in detected_profile:
-                    x1, y1 = int(x / scale), int(y / scale)
-                    x2, y2 = int((x + fw) / scale), int((y + fh) / scale)
-                    # Güvenlik Kontrolü
-                    if x2 > x1 and y2 > y1:
-                        cv_faces.append((x1, y1, x2, y2))
-            return cv_faces
-
-        def merge_faces(base_list, new_list, threshold=0.4):
-            for n_face in new_list:
-                nx1, ny1, nx2, ny2 = n_face
-                is_duplicate = False
-                for b_face in base_list:
-                    bx1, by1, bx2, by2 = b_face
-                    # IoU
-                    ix1, iy1 = max(nx1, bx1), max(ny1, by1)
-                    ix2, iy2 = min(nx2, bx2), min(ny2, by2)
-                    if ix2 > ix1 and iy2 > iy1:
-                        i_area = (ix2 - ix1) * (iy2 - iy1)
-                        a1 = (nx2 - nx1) * (ny2 - ny1)
-                        a2 = (bx2 - bx1) * (by2 - by1)
-                        iou = i_area / (a1 + a2 - i_area)
-                        if iou > threshold:
-                            is_duplicate = True
-                            break
-                if not is_duplicate:
-                    base_list.append(n_face)
-            return base_list
-
-        try:
-            # Algılama her zaman küçültülmüş 'work_img' üzerinde yapılmalı (Performans için)
-            if method == "mediapipe":
-                all_faces = get_mediapipe_faces(work_img)
-            elif method == "opencv_haar":
-                all_faces = get_opencv_faces(work_img)
-            elif method == "hybrid":
-                mp_faces = get_mediapipe_faces(work_img)
-                cv_faces = get_opencv_faces(work_img)
-                all_faces = merge_faces(mp_faces, cv_faces)
-        except Exception as e:
-            print(f"Algılama hatası: {e}")
-        
-        return all_faces
+    def _detect_faces_sync(self, cv_image, method=None, token=None, priority=PRIORITY_INTERACTIVE):
+        """Senkron yüz algılama (zamanlayıcı üzerinden, verilen öncelikle)
 
+        token: verilirse aşamalar arasında iptal kontrol edilir (TaskCancelled)
+        """
+        if method is None:
+            method = self.detection_method.get()
+        return self.scheduler.detect(cv_image, method, priority, token)
     
-    def _show_batch_results(self, total, success, failed, faces, failed_files, output_dir):
-        """Toplu işlem sonuçlarını göster"""
+    def _show_batch_results(self, total, success, failed, faces, failed_files, output_dir, reuse=None):
+        """Toplu işlem sonuçlarını göster
+
+        reuse: benzer karelerde yeniden kullanım açıksa iki yolun sayı ve süreleri
+        """
         self.batch_window.destroy()
         
         # Rapor oluştur
@@ -2489,7 +6629,15 @@ class FaceBlurApp(ctk.CTk):
         report += f"✅ İşlenen Dosya: {total}\n"
         report += f"🎭 Bulunan Yüz: {faces}\n"
         report += f"✔️ Başarılı: {success}\n"
-        report += f"❌ Başarısız: {failed}\n\n"
+        report += f"❌ Başarısız: {failed}\n"
+        if reuse is not None:
+            def average_ms(seconds, count):
+                return f"{1000 * seconds / count:.0f} ms" if count else "-"
+            report += (f"♻️ Benzer kareden alınıp doğrulanan: {reuse['reused']} "
+                       f"(ort. {average_ms(reuse['reused_seconds'], reuse['reused'])})\n")
+            report += (f"🔍 Tam algılama: {reuse['full']} "
+                       f"(ort. {average_ms(reuse['full_seconds'], reuse['full'])})\n")
+        report += "\n"
         
         if failed_files:
             report += "Başarısız Dosyalar:\n"
@@ -2498,6 +6646,11 @@ class FaceBlurApp(ctk.CTk):
             if len(failed_files) > 10:
                 report += f"... ve {len(failed_files) - 10} dosya daha\n"
         
+        # Algılayıcı havuzu istatistikleri (bekleme süresi ve kullanım oranı)
+        pool_stats = self.detection_engine.stats_text()
+        if pool_stats:
+            report += f"\n⚙️ Algılayıcılar:\n{pool_stats}\n"
+        
         report += f"\n📁 Çıktı Klasörü:\n{output_dir}"
         
         # Rapor penceresi
@@ -2530,4 +6683,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # Paketlenmiş (EXE) sürümde video segment süreçleri için gerekli
+    multiprocessing.freeze_support()
     main()
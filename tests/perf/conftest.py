@@ -0,0 +1,150 @@
+"""
+Performans gerileme testleri için ortak altyapı.
+
+Her ölçüm, aynı makinede koşturulan sabit bir kalibrasyon döngüsünün süresine
+bölünerek "birim" cinsinden ifade edilir; böylece taban çizgisi (baseline.json)
+farklı hızdaki makineler arasında karşılaştırılabilir. Paylaşımlı CI
+makinelerinde hız dalgalandığı için ölçüm ROUNDS tur yapılır: her turda
+kalibrasyon ölçümün hemen önünde ve arkasında tekrarlanır, kısa ölçümler en az
+MIN_TIME boyunca yinelenir ve turların ortancası karşılaştırılır. Ortanca
+taban çizgisinin tolerans bandının üstündeyse test, farkı gösteren bir
+mesajla düşer.
+
+Ortam değişkenleri:
+    FACEBLUR_PERF_UPDATE=1      Taban çizgisini bu makinedeki ölçümlerle yeniden yaz
+    FACEBLUR_PERF_TOLERANCE=0.5 Varsayılan tolerans bandını geçersiz kıl (oran)
+    FACEBLUR_PERF_ROUNDS=3      Ölçüm turu sayısı (ortancası alınır)
+"""
+
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import pytest
+from PIL import Image, ImageFilter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+DEFAULT_TOLERANCE = 0.5
+MIN_TIME = 0.3  # Saniye: kısa ölçümler en az bu kadar süre yinelenir (en iyisi alınır)
+ROUNDS = int(os.environ.get("FACEBLUR_PERF_ROUNDS", "3"))
+
+_results = {}
+
+
+def best_of(fn, repeat=5, warmup=1, min_time=MIN_TIME, max_repeat=200):
+    """En iyi süre (saniye); ısınma turları sayılmaz"""
+    for _ in range(warmup):
+        fn()
+    best = float("inf")
+    count, spent = 0, 0.0
+    while count < repeat or (spent < min_time and count < max_repeat):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = min(best, elapsed)
+        count += 1
+        spent += elapsed
+    return best
+
+
+def _calibration_workload():
+    # Sıcak yolların karışımı: PIL filtresi, NumPy aritmetiği ve saf Python döngüsü
+    image = Image.linear_gradient("L").resize((512, 512)).convert("RGB")
+    image.filter(ImageFilter.GaussianBlur(4))
+    array = np.arange(1_000_000, dtype=np.float32)
+    float((array * 1.5 + 2.0).sum())
+    total = 0
+    for i in range(100_000):
+        total += i * i
+    return total
+
+
+def calibrate():
+    """Bu makinede kalibrasyon döngüsünün süresi (saniye)"""
+    return best_of(_calibration_workload, repeat=3)
+
+
+@pytest.fixture(scope="session")
+def baseline():
+    if not os.path.exists(BASELINE_PATH):
+        return {"tolerance": DEFAULT_TOLERANCE, "benchmarks": {}}
+    with open(BASELINE_PATH, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+@pytest.fixture
+def perf(baseline):
+    """perf(ad, fn, repeat=5): fn'i ölç ve taban çizgisiyle karşılaştır"""
+    updating = os.environ.get("FACEBLUR_PERF_UPDATE") == "1"
+
+    def measure(name, fn, repeat=5, warmup=1):
+        rounds = []
+        for i in range(max(1, ROUNDS)):
+            before = calibrate()
+            seconds = best_of(fn, repeat=repeat, warmup=warmup if i == 0 else 0)
+            calibration = min(before, calibrate())
+            rounds.append((seconds / calibration, seconds, calibration))
+        units, seconds, calibration = sorted(rounds)[len(rounds) // 2]  # Ortanca tur
+        spread = max(r[0] for r in rounds) / min(r[0] for r in rounds) - 1
+        _results[name] = {"units": units, "seconds": seconds, "spread": spread}
+        if updating:
+            return units
+
+        entry = baseline["benchmarks"].get(name)
+        if entry is None:
+            pytest.skip(f"{name}: taban çizgisinde yok (FACEBLUR_PERF_UPDATE=1 ile ekleyin)")
+        tolerance = float(os.environ.get(
+            "FACEBLUR_PERF_TOLERANCE", entry.get("tolerance", baseline.get("tolerance", DEFAULT_TOLERANCE))
+        ))
+        limit = entry["units"] * (1 + tolerance)
+        change = units / entry["units"] - 1
+        _results[name].update(baseline=entry["units"], change=change, limit=limit)
+        if units > limit:
+            pytest.fail(
+                f"Performans gerilemesi: {name}\n"
+                f"  taban çizgisi : {entry['units']:.3f} birim (tolerans +{tolerance:.0%})\n"
+                f"  ölçülen       : {units:.3f} birim ({change:+.0%}, {len(rounds)} tur ortancası, "
+                f"turlar arası fark {spread:.0%})\n"
+                f"  mutlak süre   : {seconds * 1000:.2f} ms (kalibrasyon {calibration * 1000:.2f} ms)",
+                pytrace=False,
+            )
+        return units
+
+    return measure
+
+
+def pytest_terminal_summary(terminalreporter):
+    if not _results:
+        return
+    terminalreporter.section("performans")
+    terminalreporter.write_line(
+        f"{'ölçüm':28} {'ms':>9} {'birim':>8} {'taban':>8} {'fark':>7} {'turlar':>7}"
+    )
+    for name, r in sorted(_results.items()):
+        base = f"{r['baseline']:8.3f}" if "baseline" in r else f"{'-':>8}"
+        change = f"{r['change']:+7.0%}" if "change" in r else f"{'-':>7}"
+        terminalreporter.write_line(
+            f"{name:28} {r['seconds'] * 1000:9.2f} {r['units']:8.3f} {base} {change} {r['spread']:7.0%}"
+        )
+
+
+def pytest_sessionfinish(session):
+    if os.environ.get("FACEBLUR_PERF_UPDATE") != "1" or not _results:
+        return
+    data = {"tolerance": DEFAULT_TOLERANCE, "benchmarks": {}}
+    if os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    for name, r in _results.items():
+        entry = data["benchmarks"].setdefault(name, {})
+        entry["units"] = round(r["units"], 4)
+    data["benchmarks"] = dict(sorted(data["benchmarks"].items()))
+    with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+        f.write("\n")
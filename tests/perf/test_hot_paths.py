@@ -0,0 +1,126 @@
+"""
+Sıcak yolların mikro ölçümleri: algılama (_detect_faces_sync'in kullandığı
+zamanlayıcı + motor), yüz stilleri (FaceRedactor), döşemeli çizim (display_image)
+ve geri alma geçmişi (_save_state). Pencere açılmaz.
+"""
+
+import os
+
+import cv2
+import numpy as np
+import pytest
+from PIL import Image, ImageDraw
+
+from main import (
+    MEDIAPIPE_AVAILABLE, PRIORITY_INTERACTIVE, DetectionScheduler, FaceDetectionEngine,
+    FaceRedactor, ImageHistory, TiledImageRenderer,
+)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # Depo kökü (modeller)
+FACE_BOXES = [(200 + 260 * i, 300 + 180 * (i % 2), 380 + 260 * i, 520 + 180 * (i % 2)) for i in range(6)]
+
+
+@pytest.fixture(scope="module")
+def photo():
+    """Fotoğrafa benzer sabit test görüntüsü (2400x1600)"""
+    rng = np.random.default_rng(0)
+    y, x = np.mgrid[0:1600, 0:2400].astype(np.float32)
+    base = np.stack([128 + 90 * np.sin(x / 200.0), 128 + 90 * np.cos(y / 170.0),
+                     128 + 50 * np.sin((x + y) / 300.0)], axis=-1)
+    noise = rng.normal(0, 10, base.shape)
+    image = Image.fromarray(np.clip(base + noise, 0, 255).astype(np.uint8))
+    draw = ImageDraw.Draw(image)
+    for x1, y1, x2, y2 in FACE_BOXES:
+        draw.ellipse((x1, y1, x2, y2), fill=(224, 172, 105))
+    return image
+
+
+@pytest.fixture(scope="module")
+def scheduler():
+    engine = FaceDetectionEngine(
+        os.path.join(ROOT, "blaze_face_short_range.tflite"),
+        os.path.join(ROOT, "haarcascade_frontalface_default.xml"),
+        os.path.join(cv2.data.haarcascades, "haarcascade_profileface.xml"),
+        max_instances=1,
+    )
+    return engine, DetectionScheduler(engine.detect, workers=1)
+
+
+@pytest.mark.parametrize("method", ["mediapipe", "opencv_haar", "hybrid"])
+def test_detect_faces(perf, photo, scheduler, method):
+    engine, sched = scheduler
+    if method != "opencv_haar" and (not MEDIAPIPE_AVAILABLE or engine.mediapipe is None):
+        pytest.skip("MediaPipe yok")
+    if method != "mediapipe" and engine.frontal is None:
+        pytest.skip("Haar cascade yok")
+    cv_image = np.asarray(photo)
+    perf(f"detect_{method}", lambda: sched.detect(cv_image, method, PRIORITY_INTERACTIVE), repeat=3)
+
+
+@pytest.mark.parametrize("style", ["gaussian_blur", "pixelate", "black_box", "color_fill", "emoji"])
+def test_apply_style(perf, photo, style):
+    redactor = FaceRedactor("#333333")
+    apply = getattr(redactor, f"apply_{style}")
+    image = photo.copy()
+
+    def run():
+        for box in FACE_BOXES:
+            if style in ("gaussian_blur", "pixelate"):
+                apply(image, *box, 30)
+            else:
+                apply(image, *box)
+
+    perf(f"apply_{style}", run)
+
+
+def test_redact_faces(perf, photo):
+    redactor = FaceRedactor("#333333")
+    image = photo.copy()
+    perf("redact_faces_gaussian", lambda: redactor.redact(image, FACE_BOXES, "gaussian", 30, 0.15))
+
+
+def test_display_first_paint(perf, photo):
+    """Yeni görüntü: piramit + görünür döşemeler (1280x800 görünüm, sığdırılmış)"""
+    renderer = TiledImageRenderer(photo_factory=lambda tile: tile)
+    scale = min(1280 / photo.width, 800 / photo.height) * 0.95
+
+    def run():
+        renderer.invalidate()
+        renderer.set_image(photo)
+        for tx, ty, _, _ in renderer.visible_tiles(scale, 0, 0, 1280, 800):
+            renderer.get_tile_photo(scale, tx, ty)
+
+    perf("display_first_paint", run)
+
+
+def test_display_zoom(perf, photo):
+    """Hazır piramitte yeni zoom seviyesi: sadece görünür döşemeler üretilir"""
+    renderer = TiledImageRenderer(photo_factory=lambda tile: tile)
+    renderer.set_image(photo)
+
+    def run():
+        # Döşeme önbelleği boşaltılır: her çağrı aynı işi yapan yeni bir zoom seviyesi
+        renderer.tile_cache.clear()
+        for tx, ty, _, _ in renderer.visible_tiles(0.55, -200, -100, 1280, 800):
+            renderer.get_tile_photo(0.55, tx, ty)
+
+    perf("display_zoom", run)
+
+
+def test_save_state(perf, photo):
+    """Geçmişe kayıt + arka plandaki fark sıkıştırması"""
+    redactor = FaceRedactor("#333333")
+    history = ImageHistory()
+    states = [photo]
+    for box in FACE_BOXES:
+        edited = states[-1].copy()
+        redactor.apply_gaussian_blur(edited, *box, 30)
+        states.append(edited)
+
+    def run():
+        history.clear()
+        for state in states:
+            history.push([], [], state)
+        history.flush()  # Arka plandaki sıkıştırmanın bitmesini bekle
+
+    perf("save_state", run, repeat=3)